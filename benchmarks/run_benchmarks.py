@@ -0,0 +1,334 @@
+"""
+导出流程基准测试
+在本地模拟平台（mock_platform）上测量端到端抓取/导出耗时，以及导出、列宽调整、API数据解析的微基准，
+结果保存为JSON并与基线比较，耗时增长超过阈值时标记为性能回退
+
+用法:
+    python -m benchmarks.run_benchmarks                  # 运行全部基准并与基线比较
+    python -m benchmarks.run_benchmarks --micro-only     # 只运行微基准（不需要浏览器）
+    python -m benchmarks.run_benchmarks --tooltip        # 额外测量tooltip提取路径（较慢）
+    python -m benchmarks.run_benchmarks --save-baseline  # 将本次结果保存为基线
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from mock_platform.server import MockPlatformServer, generate_fans_series, generate_notes
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / 'results'
+BASELINE_FILE = BENCH_DIR / 'baseline.json'
+
+# 中位数耗时比基线增长超过该比例视为回退
+DEFAULT_THRESHOLD = 0.2
+
+
+def _summarize(samples: List[float]) -> Dict[str, Any]:
+    """汇总多次测量的耗时（毫秒）"""
+    return {
+        'repeat': len(samples),
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'max_ms': round(max(samples), 3),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    """
+    多次执行同步函数并统计耗时
+
+    Args:
+        func: 被测函数
+        repeat: 测量次数
+        warmup: 预热次数（不计入结果）
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return _summarize(samples)
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]], repeat: int = 1) -> Dict[str, Any]:
+    """
+    多次执行协程函数并统计耗时
+
+    Args:
+        func: 被测协程函数
+        repeat: 测量次数
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return _summarize(samples)
+
+
+def run_micro_benchmarks(repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    微基准：ExcelExporter.export、_auto_adjust_column_width、_process_api_data
+    """
+    import pandas as pd
+    from openpyxl import Workbook
+
+    from core.exporter import ExcelExporter
+    from modules.followers_scraper import FollowersScraper
+
+    results = {}
+    exporter = ExcelExporter()
+
+    for rows in (200, 2000):
+        notes = generate_notes(rows)
+        df = pd.DataFrame(notes)
+
+        print(f"  ExcelExporter.export ({rows} 行)...")
+        results[f'excel_export_{rows}'] = measure(
+            lambda: exporter.export(notes, f'bench_notes_{rows}', sheet_name='笔记数据'),
+            repeat=repeat
+        )
+
+        print(f"  _auto_adjust_column_width ({rows} 行)...")
+        results[f'auto_adjust_column_width_{rows}'] = measure(
+            lambda: exporter._auto_adjust_column_width(Workbook().active, df),
+            repeat=repeat
+        )
+
+    # 模拟一次抓取中多次拦截到的粉丝API响应
+    series = generate_fans_series(365)
+    api_response = {
+        'data': {
+            'list': [
+                {'date': p['date'], 'new_count': p['new'], 'lost_count': p['lost']}
+                for p in reversed(series)
+            ]
+        }
+    }
+    scraper = FollowersScraper()
+    scraper.api_data = [api_response] * 10
+
+    print("  _process_api_data (10 × 365 条)...")
+    results['process_api_data_365'] = measure(
+        lambda: scraper._process_api_data(365),
+        repeat=repeat * 4
+    )
+
+    return results
+
+
+async def run_e2e_benchmarks(repeat: int, tooltip: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    端到端基准：scrape_followers_data、export_notes_data、export_all
+    """
+    from core.browser import browser_manager
+    from modules.followers_scraper import FollowersScraper
+    from modules.notes_exporter import NotesExporter
+    from modules.unified_exporter import UnifiedExporter
+
+    results = {}
+
+    export_config = {
+        'export_notes': True,
+        'notes_date_range': 'all',
+        'notes_start_date': None,
+        'notes_end_date': None,
+        'export_followers': True,
+        'followers_days': 30,
+    }
+
+    try:
+        with MockPlatformServer(serve_api=True) as server:
+            Config.set_platform_url(server.url)
+
+            print("  scrape_followers_data (API)...")
+            results['scrape_followers_data'] = await measure_async(
+                lambda: FollowersScraper().scrape_followers_data(days=30), repeat
+            )
+
+            print("  export_notes_data...")
+            results['export_notes_data'] = await measure_async(
+                lambda: NotesExporter().export_notes_data(), repeat
+            )
+
+            print("  export_all...")
+            results['export_all'] = await measure_async(
+                lambda: UnifiedExporter().export_all(export_config), repeat
+            )
+
+        if tooltip:
+            with MockPlatformServer(serve_api=False) as server:
+                Config.set_platform_url(server.url)
+
+                print("  scrape_followers_data (tooltip)...")
+                results['scrape_followers_data_tooltip'] = await measure_async(
+                    lambda: FollowersScraper().scrape_followers_data(days=30), repeat
+                )
+
+    finally:
+        await browser_manager.close_browser()
+
+    return results
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    与基线比较中位数耗时
+
+    Returns:
+        比较结果列表，status 为 ok / regression / improved / new
+    """
+    comparison = []
+
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            comparison.append({'name': name, 'status': 'new', 'current_ms': current['median_ms']})
+            continue
+
+        ratio = current['median_ms'] / base['median_ms'] if base['median_ms'] else 1.0
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+
+        comparison.append({
+            'name': name,
+            'status': status,
+            'baseline_ms': base['median_ms'],
+            'current_ms': current['median_ms'],
+            'ratio': round(ratio, 3),
+        })
+
+    return comparison
+
+
+def format_comparison(comparison: List[Dict[str, Any]]) -> str:
+    """生成比较结果表"""
+    lines = [f"{'benchmark':<34}{'baseline(ms)':>14}{'current(ms)':>14}{'ratio':>8}  status"]
+
+    for row in comparison:
+        baseline = f"{row['baseline_ms']:.1f}" if 'baseline_ms' in row else '-'
+        ratio = f"{row['ratio']:.2f}" if 'ratio' in row else '-'
+        lines.append(
+            f"{row['name']:<34}{baseline:>14}{row['current_ms']:>14.1f}{ratio:>8}  {row['status']}"
+        )
+
+    return '\n'.join(lines)
+
+
+def _get_git_commit() -> Optional[str]:
+    """当前代码的提交号"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCH_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='导出流程基准测试')
+    parser.add_argument('--micro-only', action='store_true', help='只运行微基准')
+    parser.add_argument('--tooltip', action='store_true', help='测量tooltip提取路径（较慢）')
+    parser.add_argument('--repeat', type=int, default=5, help='微基准测量次数')
+    parser.add_argument('--e2e-repeat', type=int, default=1, help='端到端基准测量次数')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='回退判定阈值（中位数耗时增长比例）')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='将本次结果保存为基线')
+    args = parser.parse_args()
+
+    # 在临时目录中运行，导出文件不写入真实的输出目录
+    work_dir = Path(tempfile.mkdtemp(prefix='xhs_bench_'))
+    os.chdir(work_dir)
+    Config.OUTPUT_DIR = work_dir / 'data' / 'output'
+    Config.TEMP_DIR = work_dir / 'data' / 'temp'
+    Config.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    Config.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    Config.HEADLESS = True
+    Config.SLOW_MO = 0
+    Config.PERSISTENT_PROFILE = False
+    Config.REPLAY_MODE = False
+
+    print("=" * 60)
+    print("导出流程基准测试")
+    print("=" * 60)
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    print("\n微基准:")
+    results.update(run_micro_benchmarks(args.repeat))
+
+    if not args.micro_only:
+        print("\n端到端基准:")
+        results.update(asyncio.run(run_e2e_benchmarks(args.e2e_repeat, args.tooltip)))
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': _get_git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': results,
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    result_path = RESULTS_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存: {result_path}")
+
+    regressions = []
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('benchmarks', {})
+
+        comparison = compare_with_baseline(results, baseline, args.threshold)
+        regressions = [row for row in comparison if row['status'] == 'regression']
+        print(f"\n与基线比较（阈值 {args.threshold:.0%}）:")
+        print(format_comparison(comparison))
+    else:
+        print(f"\n基线文件不存在: {args.baseline}（使用 --save-baseline 创建）")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已更新: {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ 发现 {len(regressions)} 项性能回退: "
+              + ', '.join(row['name'] for row in regressions))
+        return 1
+
+    print("\n✅ 没有性能回退")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
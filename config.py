@@ -31,6 +31,7 @@ class Config:
     SESSION_DIR = BASE_DIR / os.getenv('SESSION_DIR', '.sessions')
     LOG_DIR = BASE_DIR / os.getenv('LOG_DIR', 'logs')
     BROWSERS_DIR = BASE_DIR / 'browsers'
+    PROFILE_DIR = BASE_DIR / os.getenv('PROFILE_DIR', '.profiles')
 
     # ============================================
     # 浏览器配置
@@ -41,18 +42,72 @@ class Config:
     BROWSER_HEIGHT = int(os.getenv('BROWSER_HEIGHT', '720'))
     SLOW_MO = int(os.getenv('BROWSER_SLOW_MO', '100'))
     PAGE_TIMEOUT = int(os.getenv('PAGE_TIMEOUT', '30000'))
+    PAGE_POOL_SIZE = int(os.getenv('PAGE_POOL_SIZE', '3'))  # 页面池最大页面数
+    # 单次抓取最多保留的API响应数量和单个响应大小上限
+    API_CAPTURE_MAX_RESPONSES = int(os.getenv('API_CAPTURE_MAX_RESPONSES', '20'))
+    API_CAPTURE_MAX_BODY_KB = int(os.getenv('API_CAPTURE_MAX_BODY_KB', '2048'))
+
+    # ============================================
+    # 持久化Profile配置
+    # ============================================
+    ACCOUNT_NAME = os.getenv('ACCOUNT_NAME', 'default')
+    # 使用持久化用户数据目录（跨次运行保留HTTP缓存等）
+    PERSISTENT_PROFILE = os.getenv('PERSISTENT_PROFILE', 'false').lower() == 'true'
+    PROFILE_CACHE_MAX_MB = int(os.getenv('PROFILE_CACHE_MAX_MB', '512'))
+    PROFILE_MAX_AGE_DAYS = int(os.getenv('PROFILE_MAX_AGE_DAYS', '30'))
+
+    # ============================================
+    # 诊断录制配置（Playwright trace / HAR）
+    # ============================================
+    CAPTURE_TRACE = os.getenv('CAPTURE_TRACE', 'false').lower() == 'true'
+    CAPTURE_HAR = os.getenv('CAPTURE_HAR', 'false').lower() == 'true'
+    CAPTURE_TRACE_SCREENSHOTS = os.getenv('CAPTURE_TRACE_SCREENSHOTS', 'false').lower() == 'true'
+    CAPTURE_HAR_CONTENT = os.getenv('CAPTURE_HAR_CONTENT', 'embed')  # embed, attach, omit
+    CAPTURE_HAR_URL_PATTERN = os.getenv('CAPTURE_HAR_URL_PATTERN', r'xiaohongshu\.com')
+    CAPTURE_MAX_MB = int(os.getenv('CAPTURE_MAX_MB', '200'))  # 单个录制文件上限
+    CAPTURE_KEEP_RUNS = int(os.getenv('CAPTURE_KEEP_RUNS', '10'))  # 保留最近几次运行的录制
+
+    # ============================================
+    # 离线回放配置（使用录制的HAR/固定数据代替真实平台）
+    # ============================================
+    REPLAY_MODE = os.getenv('REPLAY_MODE', 'false').lower() == 'true'
+    REPLAY_HAR = BASE_DIR / os.getenv('REPLAY_HAR') if os.getenv('REPLAY_HAR') else None
+    REPLAY_FIXTURES_DIR = BASE_DIR / os.getenv('REPLAY_FIXTURES_DIR', 'tests/fixtures')
+    REPLAY_NOT_FOUND = os.getenv('REPLAY_NOT_FOUND', 'abort')  # abort, fallback
 
     # ============================================
     # 日志配置
     # ============================================
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_TO_FILE = os.getenv('LOG_TO_FILE', 'true').lower() == 'true'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_MB', '10')) * 1024 * 1024  # 单个日志文件上限
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))  # 同一天最多保留的轮转文件数
+    # 额外输出结构化日志（JSON Lines，xhs_YYYYMMDD.jsonl），便于统计各阶段耗时
+    LOG_JSON = os.getenv('LOG_JSON', 'false').lower() == 'true'
+    LOG_GUI_INTERVAL_MS = int(os.getenv('LOG_GUI_INTERVAL_MS', '100'))  # GUI日志刷新间隔
+    LOG_GUI_MAX_LINES_PER_TICK = int(os.getenv('LOG_GUI_MAX_LINES_PER_TICK', '200'))
+    LOG_GUI_SCROLLBACK = int(os.getenv('LOG_GUI_SCROLLBACK', '2000'))  # GUI日志最多保留行数
+
+    # ============================================
+    # 内存分析配置
+    # ============================================
+    # 启动后定期采样内存（Python堆、进程RSS、页面数），结果写入 logs/memory.jsonl
+    MEMORY_PROFILE = os.getenv('MEMORY_PROFILE', 'false').lower() == 'true'
+    MEMORY_SAMPLE_INTERVAL = int(os.getenv('MEMORY_SAMPLE_INTERVAL', '300'))  # 秒
+    MEMORY_TOP_N = int(os.getenv('MEMORY_TOP_N', '10'))  # 输出增长最多的前N个位置
+    MEMORY_TRACE_FRAMES = int(os.getenv('MEMORY_TRACE_FRAMES', '1'))  # tracemalloc调用栈深度
 
     # ============================================
     # 会话配置
     # ============================================
     SESSION_MAX_AGE = int(os.getenv('SESSION_MAX_AGE', '24'))  # 小时
     SESSION_FILE = SESSION_DIR / 'storage_state.json'
+    # 保存会话时仅保留这些源的localStorage（逗号分隔，为空则全部保留）
+    SESSION_KEEP_ORIGINS = [
+        origin.strip()
+        for origin in os.getenv('SESSION_KEEP_ORIGINS', '').split(',')
+        if origin.strip()
+    ]
 
     # ============================================
     # 数据导出配置
@@ -61,6 +116,46 @@ class Config:
     ADD_DATE_PREFIX = os.getenv('ADD_DATE_PREFIX', 'true').lower() == 'true'
     CSV_ENCODING = os.getenv('CSV_ENCODING', 'utf-8-sig')
     DEFAULT_FOLLOWER_DAYS = int(os.getenv('DEFAULT_FOLLOWER_DAYS', '30'))
+    # 平台单次导出笔记数据的最大天数，更长的日期范围拆分为多段在多个页面中并行下载
+    NOTES_MAX_RANGE_DAYS = int(os.getenv('NOTES_MAX_RANGE_DAYS', '30'))
+    NOTES_CHUNK_CONCURRENCY = int(os.getenv('NOTES_CHUNK_CONCURRENCY', '2'))
+    # 单段笔记数据不解析、不重写，下载文件直接保存到输出目录
+    NOTES_PASSTHROUGH = os.getenv('NOTES_PASSTHROUGH', 'false').lower() == 'true'
+    # 笔记数据仓库（SQLite）：每次导出按 (账号, 笔记ID, 快照日期) 写入，用于跨天比较
+    NOTES_STORE_ENABLED = os.getenv('NOTES_STORE_ENABLED', 'true').lower() == 'true'
+    NOTES_DB_FILE = BASE_DIR / os.getenv('NOTES_DB_FILE', 'data/notes.db')
+    # 历史导出的列式缓存目录（每个文件只解析一次，按内容哈希缓存），内存中保留最近读取的文件数
+    EXPORT_CACHE_DIR = BASE_DIR / os.getenv('EXPORT_CACHE_DIR', 'data/cache/exports')
+    EXPORT_CACHE_MEMORY_ITEMS = int(os.getenv('EXPORT_CACHE_MEMORY_ITEMS', '32'))
+    # 数据与该账号/类型上次导出相同时不写新文件（skip: 沿用上次文件，link: 以新文件名硬链接到上次文件）
+    EXPORT_SKIP_UNCHANGED = os.getenv('EXPORT_SKIP_UNCHANGED', 'true').lower() == 'true'
+    EXPORT_UNCHANGED_MODE = os.getenv('EXPORT_UNCHANGED_MODE', 'skip').lower()
+    # 平台单次查询粉丝数据的最大天数，更长的日期范围拆分为多段并发请求
+    FOLLOWERS_MAX_RANGE_DAYS = int(os.getenv('FOLLOWERS_MAX_RANGE_DAYS', '30'))
+    FOLLOWERS_CHUNK_CONCURRENCY = int(os.getenv('FOLLOWERS_CHUNK_CONCURRENCY', '3'))
+    # 写入粉丝数据前检测缺失的日期，只对这些日期重新采样（接口数据按缺失的日期区间重新请求）
+    FOLLOWERS_GAP_FILL = os.getenv('FOLLOWERS_GAP_FILL', 'true').lower() == 'true'
+
+    # ============================================
+    # 重试配置
+    # ============================================
+    # 导航、选择日期范围、采集图表等阶段失败时按指数退避重试
+    RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', '3'))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '2'))  # 秒
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '30'))  # 秒
+    # 抓取失败后保留已完成阶段的进度，有效期内再次抓取时从最后完成的阶段继续
+    CHECKPOINT_TTL_MINUTES = int(os.getenv('CHECKPOINT_TTL_MINUTES', '60'))
+
+    # ============================================
+    # 定时任务配置
+    # ============================================
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    SCHEDULER_CRON = os.getenv('SCHEDULER_CRON', '0 2 * * *')  # 未配置任务文件时使用
+    SCHEDULER_JOBS_FILE = BASE_DIR / os.getenv('SCHEDULER_JOBS_FILE', 'scheduler_jobs.json')
+    SCHEDULER_STATE_FILE = BASE_DIR / os.getenv('SCHEDULER_STATE_FILE', 'data/scheduler_state.json')
+    SCHEDULER_JITTER_SECONDS = int(os.getenv('SCHEDULER_JITTER_SECONDS', '300'))  # 随机错开开始时间
+    SCHEDULER_FRESH_HOURS = float(os.getenv('SCHEDULER_FRESH_HOURS', '12'))  # 数据新鲜期，期内跳过
+    SCHEDULER_CATCHUP_HOURS = int(os.getenv('SCHEDULER_CATCHUP_HOURS', '24'))  # 错过的任务补跑期限
 
     # ============================================
     # 小红书平台配置
@@ -73,6 +168,23 @@ class Config:
 
     # 粉丝数据相关URL
     FOLLOWERS_DATA_URL = f"{CREATOR_PLATFORM_URL}/statistics/fans-data"
+    # 粉丝趋势接口（按 start_date / end_date 查询指定日期范围）
+    FOLLOWERS_TREND_API_PATH = os.getenv('FOLLOWERS_TREND_API_PATH', '/api/fans/trend')
+    FOLLOWERS_TREND_API_URL = f"{CREATOR_PLATFORM_URL}{FOLLOWERS_TREND_API_PATH}"
+
+    # ============================================
+    # 登录检测配置
+    # ============================================
+    LOGIN_TIMEOUT = int(os.getenv('LOGIN_TIMEOUT', '120'))  # 秒
+    # 登录成功后平台下发的会话Cookie名称（逗号分隔）
+    LOGIN_COOKIE_NAMES = [
+        name.strip()
+        for name in os.getenv(
+            'LOGIN_COOKIE_NAMES',
+            'galaxy_creator_session_id,access-token-creator.xiaohongshu.com'
+        ).split(',')
+        if name.strip()
+    ]
 
     @classmethod
     def init_directories(cls):
@@ -108,6 +220,26 @@ class Config:
 
         return browser_path
 
+    @classmethod
+    def get_profile_dir(cls, account: str = None) -> Path:
+        """
+        获取账号的持久化用户数据目录
+
+        Args:
+            account: 账号名称，默认使用 ACCOUNT_NAME
+        """
+        return cls.PROFILE_DIR / (account or cls.ACCOUNT_NAME)
+
+    @classmethod
+    def get_run_dir(cls, run_id: str) -> Path:
+        """
+        获取单次运行的输出目录（耗时记录、诊断文件等）
+
+        Args:
+            run_id: 运行ID
+        """
+        return cls.OUTPUT_DIR / 'runs' / run_id
+
     @classmethod
     def is_session_valid(cls) -> bool:
         """检查会话是否仍然有效"""
@@ -120,6 +252,17 @@ class Config:
 
         return file_age < max_age_seconds
 
+    @classmethod
+    def set_platform_url(cls, url: str):
+        """
+        切换创作者平台地址（如指向本地模拟平台 mock_platform），同时更新派生的页面URL
+        """
+        cls.CREATOR_PLATFORM_URL = url.rstrip('/')
+        cls.LOGIN_URL = f"{cls.CREATOR_PLATFORM_URL}/login"
+        cls.NOTES_DATA_URL = f"{cls.CREATOR_PLATFORM_URL}/statistics/data-analysis"
+        cls.FOLLOWERS_DATA_URL = f"{cls.CREATOR_PLATFORM_URL}/statistics/fans-data"
+        cls.FOLLOWERS_TREND_API_URL = f"{cls.CREATOR_PLATFORM_URL}{cls.FOLLOWERS_TREND_API_PATH}"
+
     @classmethod
     def get_output_filename(cls, prefix: str, extension: str = 'xlsx') -> str:
         """
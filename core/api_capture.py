@@ -0,0 +1,155 @@
+"""
+API响应捕获模块
+在单次抓取期间监听页面的API响应，只保留需要的字段，并限制保留的响应数量和单个响应大小，
+抓取结束后移除监听器，避免同一页面多次抓取时监听器和数据不断累积
+"""
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+from playwright.async_api import Page, Response
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ApiCapture:
+    """
+    作用域为单次抓取的API响应捕获（环形缓冲区）
+
+    用法:
+        async with ApiCapture(page, ['/api/fans'], projector=project) as capture:
+            await page.goto(url)
+        data = capture.items
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        url_keywords: Iterable[str],
+        projector: Optional[Callable[[Any], Any]] = None,
+        max_items: Optional[int] = None,
+        max_body_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            page: 要监听的页面
+            url_keywords: URL中包含任一关键字的响应才会被捕获
+            projector: 捕获时对JSON进行投影，只保留需要的字段；返回 None 表示丢弃
+            max_items: 最多保留的响应数量（超出时丢弃最早的），默认 Config.API_CAPTURE_MAX_RESPONSES
+            max_body_bytes: 单个响应体大小上限，默认 Config.API_CAPTURE_MAX_BODY_KB
+        """
+        self.page = page
+        self.url_keywords = list(url_keywords)
+        self.projector = projector
+        self.max_body_bytes = max_body_bytes or Config.API_CAPTURE_MAX_BODY_KB * 1024
+        self.items: Deque[Any] = deque(maxlen=max_items or Config.API_CAPTURE_MAX_RESPONSES)
+        self.stats: Dict[str, int] = {
+            'captured': 0,
+            'evicted': 0,
+            'oversized': 0,
+            'not_json': 0,
+            'unmatched': 0,
+        }
+        self._active = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def start(self):
+        """开始监听响应"""
+        if self._active:
+            return
+        self._active = True
+        self.page.on('response', self._on_response)
+
+    async def stop(self) -> List[Any]:
+        """
+        停止监听并移除监听器，丢弃尚未处理完的响应
+
+        Returns:
+            已捕获的数据列表
+        """
+        if self._active:
+            self._active = False
+            try:
+                self.page.remove_listener('response', self._on_response)
+            except Exception as e:
+                logger.debug(f"移除响应监听器失败: {e}")
+
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        dropped = {k: v for k, v in self.stats.items() if k != 'captured' and v}
+        if dropped:
+            logger.debug(f"API捕获统计: 已保留 {len(self.items)} 个，丢弃 {dropped}")
+
+        return list(self.items)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def _matches(self, url: str) -> bool:
+        return any(keyword in url for keyword in self.url_keywords)
+
+    def _on_response(self, response: Response):
+        """响应事件回调（同步），匹配的响应交给后台任务读取"""
+        if not self._active or not self._matches(response.url):
+            return
+
+        task = asyncio.create_task(self._handle(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, response: Response):
+        """读取、检查并投影响应体"""
+        try:
+            logger.debug(f"拦截到API: {response.url}")
+
+            content_length = response.headers.get('content-length')
+            if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+                self.stats['oversized'] += 1
+                logger.warning(f"API响应过大（{int(content_length) // 1024}KB），已跳过: {response.url}")
+                return
+
+            body = await response.body()
+            if len(body) > self.max_body_bytes:
+                self.stats['oversized'] += 1
+                logger.warning(f"API响应过大（{len(body) // 1024}KB），已跳过: {response.url}")
+                return
+
+            try:
+                data = json.loads(body)
+            except ValueError:
+                self.stats['not_json'] += 1
+                logger.warning("API响应不是JSON格式")
+                return
+
+            if self.projector is not None:
+                data = self.projector(data)
+                if data is None:
+                    self.stats['unmatched'] += 1
+                    return
+
+            if not self._active:
+                return
+
+            if len(self.items) == self.items.maxlen:
+                self.stats['evicted'] += 1
+            self.items.append(data)
+            self.stats['captured'] += 1
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"处理API响应时出错: {e}")
@@ -4,7 +4,7 @@
 """
 import asyncio
 from enum import Enum
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict
 from playwright.async_api import Page
 
 from config import Config
@@ -20,6 +20,118 @@ class LoginMethod(Enum):
     SMS = 'sms'        # 手机号+验证码登录
 
 
+# 登录成功后才会出现的页面元素（用户头像、退出按钮）
+LOGIN_SUCCESS_SELECTOR = '.user-avatar, .avatar, [class*="logout"]'
+
+# 登录成功信号的显示名称
+LOGIN_SIGNAL_NAMES = {
+    'url': 'URL跳转',
+    'cookie': '会话Cookie',
+    'element': '用户头像',
+}
+
+
+def is_login_success_url(url: str) -> bool:
+    """
+    判断URL是否为登录后的平台页面
+
+    Args:
+        url: 页面URL
+
+    Returns:
+        bool: 是否已跳转出登录页
+    """
+    return url.startswith(Config.CREATOR_PLATFORM_URL) and '/login' not in url
+
+
+async def wait_for_login(page: Page, timeout: Optional[float] = None) -> Optional[str]:
+    """
+    等待登录完成
+
+    同时监听三种登录成功信号，任意一个触发立即返回，无需轮询：
+    1. 页面导航到登录页以外的平台地址（framenavigated事件）
+    2. 平台下发会话Cookie（response事件中带Set-Cookie时检查，开始等待时为空的会话Cookie变为有值；
+       已有的Cookie被刷新或改写不算，避免过期会话或匿名Cookie误判，此时由URL或页面元素信号判断）
+    3. 页面出现用户头像/退出按钮等登录标识
+
+    Args:
+        page: 登录页面
+        timeout: 超时时间（秒），默认使用 Config.LOGIN_TIMEOUT
+
+    Returns:
+        触发的信号名称（'url' / 'cookie' / 'element'），超时或页面关闭返回 None
+    """
+    if timeout is None:
+        timeout = Config.LOGIN_TIMEOUT
+
+    if is_login_success_url(page.url):
+        return 'url'
+
+    loop = asyncio.get_running_loop()
+    signal: asyncio.Future = loop.create_future()
+
+    def resolve(name: Optional[str]):
+        if not signal.done():
+            signal.set_result(name)
+
+    # 记录初始Cookie，只有开始时为空的会话Cookie被设置才算登录成功
+    async def snapshot_cookies() -> Dict[str, str]:
+        cookies = await page.context.cookies(Config.CREATOR_PLATFORM_URL)
+        return {
+            c['name']: c['value']
+            for c in cookies
+            if c['name'] in Config.LOGIN_COOKIE_NAMES
+        }
+
+    baseline = await snapshot_cookies()
+
+    def on_navigated(frame):
+        if frame == page.main_frame and is_login_success_url(frame.url):
+            resolve('url')
+
+    async def check_cookies():
+        try:
+            current = await snapshot_cookies()
+            if any(value and not baseline.get(name) for name, value in current.items()):
+                resolve('cookie')
+        except Exception as e:
+            logger.debug(f"检查登录Cookie失败: {e}")
+
+    def on_response(response):
+        if signal.done() or 'set-cookie' not in response.headers:
+            return
+        asyncio.ensure_future(check_cookies())
+
+    def on_close(_page):
+        resolve(None)
+
+    async def wait_element():
+        try:
+            await page.wait_for_selector(
+                LOGIN_SUCCESS_SELECTOR,
+                state='attached',
+                timeout=timeout * 1000
+            )
+            resolve('element')
+        except Exception:
+            pass
+
+    page.on('framenavigated', on_navigated)
+    page.on('response', on_response)
+    page.on('close', on_close)
+    element_task = asyncio.ensure_future(wait_element())
+
+    try:
+        return await asyncio.wait_for(signal, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        element_task.cancel()
+        page.remove_listener('framenavigated', on_navigated)
+        page.remove_listener('response', on_response)
+        page.remove_listener('close', on_close)
+
+
 class AuthManager:
     """登录认证管理器"""
 
@@ -56,7 +168,7 @@ class AuthManager:
 
         try:
             update_status("正在创建浏览器页面...")
-            self.page = await browser_manager.new_page()
+            self.page = await browser_manager.acquire_page()
 
             update_status("正在导航到登录页面...")
             await self.page.goto(Config.LOGIN_URL)
@@ -92,6 +204,9 @@ class AuthManager:
             logger.error(f"登录出错: {e}", exc_info=True)
             return False
 
+        finally:
+            await self.close()
+
     async def _login_by_qrcode(self, status_callback: Callable[[str], None]) -> bool:
         """
         二维码登录
@@ -111,36 +226,12 @@ class AuthManager:
             await self.page.wait_for_selector('img[src*="qrcode"], .qrcode, canvas', timeout=10000)
             status_callback("二维码已显示，请使用小红书APP扫码")
 
-            # 等待登录成功（URL变化或出现用户头像）
+            # 等待登录成功（URL跳转、会话Cookie变化或出现用户头像，任意一个即可）
             logger.debug("等待用户扫码登录...")
-
-            # 方式1: 等待URL跳转到主页
-            try:
-                await self.page.wait_for_url(
-                    f"{Config.CREATOR_PLATFORM_URL}/**",
-                    timeout=60000  # 等待60秒
-                )
-                status_callback("检测到登录成功（URL跳转）")
+            signal = await wait_for_login(self.page, timeout=60)
+            if signal:
+                status_callback(f"检测到登录成功（{LOGIN_SIGNAL_NAMES[signal]}）")
                 return True
-            except:
-                logger.debug("URL未跳转，尝试检测登录元素")
-
-            # 方式2: 检测页面上是否有用户头像等登录标识
-            try:
-                await self.page.wait_for_selector('.user-avatar, .avatar, [class*="user"]', timeout=3000)
-                status_callback("检测到登录成功（用户头像）")
-                return True
-            except:
-                logger.debug("未检测到用户头像")
-
-            # 方式3: 检测特定登录成功标识
-            try:
-                # 检查是否有退出登录按钮等
-                await self.page.wait_for_selector('[class*="logout"], [class*="exit"]', timeout=3000)
-                status_callback("检测到登录成功（退出按钮）")
-                return True
-            except:
-                pass
 
             status_callback("登录超时或失败，请重试")
             return False
@@ -216,28 +307,16 @@ class AuthManager:
             # 等待登录结果
             status_callback("等待登录结果...")
 
-            # 等待URL跳转或登录标识
-            try:
-                await self.page.wait_for_url(
-                    f"{Config.CREATOR_PLATFORM_URL}/**",
-                    timeout=10000
-                )
+            # 等待URL跳转、会话Cookie变化或登录标识
+            if await wait_for_login(self.page, timeout=10):
                 status_callback("登录成功！")
                 return True
-            except:
-                # 检查是否有错误提示
-                try:
-                    error_msg = await self.page.query_selector('.error-message, .toast-error').inner_text()
-                    status_callback(f"登录失败: {error_msg}")
-                    return False
-                except:
-                    pass
 
-            # 最后尝试检测登录标识
+            # 检查是否有错误提示
             try:
-                await self.page.wait_for_selector('.user-avatar, .avatar', timeout=3000)
-                status_callback("登录成功！")
-                return True
+                error_msg = await self.page.query_selector('.error-message, .toast-error').inner_text()
+                status_callback(f"登录失败: {error_msg}")
+                return False
             except:
                 pass
 
@@ -256,9 +335,11 @@ class AuthManager:
         Returns:
             bool: 是否已登录
         """
+        owns_page = self.page is None
+
         try:
-            if not self.page:
-                self.page = await browser_manager.new_page()
+            if owns_page:
+                self.page = await browser_manager.acquire_page()
 
             await self.page.goto(Config.CREATOR_PLATFORM_URL)
             await self.page.wait_for_load_state('networkidle')
@@ -277,25 +358,37 @@ class AuthManager:
             logger.error(f"检查登录状态失败: {e}")
             return False
 
+        finally:
+            if owns_page:
+                await self.close()
+
     async def logout(self):
         """退出登录"""
         try:
-            if self.page:
+            async with browser_manager.lease_page() as page:
+                await page.goto(Config.CREATOR_PLATFORM_URL, wait_until='domcontentloaded')
+
                 # 尝试点击退出登录按钮
                 try:
-                    logout_btn = self.page.query_selector('[class*="logout"], [class*="exit"]')
+                    logout_btn = await page.query_selector('[class*="logout"], [class*="exit"]')
                     if logout_btn:
                         await logout_btn.click()
                         await asyncio.sleep(1)
                 except:
                     pass
 
-                # 清除会话文件
-                if Config.SESSION_FILE.exists():
-                    Config.SESSION_FILE.unlink()
-                    logger.info("已删除会话文件")
+            # 清除会话文件
+            if browser_manager.session_store.path.exists():
+                browser_manager.session_store.clear()
+                logger.info("已删除会话文件")
 
             logger.info("退出登录成功")
 
         except Exception as e:
             logger.error(f"退出登录失败: {e}")
+
+    async def close(self):
+        """归还页面到页面池"""
+        if self.page:
+            await browser_manager.release_page(self.page)
+            self.page = None
@@ -3,12 +3,19 @@
 使用单例模式管理Playwright浏览器实例
 """
 import asyncio
-import json
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 
 from config import Config
+from core.capture import (
+    TRACE_FILENAME, HAR_FILENAME, get_har_options, enforce_size_limit, prune_old_captures
+)
+from core.page_pool import PagePool
+from core.profile import prune_profile_cache, cleanup_stale_profiles
+from core.replay import install_replay
+from core.session_store import SessionStore
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -32,17 +39,25 @@ class BrowserManager:
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self.page_pool: Optional[PagePool] = None
+        self.session_store = SessionStore()
         self._initialized = True
         logger.info("浏览器管理器初始化完成")
 
-    async def launch(self) -> Browser:
+    async def launch(self) -> Optional[Browser]:
         """
         启动浏览器
+
+        持久化Profile模式下浏览器与上下文同时启动，返回值为 None
         """
         if self.browser is not None:
             logger.debug("浏览器已经启动，直接返回")
             return self.browser
 
+        if self._use_persistent_profile():
+            await self.create_context()
+            return self.browser
+
         try:
             logger.info(f"正在启动 {Config.BROWSER_TYPE} 浏览器...")
 
@@ -50,35 +65,12 @@ class BrowserManager:
             self.playwright = await async_playwright().start()
 
             # 启动浏览器
-            launch_options = {
-                'headless': Config.HEADLESS,
-                'slow_mo': Config.SLOW_MO,
-                'args': [
-                    '--disable-blink-features=AutomationControlled',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox'
-                ]
-            }
-
-            if Config.BROWSER_TYPE == 'chromium':
-                self.browser = await self.playwright.chromium.launch(**launch_options)
-            elif Config.BROWSER_TYPE == 'firefox':
-                self.browser = await self.playwright.firefox.launch(**launch_options)
-            elif Config.BROWSER_TYPE == 'webkit':
-                self.browser = await self.playwright.webkit.launch(**launch_options)
-            else:
-                raise ValueError(f"不支持的浏览器类型: {Config.BROWSER_TYPE}")
+            browser_type = self._get_browser_type()
+            self.browser = await browser_type.launch(**self._get_launch_options())
 
             logger.info("浏览器启动成功")
 
-            # 定位浏览器窗口到GUI右侧
-            try:
-                from utils.window_utils import position_browser_window_right
-                # 等待一下让窗口完全显示
-                await asyncio.sleep(1)
-                position_browser_window_right()
-            except Exception as e:
-                logger.debug(f"窗口定位失败（非关键错误）: {e}")
+            await self._position_window()
 
             return self.browser
 
@@ -86,46 +78,62 @@ class BrowserManager:
             logger.error(f"浏览器启动失败: {e}")
             raise
 
-    async def create_context(self, load_session: bool = True) -> BrowserContext:
+    async def create_context(
+        self,
+        load_session: bool = True,
+        extra_options: Optional[Dict[str, Any]] = None
+    ) -> BrowserContext:
         """
         创建浏览器上下文
 
         Args:
             load_session: 是否加载已保存的会话
+            extra_options: 额外的上下文选项（如HAR录制）
         """
         if self.context is not None:
             logger.debug("浏览器上下文已经存在，直接返回")
             return self.context
 
+        # 回放模式不读取真实会话，避免回放数据与真实登录状态混用
+        if Config.REPLAY_MODE:
+            load_session = False
+
         try:
+            if self._use_persistent_profile():
+                self.context = await self._launch_persistent_context(load_session, extra_options)
+                self.page_pool = PagePool(self.new_page, max_size=Config.PAGE_POOL_SIZE)
+
+                # 复用持久化上下文启动时自带的空白页
+                for page in self.context.pages:
+                    page.set_default_timeout(Config.PAGE_TIMEOUT)
+                    self.page_pool.adopt(page)
+
+                await self._install_replay()
+
+                logger.info("持久化浏览器上下文创建成功")
+                return self.context
+
             # 确保浏览器已启动
             if self.browser is None:
                 await self.launch()
 
             # 创建上下文的选项
-            context_options = {
-                'viewport': {
-                    'width': Config.BROWSER_WIDTH,
-                    'height': Config.BROWSER_HEIGHT
-                },
-                'locale': 'zh-CN',
-                'timezone_id': 'Asia/Shanghai',
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
+            context_options = {**self._get_context_options(), **(extra_options or {})}
 
             # 如果需要加载会话且会话文件存在
-            if load_session and Config.SESSION_FILE.exists():
-                logger.info(f"加载已保存的会话: {Config.SESSION_FILE}")
-                try:
-                    with open(Config.SESSION_FILE, 'r', encoding='utf-8') as f:
-                        storage_state = json.load(f)
+            if load_session and self.session_store.path.exists():
+                logger.info(f"加载已保存的会话: {self.session_store.path}")
+                storage_state = self.session_store.load()
+                if storage_state is not None:
                     context_options['storage_state'] = storage_state
                     logger.info("会话加载成功")
-                except Exception as e:
-                    logger.warning(f"会话加载失败: {e}，将创建新会话")
+                else:
+                    logger.warning("会话加载失败，将创建新会话")
 
             # 创建上下文
             self.context = await self.browser.new_context(**context_options)
+            self.page_pool = PagePool(self.new_page, max_size=Config.PAGE_POOL_SIZE)
+            await self._install_replay()
             logger.info("浏览器上下文创建成功")
 
             return self.context
@@ -134,6 +142,112 @@ class BrowserManager:
             logger.error(f"创建浏览器上下文失败: {e}")
             raise
 
+    async def _launch_persistent_context(
+        self,
+        load_session: bool,
+        extra_options: Optional[Dict[str, Any]] = None
+    ) -> BrowserContext:
+        """
+        使用账号的持久化用户数据目录启动浏览器
+
+        磁盘缓存跨次运行保留，启动前清理超出上限的缓存和长期未使用的其他账号Profile
+
+        Args:
+            load_session: Profile首次创建时是否从会话文件导入Cookie
+            extra_options: 额外的上下文选项
+        """
+        profile_dir = Config.get_profile_dir()
+        is_new_profile = not profile_dir.exists()
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        cache_max_bytes = Config.PROFILE_CACHE_MAX_MB * 1024 * 1024
+        prune_profile_cache(profile_dir, cache_max_bytes)
+        cleanup_stale_profiles(Config.PROFILE_MAX_AGE_DAYS, keep_account=Config.ACCOUNT_NAME)
+
+        logger.info(f"正在以持久化Profile启动 {Config.BROWSER_TYPE} 浏览器: {profile_dir}")
+
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        options = {
+            **self._get_launch_options(),
+            **self._get_context_options(),
+            **(extra_options or {})
+        }
+        if Config.BROWSER_TYPE == 'chromium':
+            options['args'].append(f'--disk-cache-size={cache_max_bytes}')
+
+        context = await self._get_browser_type().launch_persistent_context(
+            str(profile_dir),
+            **options
+        )
+        logger.info("浏览器启动成功")
+
+        # 新建的Profile没有登录状态，从已保存的会话中导入Cookie
+        if load_session and is_new_profile:
+            storage_state = self.session_store.load()
+            if storage_state and storage_state.get('cookies'):
+                await context.add_cookies(storage_state['cookies'])
+                logger.info("已从会话文件导入Cookie到新Profile")
+
+        await self._position_window()
+
+        return context
+
+    def _use_persistent_profile(self) -> bool:
+        """是否使用持久化Profile（回放模式下始终使用临时上下文，避免回放数据写入真实缓存）"""
+        return Config.PERSISTENT_PROFILE and not Config.REPLAY_MODE
+
+    async def _install_replay(self):
+        """回放模式下为当前上下文安装回放路由"""
+        if Config.REPLAY_MODE:
+            await install_replay(self.context)
+
+    def _get_browser_type(self):
+        """获取Playwright浏览器类型"""
+        if Config.BROWSER_TYPE == 'chromium':
+            return self.playwright.chromium
+        elif Config.BROWSER_TYPE == 'firefox':
+            return self.playwright.firefox
+        elif Config.BROWSER_TYPE == 'webkit':
+            return self.playwright.webkit
+        else:
+            raise ValueError(f"不支持的浏览器类型: {Config.BROWSER_TYPE}")
+
+    def _get_launch_options(self) -> Dict[str, Any]:
+        """浏览器启动选项"""
+        return {
+            'headless': Config.HEADLESS,
+            'slow_mo': Config.SLOW_MO,
+            'args': [
+                '--disable-blink-features=AutomationControlled',
+                '--no-sandbox',
+                '--disable-setuid-sandbox'
+            ]
+        }
+
+    def _get_context_options(self) -> Dict[str, Any]:
+        """浏览器上下文选项"""
+        return {
+            'viewport': {
+                'width': Config.BROWSER_WIDTH,
+                'height': Config.BROWSER_HEIGHT
+            },
+            'locale': 'zh-CN',
+            'timezone_id': 'Asia/Shanghai',
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        }
+
+    async def _position_window(self):
+        """定位浏览器窗口到GUI右侧"""
+        try:
+            from utils.window_utils import position_browser_window_right
+            # 等待一下让窗口完全显示
+            await asyncio.sleep(1)
+            position_browser_window_right()
+        except Exception as e:
+            logger.debug(f"窗口定位失败（非关键错误）: {e}")
+
     async def new_page(self) -> Page:
         """
         创建新页面
@@ -147,30 +261,144 @@ class BrowserManager:
 
         return page
 
+    async def ensure_context(self):
+        """确保浏览器上下文（及页面池）已创建"""
+        if self.context is None:
+            await self.create_context()
+
+    async def acquire_page(self) -> Page:
+        """
+        从页面池租借页面，使用完毕后需调用 release_page 归还
+        """
+        await self.ensure_context()
+
+        return await self.page_pool.acquire()
+
+    async def release_page(self, page: Page):
+        """
+        归还页面到页面池（非页面池中的页面会被关闭）
+        """
+        if self.page_pool is None:
+            if not page.is_closed():
+                await page.close()
+            return
+
+        await self.page_pool.release(page)
+
+    @asynccontextmanager
+    async def lease_page(self):
+        """
+        租借页面的上下文管理器，退出时自动归还
+
+        用法:
+            async with browser_manager.lease_page() as page:
+                await page.goto(url)
+        """
+        page = await self.acquire_page()
+        try:
+            yield page
+        finally:
+            await self.release_page(page)
+
+    def add_page_listener(self, page: Page, event: str, handler: Callable):
+        """
+        注册页面事件监听器，页面归还时自动移除
+        """
+        if self.page_pool is None:
+            page.on(event, handler)
+            return
+
+        self.page_pool.add_listener(page, event, handler)
+
+    @asynccontextmanager
+    async def capture(self, output_dir: Path, trace: bool = False, har: bool = False):
+        """
+        为单个任务录制Playwright trace和/或HAR
+
+        HAR只能在创建上下文时开启，因此录制HAR时会保存会话并重建上下文，
+        任务结束后关闭该上下文以写出HAR，之后按需重新创建普通上下文
+
+        用法:
+            async with browser_manager.capture(run_dir, trace=True, har=True):
+                await exporter.export_notes_data()
+
+        Args:
+            output_dir: 录制文件保存目录（运行目录）
+            trace: 是否录制trace（trace.zip，可用 playwright show-trace 查看）
+            har: 是否录制HAR（network.har）
+        """
+        if not trace and not har:
+            yield
+            return
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        if har:
+            if self.context is not None:
+                await self.save_session()
+                await self.close_context()
+            await self.create_context(extra_options=get_har_options(output_dir / HAR_FILENAME))
+            logger.info(f"已开启HAR录制: {output_dir / HAR_FILENAME}")
+        elif self.context is None:
+            await self.create_context()
+
+        if trace:
+            await self.context.tracing.start(
+                screenshots=Config.CAPTURE_TRACE_SCREENSHOTS,
+                snapshots=True
+            )
+            logger.info("已开启trace录制")
+
+        try:
+            yield
+
+        finally:
+            try:
+                if trace and self.context is not None:
+                    await self.context.tracing.stop(path=str(output_dir / TRACE_FILENAME))
+                    logger.info(f"trace已保存: {output_dir / TRACE_FILENAME}")
+
+                if har:
+                    # 关闭上下文时HAR才会写入磁盘
+                    await self.save_session()
+                    await self.close_context()
+                    logger.info(f"HAR已保存: {output_dir / HAR_FILENAME}")
+
+            except Exception as e:
+                logger.warning(f"保存录制文件失败: {e}")
+
+            enforce_size_limit(output_dir)
+            prune_old_captures(Config.CAPTURE_KEEP_RUNS)
+
     async def save_session(self):
         """保存当前会话状态"""
         if self.context is None:
             logger.warning("没有活动的浏览器上下文，无法保存会话")
             return
 
+        if Config.REPLAY_MODE:
+            logger.debug("回放模式，不保存会话")
+            return
+
         try:
             # 获取存储状态
             storage_state = await self.context.storage_state()
 
-            # 确保目录存在
-            Config.SESSION_DIR.mkdir(parents=True, exist_ok=True)
-
-            # 保存到文件
-            with open(Config.SESSION_FILE, 'w', encoding='utf-8') as f:
-                json.dump(storage_state, f, ensure_ascii=False, indent=2)
-
-            logger.info(f"会话已保存到: {Config.SESSION_FILE}")
+            # 原子写入（会话未变化时跳过）
+            if self.session_store.save(storage_state):
+                logger.info(f"会话已保存到: {self.session_store.path}")
+            else:
+                logger.info("会话未变化，无需重新保存")
 
         except Exception as e:
             logger.error(f"保存会话失败: {e}")
 
     async def close_context(self):
         """关闭浏览器上下文"""
+        if self.page_pool is not None:
+            await self.page_pool.close()
+            self.page_pool = None
+
         if self.context is not None:
             try:
                 await self.context.close()
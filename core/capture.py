@@ -0,0 +1,101 @@
+"""
+诊断录制模块
+为单个导出任务录制Playwright trace和HAR，用于分析慢请求和等待，并控制录制文件的大小和数量
+"""
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRACE_FILENAME = 'trace.zip'
+HAR_FILENAME = 'network.har'
+CAPTURE_FILENAMES = [TRACE_FILENAME, HAR_FILENAME]
+
+
+def get_har_options(har_path: Path) -> Dict[str, Any]:
+    """
+    HAR录制的浏览器上下文选项
+
+    只录制平台域名的请求；CAPTURE_HAR_CONTENT=omit 时不保存响应内容以减小文件
+
+    Args:
+        har_path: HAR文件路径
+    """
+    return {
+        'record_har_path': str(har_path),
+        'record_har_content': Config.CAPTURE_HAR_CONTENT,
+        'record_har_url_filter': re.compile(Config.CAPTURE_HAR_URL_PATTERN),
+    }
+
+
+def enforce_size_limit(output_dir: Path) -> List[Path]:
+    """
+    删除超过大小上限的录制文件
+
+    Args:
+        output_dir: 运行输出目录
+
+    Returns:
+        被删除的文件列表
+    """
+    max_bytes = Config.CAPTURE_MAX_MB * 1024 * 1024
+    removed = []
+
+    for filename in CAPTURE_FILENAMES:
+        path = output_dir / filename
+        if path.exists() and path.stat().st_size > max_bytes:
+            size_mb = path.stat().st_size / 1024 / 1024
+            path.unlink()
+            removed.append(path)
+            logger.warning(
+                f"录制文件 {path.name} 大小 {size_mb:.1f}MB 超过上限 "
+                f"{Config.CAPTURE_MAX_MB}MB，已删除"
+            )
+
+    return removed
+
+
+def prune_old_captures(keep_runs: int) -> int:
+    """
+    只保留最近 keep_runs 次运行的录制文件（耗时记录等其他文件不受影响）
+
+    Args:
+        keep_runs: 保留的运行数量
+
+    Returns:
+        int: 删除的文件数量
+    """
+    runs_dir = Config.OUTPUT_DIR / 'runs'
+    if not runs_dir.exists():
+        return 0
+
+    capture_files = [
+        path
+        for run_dir in runs_dir.iterdir() if run_dir.is_dir()
+        for path in (run_dir / filename for filename in CAPTURE_FILENAMES)
+        if path.exists()
+    ]
+
+    # 按所属运行目录分组，按最新修改时间排序
+    runs: Dict[Path, float] = {}
+    for path in capture_files:
+        runs[path.parent] = max(runs.get(path.parent, 0), path.stat().st_mtime)
+
+    stale_runs = sorted(runs, key=runs.get, reverse=True)[keep_runs:]
+    removed = 0
+
+    for run_dir in stale_runs:
+        for filename in CAPTURE_FILENAMES:
+            path = run_dir / filename
+            if path.exists():
+                path.unlink()
+                removed += 1
+
+    if removed:
+        logger.info(f"已清理 {len(stale_runs)} 次旧运行的录制文件")
+
+    return removed
@@ -0,0 +1,137 @@
+"""
+下载管理模块
+为每个下载任务分配唯一的临时路径（并发导出互不覆盖），
+优先直接读取浏览器已下载的文件而不另存副本，并计算内容哈希用于与上次导出比较
+"""
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Download
+
+from config import Config
+from core.export_index import ExportIndex, export_index, hash_file
+from utils.logger import get_logger, get_run_id
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DownloadResult:
+    """一次下载"""
+    download: Download
+    path: Path
+    suffix: str
+    sha256: str
+    size: int
+    # 文件由本模块另存（需要删除），否则为浏览器的下载文件（随浏览器上下文清理）
+    owned: bool = False
+
+
+class DownloadManager:
+    """
+    下载管理器
+
+    用法:
+        result = await downloads.fetch(download, 'notes')
+        try:
+            previous = downloads.find_unchanged(key, result)
+            ...
+        finally:
+            downloads.discard(result)
+    """
+
+    def __init__(self, index: Optional[ExportIndex] = None):
+        """
+        Args:
+            index: 导出索引，默认使用全局索引
+        """
+        self.index = index or export_index
+
+    @staticmethod
+    def job_path(prefix: str, suffix: str) -> Path:
+        """为下载任务生成唯一的临时文件路径"""
+        download_dir = Config.TEMP_DIR / 'downloads'
+        download_dir.mkdir(parents=True, exist_ok=True)
+        run_id = get_run_id() or 'manual'
+        return download_dir / f"{prefix}_{run_id}_{uuid.uuid4().hex[:8]}{suffix}"
+
+    async def fetch(self, download: Download, prefix: str) -> DownloadResult:
+        """
+        等待下载完成并计算内容哈希
+
+        本地浏览器直接使用其下载文件（不复制）；无法获取时（如远程浏览器）另存到唯一的临时路径
+
+        Args:
+            download: Playwright下载对象
+            prefix: 临时文件名前缀
+        """
+        suffix = Path(download.suggested_filename or '').suffix.lower() or '.xlsx'
+
+        path, owned = None, False
+        try:
+            source = await download.path()
+            if source:
+                path = Path(source)
+        except Exception as e:
+            logger.debug(f"无法直接读取浏览器下载文件，改为另存: {e}")
+
+        if path is None:
+            path = self.job_path(prefix, suffix)
+            await download.save_as(path)
+            owned = True
+
+        result = DownloadResult(
+            download=download,
+            path=path,
+            suffix=suffix,
+            sha256=hash_file(path),
+            size=path.stat().st_size,
+            owned=owned,
+        )
+        logger.info(f"下载完成: {download.suggested_filename}（{result.size // 1024}KB）")
+        return result
+
+    def find_unchanged(self, key: str, result: DownloadResult) -> Optional[Path]:
+        """下载内容与该类别上次导出相同时返回上次的输出文件（Config.EXPORT_SKIP_UNCHANGED 关闭时不比较）"""
+        if not Config.EXPORT_SKIP_UNCHANGED:
+            return None
+        return self.index.find_unchanged(key, result.sha256)
+
+    def remember(self, key: str, result: DownloadResult, output_path: Path):
+        """记录本次下载对应的输出文件"""
+        self.index.put(key, result.sha256, output_path)
+
+    async def deliver(self, result: DownloadResult, destination: Path) -> Path:
+        """
+        不做任何转换，将下载文件直接放到输出位置（只复制一次）
+
+        Args:
+            result: 下载结果
+            destination: 输出文件路径
+        """
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        if result.owned:
+            shutil.move(str(result.path), destination)
+            result.path, result.owned = destination, False
+        else:
+            await result.download.save_as(destination)
+
+        logger.info(f"下载文件已直接保存到: {destination}")
+        return destination
+
+    @staticmethod
+    def discard(result: DownloadResult):
+        """删除本模块另存的临时文件"""
+        if result.owned and result.path.exists():
+            try:
+                result.path.unlink()
+            except OSError as e:
+                logger.debug(f"删除临时下载文件失败: {e}")
+
+
+# 全局下载管理器
+download_manager = DownloadManager()
@@ -0,0 +1,196 @@
+"""
+导出索引模块
+记录每类导出（按账号、数据类型、日期范围区分）最近一次的内容哈希和输出文件，
+内容与上次相同时可直接复用上次的文件
+"""
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_INDEX_FILENAME = 'export_index.json'
+
+# 每次导出都会变化、不参与内容比较的列
+VOLATILE_COLUMNS = ('导出时间',)
+
+
+def export_key(data_type: str, window: Any = None) -> str:
+    """导出类别: 数据类型 + 账号 + 日期范围"""
+    return f"{data_type}:{Config.ACCOUNT_NAME}:{window if window is not None else 'default'}"
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalize_value(value: Any) -> Any:
+    """统一同一数据在不同来源下的表示（None/NaN/空串、1.0/1、日期类型）"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            return int(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    if hasattr(value, 'item'):
+        # numpy 标量
+        return _normalize_value(value.item())
+    return value
+
+
+def hash_rows(rows: List[Dict[str, Any]], ignore: Iterable[str] = VOLATILE_COLUMNS) -> str:
+    """
+    规范化数据的 SHA-256（与行顺序、列顺序无关，忽略导出时间等易变列）
+
+    Args:
+        rows: 数据（字典列表）
+        ignore: 不参与比较的列
+    """
+    ignore = set(ignore)
+    lines = sorted(
+        json.dumps(
+            {k: _normalize_value(v) for k, v in row.items() if k not in ignore},
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        for row in rows
+    )
+
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class ExportIndex:
+    """
+    导出索引（JSON文件，原子写入）
+
+    每条记录: {key: {"sha256": 内容哈希, "path": 输出文件, "updated_at": 时间}}
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: 索引文件路径，默认 DATA_DIR/export_index.json
+        """
+        self.path = Path(path) if path else Config.DATA_DIR / EXPORT_INDEX_FILENAME
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"导出索引读取失败，将重新建立: {e}")
+            return {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entries, ensure_ascii=False, indent=2)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """全部记录"""
+        with self._lock:
+            return self._load()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取记录"""
+        with self._lock:
+            return self._load().get(key)
+
+    def find_unchanged(self, key: str, sha256: str) -> Optional[Path]:
+        """
+        内容与上次相同且上次的输出文件仍存在时返回该文件
+
+        Args:
+            key: 导出类别
+            sha256: 本次内容哈希
+        """
+        entry = self.get(key)
+        if not entry or entry.get('sha256') != sha256:
+            return None
+
+        path = Path(entry['path'])
+        return path if path.exists() else None
+
+    def reuse_unchanged(self, key: str, sha256: str, filename: str) -> Optional[Path]:
+        """
+        内容未变化时返回可沿用的输出文件，调用方跳过写入
+
+        Config.EXPORT_UNCHANGED_MODE 为 link 时以本次文件名创建指向上次文件的硬链接
+        （不占用额外空间，按文件名查找最新导出的流程不受影响），否则直接返回上次的文件
+
+        Args:
+            key: 导出类别
+            sha256: 本次内容哈希
+            filename: 本次输出文件名
+        """
+        if not Config.EXPORT_SKIP_UNCHANGED:
+            return None
+
+        previous = self.find_unchanged(key, sha256)
+        if previous is None:
+            return None
+
+        if Config.EXPORT_UNCHANGED_MODE == 'link':
+            target = previous.parent / filename
+            if target != previous and not target.exists():
+                try:
+                    os.link(previous, target)
+                    self.put(key, sha256, target)
+                    return target
+                except OSError as e:
+                    logger.debug(f"创建硬链接失败，沿用上次文件: {e}")
+
+        return previous
+
+    def put(self, key: str, sha256: str, path: Path):
+        """记录本次导出"""
+        with self._lock:
+            entries = self._load()
+            entries[key] = {
+                'sha256': sha256,
+                'path': str(path),
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            try:
+                self._save(entries)
+            except Exception as e:
+                logger.warning(f"写入导出索引失败: {e}")
+
+
+# 全局导出索引
+export_index = ExportIndex()
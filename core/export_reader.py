@@ -0,0 +1,416 @@
+"""
+历史导出读取模块
+为输出目录中的历史导出文件建立目录（账号、数据类型、导出时间、数据日期范围），
+每个文件只解析一次并按内容哈希缓存（安装了 pyarrow 时为 parquet 列式文件，否则为 pickle），再次读取时直接加载缓存
+
+用法:
+    from core.export_reader import export_reader
+    df = export_reader.load_history('followers', start_date='2025-01-01', end_date='2025-01-31')
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from config import Config
+from core.export_index import export_index, hash_file
+from utils.date_window import DateLike, to_date
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 输出文件名: <前缀>_<YYYYMMDD_HHMMSS>.<扩展名>
+EXPORT_FILE_PATTERN = re.compile(r'^(?P<prefix>notes_data|followers_data)(?:_(?P<ts>\d{8}_\d{6}))?\.(?P<ext>xlsx|xls|csv)$')
+
+# 文件名前缀 -> 数据类型
+DATA_TYPES = {
+    'notes_data': 'notes',
+    'followers_data': 'followers',
+}
+
+# 各数据类型的日期列（用于确定数据日期范围和按日期筛选）
+DATE_COLUMNS = {
+    'notes': '发布时间',
+    'followers': '日期',
+}
+
+# 合并多次导出时的去重列（同一条数据以较晚的导出为准）
+KEY_COLUMNS = {
+    'notes': ['笔记ID', '笔记id', '笔记Id', 'note_id', 'noteId'],
+    'followers': ['日期'],
+}
+
+CATALOG_FILENAME = 'catalog.json'
+
+
+@dataclass
+class ExportEntry:
+    """一个历史导出文件"""
+    path: str
+    data_type: str
+    account: str
+    exported_at: str
+    sha256: str
+    size: int
+    mtime_ns: int
+    rows: int = 0
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+    def overlaps(self, start: Optional[str], end: Optional[str]) -> bool:
+        """数据日期范围是否与 [start, end] 有交集（无日期范围的文件视为有交集）"""
+        if self.start_date is None or self.end_date is None:
+            return True
+        if start and self.end_date < start:
+            return False
+        if end and self.start_date > end:
+            return False
+        return True
+
+
+class ExportReader:
+    """
+    历史导出读取器
+
+    - 目录按文件的大小和修改时间判断是否变化，未变化的文件不重新计算哈希
+    - 解析结果按内容哈希缓存（安装了 pyarrow 时为 parquet，否则为 pickle），内容相同的文件共用缓存
+    - 最近读取的数据额外保留在内存中
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            output_dir: 导出文件目录，默认 Config.OUTPUT_DIR
+            cache_dir: 缓存目录，默认 Config.EXPORT_CACHE_DIR
+        """
+        self.output_dir = Path(output_dir) if output_dir else Config.OUTPUT_DIR
+        self.cache_dir = Path(cache_dir) if cache_dir else Config.EXPORT_CACHE_DIR
+        self._catalog: Optional[Dict[str, ExportEntry]] = None
+        self._frames: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ---------- 目录 ----------
+
+    @property
+    def catalog_path(self) -> Path:
+        return self.cache_dir / CATALOG_FILENAME
+
+    def _load_catalog(self) -> Dict[str, ExportEntry]:
+        if self._catalog is not None:
+            return self._catalog
+
+        self._catalog = {}
+        if self.catalog_path.exists():
+            try:
+                with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                    self._catalog = {path: ExportEntry(**entry) for path, entry in json.load(f).items()}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"导出目录读取失败，将重新建立: {e}")
+        return self._catalog
+
+    def _save_catalog(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({path: asdict(entry) for path, entry in self._catalog.items()},
+                          ensure_ascii=False, indent=2)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{CATALOG_FILENAME}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.catalog_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def refresh(self) -> List[ExportEntry]:
+        """
+        扫描输出目录，为新增或变化的文件建立目录条目（首次遇到的内容会被解析并缓存）
+
+        Returns:
+            全部导出文件（按导出时间从早到晚）
+        """
+        with self._lock:
+            catalog = self._load_catalog()
+            seen = set()
+            changed = False
+
+            for file_path in self.output_dir.glob('*_data*.*') if self.output_dir.exists() else []:
+                match = EXPORT_FILE_PATTERN.match(file_path.name)
+                if not match:
+                    continue
+
+                key = str(file_path.resolve())
+                seen.add(key)
+                stat = file_path.stat()
+                entry = catalog.get(key)
+                if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                    continue
+
+                try:
+                    catalog[key] = self._index_file(file_path, match, stat)
+                    changed = True
+                except Exception as e:
+                    logger.warning(f"无法读取导出文件，已跳过: {file_path.name}: {e}")
+
+            # 移除已删除的文件
+            for key in set(catalog) - seen:
+                del catalog[key]
+                changed = True
+
+            if changed:
+                self._remove_orphan_frames()
+                try:
+                    self._save_catalog()
+                except Exception as e:
+                    logger.warning(f"保存导出目录失败: {e}")
+
+            return sorted(catalog.values(), key=lambda entry: entry.exported_at)
+
+    def _index_file(self, file_path: Path, match: 're.Match', stat: os.stat_result) -> ExportEntry:
+        """计算哈希、解析（或加载已有缓存）并生成目录条目"""
+        data_type = DATA_TYPES[match.group('prefix')]
+        if match.group('ts'):
+            exported_at = datetime.strptime(match.group('ts'), '%Y%m%d_%H%M%S')
+        else:
+            exported_at = datetime.fromtimestamp(stat.st_mtime)
+
+        sha256 = hash_file(file_path)
+        df = self._frame(sha256, file_path)
+
+        start_date = end_date = None
+        date_column = DATE_COLUMNS[data_type]
+        if date_column in df.columns and len(df):
+            dates = df[date_column].astype(str).str.slice(0, 10)
+            dates = dates[dates.str.match(r'^\d{4}-\d{2}-\d{2}$')]
+            if len(dates):
+                start_date, end_date = dates.min(), dates.max()
+
+        return ExportEntry(
+            path=str(file_path.resolve()),
+            data_type=data_type,
+            account=self._account_of(file_path),
+            exported_at=exported_at.isoformat(timespec='seconds'),
+            sha256=sha256,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            rows=len(df),
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    @staticmethod
+    def _account_of(file_path: Path) -> str:
+        """导出文件所属账号（导出索引中有记录时以记录为准）"""
+        for key, entry in export_index.entries().items():
+            if Path(entry['path']).resolve() == file_path.resolve():
+                return key.split(':')[1]
+        return Config.ACCOUNT_NAME
+
+    # ---------- 解析缓存 ----------
+
+    @staticmethod
+    def _cache_format() -> str:
+        try:
+            import pyarrow  # noqa: F401
+            return 'parquet'
+        except ImportError:
+            return 'pkl'
+
+    def _cache_file(self, sha256: str) -> Optional[Path]:
+        for ext in ('parquet', 'pkl'):
+            path = self.cache_dir / f"{sha256}.{ext}"
+            if path.exists():
+                return path
+        return None
+
+    def _frame(self, sha256: str, source: Optional[Path] = None):
+        """按内容哈希取得数据（内存 -> 缓存文件 -> 解析源文件）"""
+        import pandas as pd
+
+        if sha256 in self._frames:
+            self._frames.move_to_end(sha256)
+            return self._frames[sha256]
+
+        cache_file = self._cache_file(sha256)
+        df = None
+        if cache_file is not None:
+            try:
+                df = pd.read_parquet(cache_file) if cache_file.suffix == '.parquet' else pd.read_pickle(cache_file)
+            except Exception as e:
+                logger.warning(f"缓存读取失败，重新解析: {e}")
+
+        if df is None:
+            if source is None:
+                raise FileNotFoundError(f"缓存不存在: {sha256}")
+            df = self._parse(source)
+            self._write_cache(sha256, df)
+
+        self._frames[sha256] = df
+        while len(self._frames) > max(Config.EXPORT_CACHE_MEMORY_ITEMS, 0):
+            self._frames.popitem(last=False)
+        return df
+
+    @staticmethod
+    def _parse(file_path: Path):
+        """解析导出文件"""
+        import pandas as pd
+
+        logger.info(f"解析导出文件并缓存: {file_path.name}")
+        if file_path.suffix == '.csv':
+            # 粉丝数据固定以UTF-8 BOM写入
+            encoding = 'utf-8-sig' if file_path.name.startswith('followers_data') else Config.CSV_ENCODING
+            return pd.read_csv(file_path, encoding=encoding)
+        return pd.read_excel(file_path)
+
+    def _write_cache(self, sha256: str, df):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # 混合类型的列（如数字和文本）无法写入parquet时改用pickle，保持与源文件解析结果一致
+        for ext in (['parquet', 'pkl'] if self._cache_format() == 'parquet' else ['pkl']):
+            temp_path = self.cache_dir / f".{sha256}.{ext}.tmp"
+            try:
+                if ext == 'parquet':
+                    df.to_parquet(temp_path, index=False)
+                else:
+                    df.to_pickle(temp_path)
+                os.replace(temp_path, self.cache_dir / f"{sha256}.{ext}")
+                return
+            except Exception as e:
+                logger.debug(f"写入{ext}缓存失败: {e}")
+                if temp_path.exists():
+                    temp_path.unlink()
+
+        logger.warning(f"写入缓存失败（不影响读取）: {sha256}")
+
+    def _remove_orphan_frames(self):
+        """删除不再被任何导出文件引用的缓存"""
+        referenced = {entry.sha256 for entry in self._catalog.values()}
+        for cache_file in self.cache_dir.glob('*.*') if self.cache_dir.exists() else []:
+            if cache_file.name != CATALOG_FILENAME and cache_file.stem not in referenced:
+                try:
+                    cache_file.unlink()
+                except OSError:
+                    pass
+
+    # ---------- 查询 ----------
+
+    def list(
+        self,
+        data_type: Optional[str] = None,
+        account: Optional[str] = None,
+        start_date: DateLike = None,
+        end_date: DateLike = None
+    ) -> List[ExportEntry]:
+        """
+        查询历史导出文件（按导出时间从早到晚）
+
+        Args:
+            data_type: notes / followers，默认全部
+            account: 账号，默认全部
+            start_date / end_date: 只返回数据日期范围与之有交集的文件
+        """
+        start, end = to_date(start_date), to_date(end_date)
+        start_text = start.isoformat() if start else None
+        end_text = end.isoformat() if end else None
+
+        return [
+            entry for entry in self.refresh()
+            if (data_type is None or entry.data_type == data_type)
+            and (account is None or entry.account == account)
+            and entry.overlaps(start_text, end_text)
+        ]
+
+    def load(self, source: Union[ExportEntry, str, Path]):
+        """
+        读取一个导出文件（已缓存时不再解析）
+
+        Args:
+            source: 目录条目或文件路径
+
+        Returns:
+            DataFrame（与缓存共享，修改前请先 copy）
+        """
+        with self._lock:
+            if isinstance(source, ExportEntry):
+                return self._frame(source.sha256, Path(source.path))
+
+            path = Path(source).resolve()
+            catalog = self._load_catalog()
+            entry = catalog.get(str(path))
+            stat = path.stat()
+            if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                return self._frame(entry.sha256, path)
+
+            match = EXPORT_FILE_PATTERN.match(path.name)
+            if not match or path.parent != self.output_dir.resolve():
+                # 不在输出目录中的文件：只按内容哈希缓存，不加入目录
+                return self._frame(hash_file(path), path)
+
+            # 只为这一个文件建立目录条目，不扫描整个输出目录
+            entry = catalog[str(path)] = self._index_file(path, match, stat)
+            try:
+                self._save_catalog()
+            except Exception as e:
+                logger.warning(f"保存导出目录失败: {e}")
+            return self._frame(entry.sha256, path)
+
+    def load_history(
+        self,
+        data_type: str,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        account: Optional[str] = None
+    ):
+        """
+        合并多次导出的数据
+
+        同一条数据（笔记按笔记ID，粉丝数据按日期）以最晚的导出为准，并按日期列筛选到 [start_date, end_date]
+
+        Args:
+            data_type: notes / followers
+            start_date / end_date: 数据日期范围（含）
+            account: 账号，默认 Config.ACCOUNT_NAME
+
+        Returns:
+            DataFrame
+        """
+        import pandas as pd
+
+        entries = self.list(data_type, account or Config.ACCOUNT_NAME, start_date, end_date)
+        if not entries:
+            return pd.DataFrame()
+
+        df = pd.concat([self.load(entry) for entry in entries], ignore_index=True)
+
+        date_column = DATE_COLUMNS[data_type]
+        if date_column in df.columns:
+            dates = df[date_column].astype(str).str.slice(0, 10)
+            start, end = to_date(start_date), to_date(end_date)
+            if start:
+                df, dates = df[dates >= start.isoformat()], dates[dates >= start.isoformat()]
+            if end:
+                df = df[dates <= end.isoformat()]
+
+        key_column = next((c for c in KEY_COLUMNS[data_type] if c in df.columns), None)
+        if key_column:
+            df = df.drop_duplicates(subset=[key_column], keep='last')
+        if date_column in df.columns:
+            df = df.sort_values(date_column, kind='stable')
+
+        return df.reset_index(drop=True)
+
+    def clear_memory(self):
+        """释放内存中的数据（缓存文件保留）"""
+        with self._lock:
+            self._frames.clear()
+
+
+# 全局历史导出读取器
+export_reader = ExportReader()
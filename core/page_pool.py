@@ -0,0 +1,204 @@
+"""
+页面池模块
+复用浏览器页面，限制同时打开的页面数量，避免长时间运行时内存持续增长
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+from playwright.async_api import Page
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PagePool:
+    """
+    页面池（租借/归还模式）
+
+    - acquire() 租借页面：优先复用空闲页面，超过上限时等待其他任务归还
+    - release() 归还页面：移除登记的监听器并导航到 about:blank 后放回池中
+    - 租借前做健康检查，已关闭或无响应的页面直接丢弃并重新创建
+    """
+
+    # 健康检查超时时间（秒）
+    HEALTH_CHECK_TIMEOUT = 2
+
+    def __init__(self, page_factory: Callable[[], Awaitable[Page]], max_size: int = 3):
+        """
+        Args:
+            page_factory: 创建新页面的协程函数
+            max_size: 页面池最大页面数量（空闲 + 租借中）
+        """
+        self.page_factory = page_factory
+        self.max_size = max(1, max_size)
+        self._idle: List[Page] = []
+        self._leased: Set[Page] = set()
+        self._listeners: Dict[Page, List[Tuple[str, Callable]]] = {}
+        # 已占用的位置数（租借中 + 正在创建），满额时 acquire 在条件变量上等待
+        self._in_use = 0
+        self._slot_freed = asyncio.Condition()
+
+    @property
+    def size(self) -> int:
+        """当前池中页面数量（空闲 + 租借中）"""
+        return len(self._idle) + len(self._leased)
+
+    @property
+    def available(self) -> int:
+        """当前可立即租借的位置数"""
+        return max(0, self.max_size - self._in_use)
+
+    async def acquire(self) -> Page:
+        """
+        租借一个页面
+
+        Returns:
+            Page: 可用的页面
+        """
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self._in_use < self.max_size)
+            self._in_use += 1
+
+        try:
+            while self._idle:
+                page = self._idle.pop()
+                if await self._is_healthy(page):
+                    logger.debug(f"复用页面池中的页面（空闲: {len(self._idle)}）")
+                    self._leased.add(page)
+                    return page
+                logger.debug("丢弃不健康的页面")
+                await self._discard(page)
+
+            page = await self.page_factory()
+            self._leased.add(page)
+            logger.debug(f"页面池创建新页面（总数: {self.size}/{self.max_size}）")
+            return page
+
+        except Exception:
+            await self._free_slot()
+            raise
+
+    async def release(self, page: Page):
+        """
+        归还页面
+
+        不是从池中租借的页面会被直接关闭
+
+        Args:
+            page: 要归还的页面
+        """
+        self._remove_listeners(page)
+
+        if page not in self._leased:
+            await self._discard(page)
+            return
+
+        self._leased.discard(page)
+
+        try:
+            if page.is_closed():
+                return
+
+            await self._reset(page)
+            self._idle.append(page)
+            logger.debug(f"页面已归还到页面池（空闲: {len(self._idle)}）")
+
+        except Exception as e:
+            logger.debug(f"重置页面失败，丢弃该页面: {e}")
+            await self._discard(page)
+
+        finally:
+            await self._free_slot()
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        租借页面的上下文管理器，退出时自动归还
+
+        用法:
+            async with pool.lease() as page:
+                await page.goto(url)
+        """
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            await self.release(page)
+
+    def adopt(self, page: Page):
+        """
+        将已有页面放入空闲队列（如持久化上下文启动时自带的页面）
+
+        Args:
+            page: 页面
+        """
+        if self.size < self.max_size:
+            self._idle.append(page)
+
+    def add_listener(self, page: Page, event: str, handler: Callable):
+        """
+        注册页面事件监听器，归还页面时自动移除
+
+        Args:
+            page: 页面
+            event: 事件名称（如 'response'）
+            handler: 回调函数
+        """
+        page.on(event, handler)
+        self._listeners.setdefault(page, []).append((event, handler))
+
+    async def close(self):
+        """
+        关闭池中所有页面
+
+        租借中的页面在归还时直接关闭；正在等待位置的 acquire 会被唤醒并在清空后的池中重新租借
+        """
+        for page in self._idle + list(self._leased):
+            self._remove_listeners(page)
+            await self._discard(page)
+
+        self._idle.clear()
+        self._leased.clear()
+
+        async with self._slot_freed:
+            self._in_use = 0
+            self._slot_freed.notify_all()
+        logger.debug("页面池已清空")
+
+    async def _free_slot(self):
+        """释放一个位置并唤醒一个等待者"""
+        async with self._slot_freed:
+            self._in_use = max(0, self._in_use - 1)
+            self._slot_freed.notify()
+
+    def _remove_listeners(self, page: Page):
+        """移除页面上登记的监听器"""
+        for event, handler in self._listeners.pop(page, []):
+            try:
+                page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    async def _reset(self, page: Page):
+        """重置页面状态"""
+        await page.goto('about:blank')
+
+    async def _is_healthy(self, page: Page) -> bool:
+        """检查页面是否仍可用"""
+        if page.is_closed():
+            return False
+
+        try:
+            await asyncio.wait_for(page.evaluate('1'), self.HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, page: Page):
+        """关闭并丢弃页面"""
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception as e:
+            logger.debug(f"关闭页面失败: {e}")
@@ -0,0 +1,119 @@
+"""
+浏览器配置目录（持久化Profile）管理模块
+每个账号使用独立的用户数据目录，跨次运行保留HTTP缓存、Service Worker和编译后的JS
+"""
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 可安全删除的缓存目录（相对于用户数据目录），删除后仅影响缓存命中，不影响登录状态
+CACHE_SUBDIRS = [
+    'Default/Cache',
+    'Default/Code Cache',
+    'Default/GPUCache',
+    'Default/Service Worker/CacheStorage',
+    'Default/Service Worker/ScriptCache',
+    'cache2',  # Firefox
+]
+
+
+def get_dir_size(path: Path) -> int:
+    """
+    计算目录总大小
+
+    Args:
+        path: 目录路径
+
+    Returns:
+        int: 字节数
+    """
+    if not path.exists():
+        return 0
+
+    total = 0
+    for file in path.rglob('*'):
+        try:
+            if file.is_file():
+                total += file.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def prune_profile_cache(profile_dir: Path, max_bytes: int) -> int:
+    """
+    缓存超过上限时清空缓存目录
+
+    Args:
+        profile_dir: 用户数据目录
+        max_bytes: 缓存大小上限
+
+    Returns:
+        int: 释放的字节数
+    """
+    cache_dirs = [profile_dir / subdir for subdir in CACHE_SUBDIRS]
+    cache_size = sum(get_dir_size(d) for d in cache_dirs)
+
+    if cache_size <= max_bytes:
+        logger.debug(f"Profile缓存大小: {cache_size / 1024 / 1024:.1f}MB")
+        return 0
+
+    logger.info(
+        f"Profile缓存 {cache_size / 1024 / 1024:.1f}MB 超过上限 "
+        f"{max_bytes / 1024 / 1024:.0f}MB，正在清理..."
+    )
+    for cache_dir in cache_dirs:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return cache_size
+
+
+def cleanup_stale_profiles(max_age_days: int, keep_account: Optional[str] = None) -> int:
+    """
+    删除长时间未使用的账号Profile
+
+    Args:
+        max_age_days: 超过多少天未使用即删除
+        keep_account: 始终保留的账号（当前账号）
+
+    Returns:
+        int: 删除的Profile数量
+    """
+    if not Config.PROFILE_DIR.exists():
+        return 0
+
+    removed = 0
+    cutoff = time.time() - max_age_days * 86400
+
+    for profile_dir in Config.PROFILE_DIR.iterdir():
+        if not profile_dir.is_dir() or profile_dir.name == keep_account:
+            continue
+
+        try:
+            if profile_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                removed += 1
+                logger.info(f"已删除长期未使用的Profile: {profile_dir.name}")
+        except OSError as e:
+            logger.debug(f"检查Profile失败 {profile_dir}: {e}")
+
+    return removed
+
+
+def clear_profile(account: Optional[str] = None):
+    """
+    删除账号的整个Profile（需在浏览器关闭后调用）
+
+    Args:
+        account: 账号名称，默认当前账号
+    """
+    profile_dir = Config.get_profile_dir(account)
+    if profile_dir.exists():
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        logger.info(f"已删除Profile: {profile_dir}")
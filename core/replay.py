@@ -0,0 +1,127 @@
+"""
+离线回放模块
+用录制的HAR和JSON固定数据代替真实的创作者平台，使导出流程无需联网和登录即可完整运行
+
+HAR可直接使用诊断录制（CAPTURE_HAR）生成的 network.har；
+JSON固定数据通过固定数据目录中的 manifest.json 声明，优先级高于HAR：
+
+    {
+        "routes": [
+            {"url": "**/api/**/fans/**", "file": "fans_trend.json"},
+            {"url": "**/notes/export**", "file": "notes.xlsx",
+             "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+             "headers": {"Content-Disposition": "attachment; filename=notes.xlsx"}}
+        ]
+    }
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from playwright.async_api import BrowserContext, Route
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def load_manifest(fixtures_dir: Path) -> List[Dict[str, Any]]:
+    """
+    读取固定数据清单
+
+    Args:
+        fixtures_dir: 固定数据目录
+
+    Returns:
+        路由列表，清单不存在或格式错误时返回空列表
+    """
+    manifest_path = fixtures_dir / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return []
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"固定数据清单读取失败: {e}")
+        return []
+
+    routes = []
+    for entry in manifest.get('routes', []):
+        if not entry.get('url') or not entry.get('file'):
+            logger.warning(f"忽略无效的固定数据路由: {entry}")
+            continue
+        if not (fixtures_dir / entry['file']).exists():
+            logger.warning(f"固定数据文件不存在: {fixtures_dir / entry['file']}")
+            continue
+        routes.append(entry)
+
+    return routes
+
+
+def _make_fixture_handler(fixture_path: Path, entry: Dict[str, Any]):
+    """创建返回固定数据文件的路由处理函数"""
+    content_type = entry.get('content_type')
+    if content_type is None:
+        content_type = 'application/json' if fixture_path.suffix == '.json' else None
+
+    async def handler(route: Route):
+        logger.debug(f"回放固定数据: {route.request.url} -> {fixture_path.name}")
+        await route.fulfill(
+            status=entry.get('status', 200),
+            path=str(fixture_path),
+            content_type=content_type,
+            headers=entry.get('headers')
+        )
+
+    return handler
+
+
+async def install_replay(
+    context: BrowserContext,
+    har_path: Optional[Path] = None,
+    fixtures_dir: Optional[Path] = None
+) -> int:
+    """
+    为浏览器上下文安装回放路由
+
+    先注册HAR回放，再注册JSON固定数据（Playwright按注册的相反顺序匹配路由，
+    因此固定数据会覆盖HAR中的同名请求）
+
+    Args:
+        context: 浏览器上下文
+        har_path: HAR文件路径，默认 Config.REPLAY_HAR
+        fixtures_dir: 固定数据目录，默认 Config.REPLAY_FIXTURES_DIR
+
+    Returns:
+        int: 安装的路由数量
+    """
+    har_path = Path(har_path) if har_path else Config.REPLAY_HAR
+    fixtures_dir = Path(fixtures_dir) if fixtures_dir else Config.REPLAY_FIXTURES_DIR
+    installed = 0
+
+    if har_path and har_path.is_file():
+        await context.route_from_har(
+            str(har_path),
+            url=re.compile(Config.CAPTURE_HAR_URL_PATTERN),
+            not_found=Config.REPLAY_NOT_FOUND
+        )
+        installed += 1
+        logger.info(f"已加载HAR回放: {har_path}")
+    elif har_path:
+        logger.warning(f"HAR文件不存在，跳过HAR回放: {har_path}")
+
+    for entry in load_manifest(fixtures_dir):
+        fixture_path = fixtures_dir / entry['file']
+        await context.route(entry['url'], _make_fixture_handler(fixture_path, entry))
+        installed += 1
+
+    if installed:
+        logger.info(f"离线回放已启用，共 {installed} 条回放路由")
+    else:
+        logger.warning("离线回放已启用，但没有可用的HAR或固定数据")
+
+    return installed
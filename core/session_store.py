@@ -0,0 +1,137 @@
+"""
+会话存储模块
+负责浏览器会话（storage_state）的读写：紧凑编码、原子写入、会话未变化时跳过重写
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SessionStore:
+    """会话存储"""
+
+    def __init__(self, path: Optional[Path] = None, keep_origins: Optional[List[str]] = None):
+        """
+        Args:
+            path: 会话文件路径，默认使用 Config.SESSION_FILE
+            keep_origins: 需要保留 localStorage 的源列表，为空时全部保留
+        """
+        self.path = Path(path) if path else Config.SESSION_FILE
+        self.keep_origins = keep_origins if keep_origins is not None else Config.SESSION_KEEP_ORIGINS
+        self._state_digest: Optional[str] = None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取会话
+
+        Returns:
+            storage_state字典，文件不存在或损坏时返回 None
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                storage_state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"会话文件读取失败: {e}")
+            return None
+
+        self._state_digest = self._digest_state(storage_state)
+        return storage_state
+
+    def save(self, storage_state: Dict[str, Any]) -> bool:
+        """
+        保存会话（先写临时文件再替换，避免写入中途崩溃损坏会话）
+
+        Cookie与localStorage均未发生变化时不重写文件，仅刷新修改时间以保持会话有效期
+
+        Args:
+            storage_state: 浏览器上下文的 storage_state
+
+        Returns:
+            bool: 是否实际写入了文件
+        """
+        storage_state = self._prune_origins(storage_state)
+        digest = self._digest_state(storage_state)
+
+        if self._state_digest is None and self.path.exists():
+            self.load()
+
+        if digest == self._state_digest and self.path.exists():
+            os.utime(self.path)
+            logger.debug("会话未变化，跳过写入")
+            return False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(storage_state, ensure_ascii=False, separators=(',', ':'))
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent,
+            prefix=f".{self.path.name}.",
+            suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        self._state_digest = digest
+        logger.debug(f"会话已写入: {self.path} ({len(data)} 字节)")
+        return True
+
+    def clear(self):
+        """删除会话文件"""
+        if self.path.exists():
+            self.path.unlink()
+        self._state_digest = None
+
+    def _prune_origins(self, storage_state: Dict[str, Any]) -> Dict[str, Any]:
+        """只保留指定源的 localStorage"""
+        if not self.keep_origins:
+            return storage_state
+
+        origins = [
+            origin for origin in storage_state.get('origins', [])
+            if origin.get('origin') in self.keep_origins
+        ]
+        return {**storage_state, 'origins': origins}
+
+    @staticmethod
+    def _digest_state(storage_state: Dict[str, Any]) -> str:
+        """
+        计算会话摘要
+
+        覆盖完整的 storage_state（Cookie 的全部字段含过期时间、各源的 localStorage），
+        Cookie、源和 localStorage 条目按键排序，顺序变化不视为会话变化
+        """
+        cookies = sorted(
+            storage_state.get('cookies', []),
+            key=lambda c: (c.get('domain', ''), c.get('path', ''), c.get('name', ''))
+        )
+        origins = sorted(
+            (
+                {**origin, 'localStorage': sorted(
+                    origin.get('localStorage', []), key=lambda item: item.get('name', '')
+                )}
+                for origin in storage_state.get('origins', [])
+            ),
+            key=lambda origin: origin.get('origin', '')
+        )
+        normalized = {**storage_state, 'cookies': cookies, 'origins': origins}
+        data = json.dumps(normalized, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
@@ -225,7 +225,7 @@ class LoginDialog:
             if not self.page:
                 await browser_manager.launch()
                 await browser_manager.create_context()
-                self.page = await browser_manager.new_page()
+                self.page = await browser_manager.acquire_page()
 
             self._update_status("正在打开登录页面...")
 
@@ -362,6 +362,11 @@ class LoginDialog:
     async def _do_qrcode_login(self):
         """执行二维码登录"""
         try:
+            # 登录流程由 AuthManager 自行租借页面，先归还预览二维码的页面
+            if self.page:
+                await browser_manager.release_page(self.page)
+                self.page = None
+
             self.is_logged_in = await self.auth_manager.login(
                 method=LoginMethod.QRCODE,
                 status_callback=self._update_status
@@ -5,14 +5,16 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import threading
 
 from config import Config
-from core.auth import AuthManager
+from core.auth import AuthManager, LOGIN_SIGNAL_NAMES, is_login_success_url, wait_for_login
 from core.browser import browser_manager
 from modules.unified_exporter import UnifiedExporter
+from modules.scheduler import ExportScheduler
 from utils.logger import get_logger, Logger
+from utils.memory import memory_profiler, get_page_count_threadsafe, install_signal_trigger
 
 logger = get_logger(__name__)
 
@@ -38,6 +40,12 @@ class MainWindowV2:
         self.loop = None
         self.loop_thread = None
 
+        # 后台内存采样线程
+        self._memory_thread: Optional[threading.Thread] = None
+
+        # 定时导出调度器
+        self.scheduler: Optional[ExportScheduler] = None
+
         # 导出配置变量
         self.export_notes = tk.BooleanVar(value=True)
         self.export_followers = tk.BooleanVar(value=True)
@@ -50,7 +58,13 @@ class MainWindowV2:
         self._create_widgets()
 
         # 设置日志回调
-        Logger.add_gui_callback(self._append_log)
+        Logger.add_gui_callback(self._append_logs)
+        self._schedule_log_drain()
+
+        # 内存采样（定期采样 / 状态栏按钮 / kill -USR1 触发）
+        if Config.MEMORY_PROFILE:
+            self._schedule_memory_sample()
+        install_signal_trigger(lambda: self.root.after(0, self._sample_memory))
 
         # 启动事件循环
         self._start_event_loop()
@@ -58,6 +72,10 @@ class MainWindowV2:
         # 延迟1秒后自动检查登录状态
         self.root.after(1000, self._auto_check_login_status)
 
+        # 启用定时任务时，等待登录检查后启动调度器
+        if Config.SCHEDULER_ENABLED:
+            self.root.after(2000, self._start_scheduler)
+
     def _create_widgets(self):
         """创建GUI组件"""
         # 创建右侧面板（导出配置）在主窗口中
@@ -252,6 +270,14 @@ class MainWindowV2:
         )
         self.status_label.pack(fill=tk.X, side=tk.LEFT)
 
+        memory_btn = ttk.Button(
+            status_bar,
+            text="内存",
+            width=5,
+            command=self._sample_memory
+        )
+        memory_btn.pack(side=tk.RIGHT)
+
         version_label = ttk.Label(
             status_bar,
             text="v2.0",
@@ -369,6 +395,17 @@ class MainWindowV2:
         if self.loop:
             asyncio.run_coroutine_threadsafe(coro, self.loop)
 
+    def _start_scheduler(self):
+        """启动定时导出调度器（与手动导出共用浏览器，依次执行）"""
+        try:
+            self.scheduler = ExportScheduler(self.unified_exporter)
+        except Exception as e:
+            logger.error(f"定时任务配置加载失败: {e}")
+            return
+
+        logger.info(f"定时任务已启用，共 {len(self.scheduler.jobs)} 个任务")
+        self._run_async(self.scheduler.run())
+
     def _auto_check_login_status(self):
         """自动检查登录状态"""
         # 检查会话文件是否存在
@@ -384,11 +421,13 @@ class MainWindowV2:
 
     async def _do_auto_check_login(self):
         """执行自动登录检查"""
+        page = None
+
         try:
             # 启动浏览器并加载会话
             await browser_manager.launch()
             await browser_manager.create_context()
-            page = await browser_manager.new_page()
+            page = await browser_manager.acquire_page()
 
             # 导航到主页检查登录状态
             logger.info("正在导航到主页检查登录状态...")
@@ -420,6 +459,11 @@ class MainWindowV2:
             logger.error(f"自动检查登录状态失败: {e}")
             self.root.after(0, lambda: self._update_status("登录状态检查失败"))
 
+        finally:
+            # 归还页面到页面池
+            if page:
+                await browser_manager.release_page(page)
+
     def _open_login_dialog(self):
         """打开浏览器进行登录"""
         if self.is_logged_in:
@@ -431,6 +475,8 @@ class MainWindowV2:
 
     async def _do_login(self):
         """执行登录流程"""
+        page = None
+
         try:
             def update_progress(msg: str):
                 self._update_status(msg)
@@ -440,31 +486,16 @@ class MainWindowV2:
 
             await browser_manager.launch()
             await browser_manager.create_context()
-            page = await browser_manager.new_page()
+            page = await browser_manager.acquire_page()
 
             update_progress("正在打开登录页面...")
 
             # 导航到登录页面
-            await page.goto(Config.LOGIN_URL)
-            await page.wait_for_load_state('domcontentloaded')
-            await asyncio.sleep(2)  # 等待页面完全加载
-
-            # 立即检查是否已经登录
-            update_progress("正在检查登录状态...")
-            is_already_logged_in = False
-
-            try:
-                # 检查URL
-                if Config.CREATOR_PLATFORM_URL in page.url and '/login' not in page.url:
-                    is_already_logged_in = True
-                    logger.info("检测到已登录（URL检查）")
-                elif await browser_manager.is_logged_in(page):
-                    is_already_logged_in = True
-                    logger.info("检测到已登录（页面元素检查）")
-            except Exception as e:
-                logger.info(f"登录状态检查: {e}")
+            await page.goto(Config.LOGIN_URL, wait_until='domcontentloaded')
 
-            if is_already_logged_in:
+            # 已登录时平台会直接跳转到主页
+            if is_login_success_url(page.url):
+                logger.info("检测到已登录（URL检查）")
                 update_progress("✅ 检测到已登录，保存会话...")
                 await browser_manager.save_session()
                 self.root.after(0, lambda: self._on_login_complete(True))
@@ -473,35 +504,28 @@ class MainWindowV2:
             # 未登录，提示用户登录
             update_progress("✅ 浏览器已打开，请在浏览器中登录（扫码或手机号）")
 
-            # 等待用户登录（最多等待2分钟）
-            for i in range(24):  # 24 * 5秒 = 120秒
-                await asyncio.sleep(5)
-
-                # 检查是否登录成功
-                try:
-                    # 检查URL是否跳转到主页
-                    if Config.CREATOR_PLATFORM_URL in page.url and '/login' not in page.url:
-                        update_progress("✅ 登录成功！正在保存会话...")
-                        await browser_manager.save_session()
-                        break
-
-                    # 检查是否有登录标识
-                    if await browser_manager.is_logged_in(page):
-                        update_progress("✅ 登录成功！正在保存会话...")
-                        await browser_manager.save_session()
-                        break
-
-                except:
-                    continue
+            # 等待登录成功信号（导航、会话Cookie、登录标识，任意一个触发即返回）
+            signal = await wait_for_login(page, timeout=Config.LOGIN_TIMEOUT)
 
-            # 更新登录状态
-            self.root.after(0, lambda: self._on_login_complete(True))
+            if signal:
+                logger.info(f"检测到登录成功（{LOGIN_SIGNAL_NAMES[signal]}）")
+                update_progress("✅ 登录成功！正在保存会话...")
+                await browser_manager.save_session()
+                self.root.after(0, lambda: self._on_login_complete(True))
+            else:
+                update_progress("登录超时，请重试")
+                self.root.after(0, lambda: self._on_login_complete(False, "等待登录超时"))
 
         except Exception as e:
             error_msg = str(e)
             update_progress(f"登录过程出错: {error_msg}")
             self.root.after(0, lambda msg=error_msg: self._on_login_complete(False, msg))
 
+        finally:
+            # 归还页面到页面池
+            if page:
+                await browser_manager.release_page(page)
+
     def _on_login_complete(self, success: bool, error_msg: str = None, show_message: bool = True):
         """
         登录完成回调
@@ -536,15 +560,45 @@ class MainWindowV2:
             if error_msg and show_message:
                 messagebox.showerror("失败", f"登录失败：\n{error_msg}")
 
-    def _append_log(self, message: str):
-        """追加日志到日志区域"""
-        def _do_append():
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.insert(tk.END, message + '\n')
-            self.log_text.see(tk.END)
-            self.log_text.config(state=tk.DISABLED)
+    def _schedule_log_drain(self):
+        """定时从日志队列批量取出日志显示"""
+        Logger.dispatch_gui_logs(Config.LOG_GUI_MAX_LINES_PER_TICK)
+        self.root.after(Config.LOG_GUI_INTERVAL_MS, self._schedule_log_drain)
+
+    def _schedule_memory_sample(self):
+        """定时采样内存"""
+        self._sample_memory()
+        self.root.after(Config.MEMORY_SAMPLE_INTERVAL * 1000, self._schedule_memory_sample)
+
+    def _sample_memory(self):
+        """在后台线程采样一次内存（不阻塞界面），完成后在GUI线程显示到状态栏"""
+        if self._memory_thread is not None and self._memory_thread.is_alive():
+            logger.debug("上一次内存采样尚未完成，跳过")
+            return
+
+        def run_sample():
+            try:
+                sample = memory_profiler.sample(page_count=get_page_count_threadsafe(self.loop))
+                summary = memory_profiler.format_summary(sample)
+                self.root.after(0, lambda: self._update_status(summary))
+            except Exception as e:
+                logger.warning(f"内存采样失败: {e}")
+
+        self._memory_thread = threading.Thread(target=run_sample, name='memory-sample', daemon=True)
+        self._memory_thread.start()
+
+    def _append_logs(self, messages: List[str]):
+        """批量追加日志到日志区域（在GUI线程中调用），超出保留行数时删除最早的日志"""
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.insert(tk.END, '\n'.join(messages) + '\n')
+
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        overflow = line_count - Config.LOG_GUI_SCROLLBACK
+        if overflow > 0:
+            self.log_text.delete('1.0', f'{overflow + 1}.0')
 
-        self.root.after(0, _do_append)
+        self.log_text.see(tk.END)
+        self.log_text.config(state=tk.DISABLED)
 
     def _update_status(self, message: str):
         """更新底部状态栏"""
@@ -557,6 +611,8 @@ class MainWindowV2:
             self.root.mainloop()
         finally:
             # 清理资源
+            if self.scheduler:
+                self.scheduler.stop()
             if self.loop:
                 self.loop.call_soon_threadsafe(self.loop.stop)
             logger.info("应用程序退出")
@@ -2,12 +2,14 @@
 新版主程序入口
 小红书创作者平台数据抓取工具
 """
+import argparse
 import sys
 import os
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import Config
 from gui.main_window_v2 import MainWindowV2
 from utils.logger import get_logger
 
@@ -16,6 +18,17 @@ logger = get_logger(__name__)
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='小红书创作者平台数据抓取工具')
+    parser.add_argument('--memory-profile', action='store_true',
+                        help='定期采样内存使用（结果写入 logs/memory.jsonl）')
+    parser.add_argument('--memory-interval', type=int, help='内存采样间隔（秒）')
+    args = parser.parse_args()
+
+    if args.memory_profile:
+        Config.MEMORY_PROFILE = True
+    if args.memory_interval:
+        Config.MEMORY_SAMPLE_INTERVAL = args.memory_interval
+
     try:
         # 创建并运行主窗口
         app = MainWindowV2()
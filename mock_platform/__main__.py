@@ -0,0 +1,62 @@
+"""
+启动本地模拟创作者平台
+
+用法:
+    python -m mock_platform --port 8765 --latency-ms 200 --jitter-ms 100 --notes 5000
+
+然后在 .env 中设置（或作为环境变量传入）:
+    CREATOR_PLATFORM_URL=http://127.0.0.1:8765
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mock_platform.server import MockPlatformServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟创作者平台')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--latency-ms', type=int, default=0, help='每个请求的固定延迟（毫秒）')
+    parser.add_argument('--jitter-ms', type=int, default=0, help='随机延迟上限（毫秒）')
+    parser.add_argument('--fans-days', type=int, default=60, help='粉丝数据天数')
+    parser.add_argument('--notes', type=int, default=200, help='笔记导出文件中的笔记数量')
+    parser.add_argument('--padding-kb', type=int, default=0, help='粉丝接口响应附加的填充数据（KB）')
+    parser.add_argument('--no-api', action='store_true', help='粉丝页不请求粉丝接口（只能通过tooltip提取）')
+    parser.add_argument('--require-login', action='store_true', help='未登录时跳转到登录页')
+    parser.add_argument('--login-delay-ms', type=int, default=1000,
+                        help='登录页自动模拟扫码成功的延迟，-1 表示需要手动点击')
+    args = parser.parse_args()
+
+    server = MockPlatformServer(
+        host=args.host,
+        port=args.port,
+        serve_api=not args.no_api,
+        require_login=args.require_login,
+        login_delay_ms=args.login_delay_ms,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fans_days=args.fans_days,
+        notes_count=args.notes,
+        padding_bytes=args.padding_kb * 1024
+    )
+
+    print(f"模拟创作者平台已启动: {server.url}")
+    print(f"设置 CREATOR_PLATFORM_URL={server.url} 后运行导出器即可使用")
+    print("按 Ctrl+C 停止")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n请求统计:")
+        for path, count in server.stats.most_common():
+            print(f"  {count:>6}  {path}")
+
+
+if __name__ == '__main__':
+    main()
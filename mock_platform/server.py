@@ -0,0 +1,491 @@
+"""
+本地模拟创作者平台
+实现登录跳转、粉丝数据页（图表、tooltip、自定义日期范围）、粉丝JSON接口和笔记导出下载，
+支持配置人为延迟和数据量，用于压测、延迟调优和基准测试
+
+将 CREATOR_PLATFORM_URL 指向该服务器即可让所有导出器使用它（见 __main__.py）
+"""
+import io
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+# 登录后下发的会话Cookie（与 Config.LOGIN_COOKIE_NAMES 的默认值一致）
+SESSION_COOKIE = 'galaxy_creator_session_id'
+
+FANS_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>粉丝数据</title>
+<style>
+  body { font-family: sans-serif; margin: 20px; }
+  .select-item-default { display: inline-block; padding: 4px 10px; margin-right: 6px; cursor: pointer; border: 1px solid #ccc; }
+  .item-active { border-color: #ff2442; color: #ff2442; }
+  .fans-chart { position: relative; width: 900px; height: 300px; margin-top: 16px; background: #fafafa; }
+  .chart-tooltip { position: absolute; display: none; padding: 6px; background: #fff; border: 1px solid #ddd; pointer-events: none; }
+</style>
+</head>
+<body>
+<div class="user-avatar">模拟账号</div>
+<div>粉丝总数 <span class="fans-count">__TOTAL__</span></div>
+<div class="date-options">
+  <label class="select-item-default">近7天</label>
+  <label class="select-item-default item-active">近30天</label>
+</div>
+<div class="date-range-picker">
+  <input class="date-start" placeholder="开始日期">
+  <input class="date-end" placeholder="结束日期">
+</div>
+<div class="series-options">
+  <label class="select-item-default item-active" data-series="new">新增粉丝数</label>
+  <label class="select-item-default" data-series="lost">流失粉丝数</label>
+  <label class="select-item-default" data-series="total">总粉丝数</label>
+</div>
+<div class="fans-chart"><div class="chart-tooltip"></div></div>
+<script>
+  const SERIES = __SERIES__;
+  const SERVE_API = __SERVE_API__;
+  let days = 30;
+  let series = 'new';
+
+  function activate(label) {
+    label.parentElement.querySelectorAll('label').forEach(l => l.classList.remove('item-active'));
+    label.classList.add('item-active');
+  }
+
+  function loadApi() {
+    if (!SERVE_API) return;
+    fetch('/api/fans/trend?days=' + days);
+    fetch('/api/fans/data');
+  }
+
+  document.querySelectorAll('.date-options label').forEach(label => {
+    label.addEventListener('click', () => {
+      activate(label);
+      days = label.textContent.includes('7') ? 7 : 30;
+      loadApi();
+    });
+  });
+
+  // 自定义日期范围：开始、结束都填写后按回车请求该范围的数据
+  document.querySelectorAll('.date-range-picker input').forEach(input => {
+    input.addEventListener('keydown', event => {
+      const start = document.querySelector('.date-start').value;
+      const end = document.querySelector('.date-end').value;
+      if (event.key !== 'Enter' || !start || !end || !SERVE_API) return;
+      fetch(`/api/fans/trend?start_date=${start}&end_date=${end}`);
+    });
+  });
+
+  document.querySelectorAll('.series-options label').forEach(label => {
+    label.addEventListener('click', () => {
+      activate(label);
+      series = label.dataset.series;
+    });
+  });
+
+  const chart = document.querySelector('.fans-chart');
+  const tooltip = document.querySelector('.chart-tooltip');
+  const names = {new: '新增粉丝数', lost: '流失粉丝数', total: '总粉丝数'};
+
+  chart.addEventListener('mousemove', event => {
+    const points = SERIES.slice(-days);
+    const rect = chart.getBoundingClientRect();
+    const index = Math.min(points.length - 1, Math.floor((event.clientX - rect.left) / rect.width * points.length));
+    if (index < 0) return;
+    const point = points[index];
+    tooltip.innerHTML = '<div>' + point.date + '</div><div>' + names[series] + '</div><div>' + point[series] + '</div>';
+    tooltip.style.left = (event.clientX - rect.left + 10) + 'px';
+    tooltip.style.top = '10px';
+    tooltip.style.display = 'block';
+  });
+
+  chart.addEventListener('mouseleave', () => { tooltip.style.display = 'none'; });
+
+  loadApi();
+</script>
+</body>
+</html>
+"""
+
+NOTES_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>笔记数据</title></head>
+<body>
+<div class="user-avatar">模拟账号</div>
+<div class="date-range-picker">
+  <input class="date-start" placeholder="开始日期">
+  <input class="date-end" placeholder="结束日期">
+</div>
+<button onclick="exportNotes()">导出数据</button>
+<script>
+  function exportNotes() {
+    const start = document.querySelector('.date-start').value;
+    const end = document.querySelector('.date-end').value;
+    const query = (start || end) ? `?start_date=${start}&end_date=${end}` : '';
+    location.href = '/api/notes/export' + query;
+  }
+</script>
+</body>
+</html>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>创作者中心</title></head>
+<body>
+<div class="user-avatar">模拟账号</div>
+<a href="/statistics/fans-data">粉丝数据</a>
+<a href="/statistics/data-analysis">笔记数据</a>
+<a class="logout" href="/api/mock/logout">退出登录</a>
+</body>
+</html>
+"""
+
+# 登录页：展示二维码占位图，__LOGIN_DELAY__ 毫秒后模拟扫码成功
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>登录</title></head>
+<body>
+<div class="login-box">
+  <div class="qrcode" style="width:160px;height:160px;background:#eee">二维码</div>
+  <a href="/api/mock/login">模拟扫码登录</a>
+</div>
+<script>
+  const delay = __LOGIN_DELAY__;
+  if (delay >= 0) setTimeout(() => { location.href = '/api/mock/login'; }, delay);
+</script>
+</body>
+</html>
+"""
+
+# 粉丝趋势接口单次查询的最大天数
+MAX_RANGE_DAYS = 30
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def generate_fans_series(days: int = 60, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    生成按日期升序的粉丝数据
+
+    Args:
+        days: 天数
+        seed: 随机种子（保证每次运行数据一致）
+
+    Returns:
+        [{'date', 'new', 'lost', 'total'}, ...]
+    """
+    rng = random.Random(seed)
+    total = 10000
+    series = []
+
+    for offset in range(days, 0, -1):
+        new = rng.randint(20, 200)
+        lost = rng.randint(0, 50)
+        total += new - lost
+        series.append({
+            'date': (date.today() - timedelta(days=offset)).isoformat(),
+            'new': new,
+            'lost': lost,
+            'total': total,
+        })
+
+    return series
+
+
+def generate_notes(count: int = 200, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    生成笔记数据（列名与平台导出文件一致）
+
+    Args:
+        count: 笔记数量
+        seed: 随机种子
+
+    Returns:
+        笔记数据列表
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            '笔记ID': f"note{i:06d}",
+            '笔记标题': f"测试笔记 {i} " + '内容' * rng.randint(1, 20),
+            '发布时间': (date.today() - timedelta(days=i % 365)).isoformat(),
+            '曝光量': rng.randint(100, 100000),
+            '观看量': rng.randint(50, 50000),
+            '点赞数': rng.randint(0, 5000),
+            '评论数': rng.randint(0, 500),
+            '收藏数': rng.randint(0, 2000),
+            '分享数': rng.randint(0, 300),
+            '涨粉数': rng.randint(0, 100),
+        }
+        for i in range(count)
+    ]
+
+
+def build_notes_xlsx(notes: List[Dict[str, Any]]) -> bytes:
+    """生成笔记导出文件的内容"""
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    pd.DataFrame(notes).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+class MockPlatformServer:
+    """
+    模拟创作者平台（在后台线程中运行）
+
+    用法:
+        with MockPlatformServer(latency_ms=200) as server:
+            Config.set_platform_url(server.url)
+            ...
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        serve_api: bool = True,
+        require_login: bool = False,
+        login_delay_ms: int = 1000,
+        latency_ms: int = 0,
+        jitter_ms: int = 0,
+        fans_days: int = 60,
+        notes_count: int = 200,
+        padding_bytes: int = 0
+    ):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+            serve_api: 粉丝页是否请求粉丝API（False 时只能通过tooltip提取）
+            require_login: 未登录时是否将平台页面跳转到登录页
+            login_delay_ms: 登录页自动模拟扫码成功的延迟，-1 表示需要手动点击
+            latency_ms: 每个请求的固定延迟
+            jitter_ms: 在固定延迟上叠加的随机延迟上限
+            fans_days: 粉丝数据的天数
+            notes_count: 笔记导出文件中的笔记数量
+            padding_bytes: 粉丝接口响应中附加的填充数据大小（模拟大响应）
+        """
+        self.host = host
+        self.port = port
+        self.serve_api = serve_api
+        self.require_login = require_login
+        self.login_delay_ms = login_delay_ms
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.padding = 'x' * padding_bytes
+        self.fans_series = generate_fans_series(max(fans_days, 1))
+        self.notes = generate_notes(notes_count)
+        self.notes_xlsx = build_notes_xlsx(self.notes)
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """服务器地址"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """在后台线程中启动服务器"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """在当前线程中运行服务器（命令行使用）"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+
+    def stop(self):
+        """停止服务器"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fans_page(self) -> str:
+        """粉丝数据页HTML"""
+        return (FANS_PAGE
+                .replace('__TOTAL__', f"{self.fans_series[-1]['total']:,}")
+                .replace('__SERIES__', json.dumps(self.fans_series))
+                .replace('__SERVE_API__', 'true' if self.serve_api else 'false'))
+
+    def fans_trend(self, days: int, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        粉丝趋势接口响应（最新的在前）
+
+        指定 start_date / end_date 时返回该日期范围的数据，单次最多 MAX_RANGE_DAYS 天
+        """
+        if start_date or end_date:
+            end_date = end_date or self.fans_series[-1]['date']
+            start_date = start_date or end_date
+            span_days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+            if span_days > MAX_RANGE_DAYS or span_days <= 0:
+                return {'code': 400, 'msg': f'日期范围最多 {MAX_RANGE_DAYS} 天'}
+            points = [p for p in self.fans_series if start_date <= p['date'] <= end_date]
+        else:
+            points = self.fans_series[-days:]
+
+        response = {
+            'code': 0,
+            'data': {
+                'list': [
+                    {'date': p['date'], 'new_count': p['new'], 'lost_count': p['lost']}
+                    for p in reversed(points)
+                ]
+            }
+        }
+        if self.padding:
+            response['padding'] = self.padding
+        return response
+
+    def fans_data(self) -> Dict[str, Any]:
+        """粉丝概览接口响应"""
+        latest = self.fans_series[-1]
+        response = {
+            'code': 0,
+            'data': {
+                'total': latest['total'],
+                'new_count': latest['new'],
+                'lost_count': latest['lost'],
+            }
+        }
+        if self.padding:
+            response['padding'] = self.padding
+        return response
+
+    def notes_export(self, query: Dict[str, List[str]]) -> bytes:
+        """笔记导出文件内容（指定 start_date / end_date 时只包含该范围内发布的笔记）"""
+        start_date = query.get('start_date', [''])[0]
+        end_date = query.get('end_date', [''])[0]
+        if not start_date and not end_date:
+            return self.notes_xlsx
+
+        return build_notes_xlsx([
+            note for note in self.notes
+            if (not start_date or note['发布时间'] >= start_date)
+            and (not end_date or note['发布时间'] <= end_date)
+        ])
+
+    def _delay(self):
+        """模拟网络和服务端延迟"""
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            delay_ms += random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _count(self, path: str):
+        with self._stats_lock:
+            self.stats[path] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str,
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_html(self, html: str):
+                self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+            def _send_json(self, data: Dict[str, Any]):
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self._send(200, body, 'application/json')
+
+            def _redirect(self, location: str, headers: Optional[Dict[str, str]] = None):
+                self._send(302, b'', 'text/plain', {'Location': location, **(headers or {})})
+
+            def _is_logged_in(self) -> bool:
+                return f"{SESSION_COOKIE}=" in self.headers.get('Cookie', '')
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                path = parsed.path
+                server._count(path)
+                server._delay()
+
+                if path == '/login':
+                    self._send_html(LOGIN_PAGE.replace('__LOGIN_DELAY__', str(server.login_delay_ms)))
+                    return
+
+                if path == '/api/mock/login':
+                    self._redirect('/new/home', {
+                        'Set-Cookie': f"{SESSION_COOKIE}=mock-{int(time.time())}; Path=/"
+                    })
+                    return
+
+                if path == '/api/mock/logout':
+                    self._redirect('/login', {
+                        'Set-Cookie': f"{SESSION_COOKIE}=; Path=/; Max-Age=0"
+                    })
+                    return
+
+                if server.require_login and not self._is_logged_in():
+                    if path.startswith('/api/'):
+                        self._send(401, b'{"code":-100,"msg":"not logged in"}', 'application/json')
+                    else:
+                        self._redirect('/login')
+                    return
+
+                if path in ('/', '/new/home'):
+                    self._send_html(HOME_PAGE)
+                elif path == '/statistics/fans-data':
+                    self._send_html(server.fans_page())
+                elif path == '/statistics/data-analysis':
+                    self._send_html(NOTES_PAGE)
+                elif path == '/api/fans/trend':
+                    query = parse_qs(parsed.query)
+                    days = int(query.get('days', ['30'])[0])
+                    self._send_json(server.fans_trend(
+                        days,
+                        start_date=query.get('start_date', [None])[0],
+                        end_date=query.get('end_date', [None])[0]
+                    ))
+                elif path == '/api/fans/data':
+                    self._send_json(server.fans_data())
+                elif path == '/api/notes/export':
+                    self._send(200, server.notes_export(parse_qs(parsed.query)), XLSX_CONTENT_TYPE, {
+                        'Content-Disposition': 'attachment; filename="notes.xlsx"'
+                    })
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+        return Handler
@@ -0,0 +1,120 @@
+"""
+粉丝数据缺口检测
+写入文件前找出请求的日期范围内各数据类型缺失的日期，
+并根据已采集的采样位置估算这些日期在图表上的位置，只对缺口重新采样
+"""
+import re
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DATE_PATTERN = re.compile(r'(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})')
+
+
+def parse_date(text: str) -> Optional[date]:
+    """解析 2026-10-19 / 2026/10/19 / 2026年10月19日 格式的日期"""
+    match = DATE_PATTERN.search(str(text))
+    if not match:
+        return None
+
+    try:
+        return date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def expected_dates(start: date, end: date) -> List[date]:
+    """
+    请求的日期范围内的全部日期
+
+    Args:
+        start: 开始日期（含）
+        end: 结束日期（含）
+
+    Returns:
+        日期列表（从新到旧）
+    """
+    return [end - timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def find_gaps(
+    rows: List[Dict[str, object]],
+    start: date,
+    end: date,
+    fields: Iterable[str]
+) -> Dict[str, List[date]]:
+    """
+    找出请求的日期范围内各数据类型缺失的日期
+
+    只有没有采集到的日期才是缺口；采集到的0是真实数据（小账号大部分日期为0），不重新采样
+
+    Args:
+        rows: 每日数据（含 '日期' 字段，只包含采集到的字段）
+        start: 请求的开始日期
+        end: 请求的结束日期（最新一天缺失时同样能检测到）
+        fields: 要检查的字段
+
+    Returns:
+        {字段: [缺口日期, ...]}，没有缺口的字段不包含在内
+    """
+    by_date = {}
+    for row in rows:
+        parsed = parse_date(row.get('日期', ''))
+        if parsed:
+            by_date[parsed] = row
+
+    gaps: Dict[str, List[date]] = {}
+    window = expected_dates(start, end)
+
+    for field_name in fields:
+        missing = [day for day in window if field_name not in by_date.get(day, {})]
+        if missing:
+            gaps[field_name] = missing
+
+    return gaps
+
+
+def group_dates(dates: Iterable[date]) -> List[Tuple[date, date]]:
+    """
+    将日期合并为连续的区间
+
+    Returns:
+        [(区间开始, 区间结束), ...]（从早到晚）
+    """
+    ranges: List[Tuple[date, date]] = []
+    for day in sorted(set(dates)):
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def estimate_positions(positions: Dict[int, str], targets: Iterable[date]) -> Dict[date, float]:
+    """
+    根据已采集的 {采样位置序号: 日期} 拟合位置与日期的线性关系，估算目标日期的采样位置
+
+    图表的日期在横轴上等距分布，采样位置序号越大日期越早
+
+    Returns:
+        {日期: 采样位置序号（可为小数）}，已知点少于2个或无法拟合时返回空字典
+    """
+    points = [
+        (index, parsed.toordinal())
+        for index, text in positions.items()
+        for parsed in [parse_date(text)] if parsed
+    ]
+    if len({ordinal for _, ordinal in points}) < 2:
+        return {}
+
+    # 最小二乘拟合 index = a + b * ordinal
+    n = len(points)
+    mean_x = sum(ordinal for _, ordinal in points) / n
+    mean_y = sum(index for index, _ in points) / n
+    variance = sum((ordinal - mean_x) ** 2 for _, ordinal in points)
+    if not variance:
+        return {}
+
+    slope = sum((ordinal - mean_x) * (index - mean_y) for index, ordinal in points) / variance
+    intercept = mean_y - slope * mean_x
+
+    return {target: intercept + slope * target.toordinal() for target in targets}
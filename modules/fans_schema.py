@@ -0,0 +1,211 @@
+"""
+粉丝趋势API数据结构定义与解析
+以声明式结构描述已知的粉丝趋势响应格式，编译为提取函数，
+一次遍历完成按日期合并、去重和排序，并记录无法识别的响应结构
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PayloadSchema:
+    """一种粉丝趋势响应格式"""
+    name: str
+    # 每日数据列表（元素为字典）在响应中的路径，空元组表示响应本身就是列表
+    path: Tuple[str, ...]
+    # 各字段的候选名称（按顺序取第一个存在的）
+    date: Tuple[str, ...] = ('date',)
+    new_count: Tuple[str, ...] = ('new_count',)
+    lost_count: Tuple[str, ...] = ('lost_count',)
+
+
+# 已知的粉丝趋势响应格式（按顺序匹配）
+FANS_TREND_SCHEMAS: List[PayloadSchema] = [
+    PayloadSchema('data.list', ('data', 'list')),
+    PayloadSchema('list', ('list',)),
+    PayloadSchema('array', ()),
+]
+
+Extractor = Callable[[Any], Optional[List[Dict[str, Any]]]]
+
+
+def _normalize_date(value: Any) -> Optional[str]:
+    """日期统一为 YYYY-MM-DD（支持毫秒/秒时间戳）"""
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, (int, float)):
+        timestamp = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    text = str(value).strip()
+    return text[:10] if len(text) >= 10 and text[4] in '-/' else text
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def describe_shape(payload: Any, depth: int = 2) -> str:
+    """
+    生成响应结构的简短描述，用于报告无法识别的格式
+
+    例如: dict{code,data{new_count,total}}
+    """
+    if isinstance(payload, dict):
+        if depth <= 0:
+            return 'dict'
+        keys = sorted(payload)[:8]
+        inner = ','.join(
+            f"{k}{describe_shape(payload[k], depth - 1)[4:]}" if isinstance(payload[k], dict) else k
+            for k in keys
+        )
+        return f"dict{{{inner}}}"
+    if isinstance(payload, list):
+        return f"list[{len(payload)}]"
+    return type(payload).__name__
+
+
+class FansTrendParser:
+    """
+    粉丝趋势解析器
+
+    - project() 在捕获响应时调用，只保留规范化后的每日数据
+    - parse() 一次遍历合并多个响应：同一日期以后到的响应为准，按日期从新到旧排序
+    """
+
+    def __init__(self, schemas: Iterable[PayloadSchema] = FANS_TREND_SCHEMAS):
+        self.schemas = list(schemas)
+        self._extractors: List[Tuple[PayloadSchema, Extractor]] = [
+            (schema, self._compile(schema)) for schema in self.schemas
+        ]
+        self._reported_shapes: Set[str] = set()
+
+    @staticmethod
+    def _compile(schema: PayloadSchema) -> Extractor:
+        """将结构定义编译为提取函数"""
+        path = schema.path
+        fields = {
+            'date': schema.date,
+            'new_count': schema.new_count,
+            'lost_count': schema.lost_count,
+        }
+
+        def pick(item: Dict[str, Any], names: Tuple[str, ...]) -> Any:
+            for name in names:
+                if name in item:
+                    return item[name]
+            return None
+
+        def extract(payload: Any) -> Optional[List[Dict[str, Any]]]:
+            node = payload
+            for key in path:
+                if not isinstance(node, dict) or key not in node:
+                    return None
+                node = node[key]
+
+            # 每日数据必须是字典列表，其他列表（如ID列表、嵌套数组）视为无法识别
+            if not isinstance(node, list) or not all(isinstance(item, dict) for item in node):
+                return None
+
+            return [
+                {
+                    'date': _normalize_date(pick(item, fields['date'])),
+                    'new_count': _to_int(pick(item, fields['new_count'])),
+                    'lost_count': _to_int(pick(item, fields['lost_count'])),
+                }
+                for item in node
+            ]
+
+        return extract
+
+    def extract(self, payload: Any) -> Optional[Tuple[PayloadSchema, List[Dict[str, Any]]]]:
+        """
+        按已知格式提取每日数据
+
+        Returns:
+            (匹配的格式, 规范化后的每日数据)，无法识别时返回 None
+        """
+        for schema, extractor in self._extractors:
+            items = extractor(payload)
+            if items is not None:
+                return schema, items
+        return None
+
+    def project(self, payload: Any) -> Optional[Dict[str, Any]]:
+        """
+        捕获时的投影：只保留规范化后的每日数据
+
+        Returns:
+            {'list': [{'date', 'new_count', 'lost_count'}, ...]}，无法识别时返回 None
+        """
+        result = self.extract(payload)
+        if result is None:
+            self._report_unknown(payload)
+            return None
+
+        _, items = result
+        return {'list': items}
+
+    def parse(self, payloads: Iterable[Any], days: Optional[int]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        合并多个响应为每日数据（一次遍历）
+
+        Args:
+            payloads: API响应（原始或 project() 投影后的）
+            days: 保留最近多少天，None 表示全部保留
+
+        Returns:
+            (按日期从新到旧排序的数据, 解析统计)
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        stats = {'responses': 0, 'items': 0, 'duplicates': 0, 'missing_date': 0, 'unknown': 0}
+
+        for payload in payloads:
+            stats['responses'] += 1
+            result = self.extract(payload)
+            if result is None:
+                stats['unknown'] += 1
+                self._report_unknown(payload)
+                continue
+
+            for item in result[1]:
+                stats['items'] += 1
+                date = item['date']
+                if not date:
+                    stats['missing_date'] += 1
+                    continue
+                if date in merged:
+                    stats['duplicates'] += 1
+                merged[date] = item
+
+        rows = [
+            {
+                '日期': date,
+                '新增粉丝': item['new_count'],
+                '掉丝数': item['lost_count'],
+                '净增长': item['new_count'] - item['lost_count'],
+            }
+            for date, item in sorted(merged.items(), reverse=True)[:days if days else None]
+        ]
+        stats['days'] = len(rows)
+
+        return rows, stats
+
+    def _report_unknown(self, payload: Any):
+        """报告无法识别的响应结构（同一结构只警告一次）"""
+        shape = describe_shape(payload)
+        if shape in self._reported_shapes:
+            logger.debug(f"忽略无法识别的粉丝API数据结构: {shape}")
+            return
+
+        self._reported_shapes.add(shape)
+        logger.warning(f"无法识别的粉丝API数据结构: {shape}")
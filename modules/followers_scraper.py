@@ -4,37 +4,147 @@
 """
 import asyncio
 import json
-from typing import Optional, Callable, List, Dict, Any
-from datetime import datetime, timedelta
-from playwright.async_api import Page, Response
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional, Callable, List, Dict, Any, Tuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from playwright.async_api import Page
 
 from config import Config
+from core.api_capture import ApiCapture
 from core.browser import browser_manager
+from core.export_index import export_index, export_key, hash_rows
 from core.exporter import ExcelExporter
-from utils.logger import get_logger
+from modules.fans_gaps import estimate_positions, find_gaps, group_dates, parse_date
+from modules.fans_schema import FansTrendParser
+from modules.tooltip_checkpoint import TooltipCheckpoint
+from utils.date_window import DateLike, resolve_window, split_window, window_days
+from utils.logger import get_logger, log_event, start_run, end_run
+from utils.retry import RetryPolicy, RetryError, retry_async
+from utils.timing import span, start_trace, finish_trace
 
 logger = get_logger(__name__)
 
+# 粉丝数据API的URL关键字
+FANS_API_KEYWORDS = ['/fans/trend', '/fans/data', '/api/fans']
+
+# 图表的三种数据类型
+CHART_TYPES = [
+    {"name": "新增粉丝数", "field": "新增粉丝"},
+    {"name": "流失粉丝数", "field": "掉丝数"},
+    {"name": "总粉丝数", "field": "总粉丝数"}
+]
+
+# 粉丝趋势接口返回这些状态码时视为暂时性错误，其他4xx视为接口不支持按日期范围查询
+TRANSIENT_HTTP_STATUSES = (408, 429)
+
+
+class WindowApiUnsupported(Exception):
+    """粉丝趋势接口不支持按日期范围查询"""
+
+
+# 平台日期范围预设（天数: 选项文本）
+DATE_RANGE_PRESETS = {
+    7: "近7天",
+    30: "近30天"
+}
+
+# 页面自定义日期范围选择器的输入框（开始, 结束），按顺序尝试
+CUSTOM_RANGE_SELECTORS = [
+    ('input[placeholder*="开始"]', 'input[placeholder*="结束"]'),
+    ('.date-range-picker input >> nth=0', '.date-range-picker input >> nth=1'),
+    ('[class*="range-picker"] input >> nth=0', '[class*="range-picker"] input >> nth=1'),
+]
+
+# tooltip采集的采样点数量
+TOOLTIP_SAMPLE_POINTS = 60
+
+# 重新采样缺口日期时，在估算位置附近尝试的偏移（采样点间隔的倍数）
+GAP_SAMPLE_OFFSETS = (0.0, -0.35, 0.35)
+
+# 各阶段重试退避时间的倍数（相对 Config.RETRY_BASE_DELAY）
+PHASE_RETRY_SCALES = {
+    'navigate': 2.0,
+    'select': 0.5,
+    'harvest': 1.0,
+    'fetch': 1.0,
+}
+
+
+def _phase_policy(phase: str) -> RetryPolicy:
+    """阶段的重试策略"""
+    return RetryPolicy.from_config(scale=PHASE_RETRY_SCALES[phase])
+
+
+@dataclass
+class ScrapeCheckpoint:
+    """
+    一次粉丝数据抓取的阶段进度
+
+    抓取失败时保留，有效期内再次抓取相同日期范围时复用已完成的部分：
+    已捕获的API数据、已采集的tooltip数据点
+
+    失败后租借的页面会归还页面池（重置为空白页），因此导航和选择日期范围每次都重新执行
+    """
+    # 页面上选择的预设天数
+    days: int
+    # 请求的日期范围 (开始, 结束)
+    window: Optional[Tuple[date, date]] = None
+    created_at: float = field(default_factory=time.time)
+    api_data: List[Dict[str, Any]] = field(default_factory=list)
+    # tooltip采集进度（同时写入文件，程序重启后也可继续）
+    tooltip: Optional[TooltipCheckpoint] = None
+
+    def is_expired(self) -> bool:
+        return time.time() - self.created_at > Config.CHECKPOINT_TTL_MINUTES * 60
+
+    def describe(self) -> str:
+        """已完成阶段的描述"""
+        done = []
+        if self.api_data:
+            done.append(f'API数据 {len(self.api_data)} 个')
+        if self.tooltip:
+            done.append(f'tooltip {self.tooltip.describe()}')
+        return '、'.join(done) or '无'
+
 
 class FollowersScraper:
     """粉丝数据抓取器"""
 
+    # 按日期范围请求的接口是否可用（确认不可用后本次运行内不再请求）
+    window_api_supported = True
+
     def __init__(self):
         self.page: Optional[Page] = None
         self.exporter = ExcelExporter()
         self.api_data: List[Dict[str, Any]] = []
+        self._api_capture: Optional[ApiCapture] = None
+        self.fans_parser = FansTrendParser()
+        self._checkpoint: Optional[ScrapeCheckpoint] = None
+        # 最近一次抓取的数据是否与上次相同（未生成新文件）
+        self.last_unchanged = False
 
     async def scrape_followers_data(
         self,
         days: int = Config.DEFAULT_FOLLOWER_DAYS,
-        progress_callback: Optional[Callable[[str, int], None]] = None
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        start_date: DateLike = None,
+        end_date: DateLike = None
     ) -> str:
         """
         抓取粉丝数据
 
+        日期范围与平台预设（近7天/近30天）一致时直接使用页面数据；
+        其他范围在打开页面之前先按 start_date / end_date 直接请求粉丝趋势接口（超过平台单次上限时拆分为多段并发请求），
+        接口不可用时打开页面，用自定义日期选择器逐段选择（没有选择器时使用能覆盖该范围的页面预设并按日期范围筛选，
+        预设无法覆盖时报错，不返回比请求短的数据）
+
         Args:
-            days: 抓取最近多少天的数据
+            days: 抓取最近多少天的数据（截至昨天）
             progress_callback: 进度回调函数 callback(message, progress_percent)
+            start_date: 开始日期（YYYY-MM-DD），指定后忽略 days
+            end_date: 结束日期（YYYY-MM-DD），默认昨天
 
         Returns:
             str: 导出文件的路径
@@ -46,48 +156,33 @@ class FollowersScraper:
             if progress_callback:
                 progress_callback(msg, progress)
 
+        # 外部传入的页面由调用方管理，否则从页面池租借并在结束时归还
+        owns_page = self.page is None
+        run_token = start_run()
+        trace_token = start_trace('scrape_followers_data')
+        run_start = time.perf_counter()
+        self.last_unchanged = False
+
         try:
-            update_progress(f"开始抓取最近{days}天的粉丝数据...", 0)
+            start, end = resolve_window(days, start_date, end_date)
+            days = window_days(start, end)
+            preset_days = self._preset_for_window(start)
+            update_progress(f"开始抓取 {start} ~ {end} 共{days}天的粉丝数据...", 0)
 
             # 获取页面
-            if not self.page:
-                self.page = await browser_manager.new_page()
-
-            # 清空之前的API数据
-            self.api_data = []
-
-            # 设置API拦截
-            update_progress("正在设置数据拦截...", 10)
-            self._setup_api_interception()
+            if owns_page:
+                self.page = await browser_manager.acquire_page()
 
-            # 导航到粉丝数据页面
-            update_progress("正在导航到粉丝数据页面...", 20)
-            logger.info("开始导航到粉丝数据页面")
-            try:
-                await self.page.goto(
-                    Config.FOLLOWERS_DATA_URL,
-                    wait_until='domcontentloaded',
-                    timeout=60000  # 增加到60秒
-                )
-                logger.info("页面导航完成，等待数据加载")
-                await asyncio.sleep(3)  # 等待数据加载
+            checkpoint = self._get_checkpoint(preset_days, (start, end))
 
-                # 选择日期范围
-                logger.info(f"正在选择日期范围：近{days}天")
-                await self._select_date_range(days)
-                await asyncio.sleep(2)  # 等待数据更新
-                logger.info(f"数据加载等待完成，API数据数量: {len(self.api_data)}")
-            except Exception as e:
-                logger.error(f"导航失败: {e}")
-                raise Exception(f"导航到粉丝数据页面失败: {str(e)}")
+            # 非预设的日期范围先直接请求接口，成功时无需打开页面
+            data = None
+            if not self._is_preset_window(start, end):
+                update_progress(f"正在按日期范围请求数据 {start} ~ {end}...", 10)
+                data = await self._fetch_window(start, end)
 
-            # 尝试从API获取数据
-            if self.api_data:
-                update_progress("成功从API获取数据", 50)
-                data = self._process_api_data(days)
-            else:
-                update_progress("API未返回数据，尝试从页面提取...", 50)
-                data = await self._scrape_from_page(days, update_progress)
+            if data is None:
+                data = await self._collect_from_page(start, end, preset_days, checkpoint, update_progress)
 
             # 获取当前粉丝总数（使用最后一天的总粉丝数）
             update_progress("正在提取粉丝总数...", 70)
@@ -96,9 +191,10 @@ class FollowersScraper:
                 # 使用最后一天的总粉丝数
                 total_followers = data[-1].get('总粉丝数', 0)
 
-            if total_followers == 0:
+            if total_followers == 0 and self._on_followers_page():
                 # 如果从图表中获取失败，尝试从页面其他位置提取
-                total_followers = await self._extract_total_followers()
+                with span('total_followers', logger):
+                    total_followers = await self._extract_total_followers()
 
             # 添加总数信息
             for item in data:
@@ -107,50 +203,392 @@ class FollowersScraper:
             # 导出为CSV（UTF-8 BOM）
             update_progress("正在生成CSV文件...", 80)
 
-            filename = Config.get_output_filename('followers_data').replace('.xlsx', '.csv')
-            output_path = self._export_to_csv(data, filename)
+            with span('export', logger, data_type='followers', rows=len(data)) as phase:
+                filename = Config.get_output_filename('followers_data', 'csv')
+                key = export_key('followers', f"{start}_{end}")
+                sha256 = hash_rows(data)
+
+                # 数据与上次相同时不生成新文件
+                previous = export_index.reuse_unchanged(key, sha256, filename)
+                if previous:
+                    logger.info(f"粉丝数据与上次导出相同，不生成新文件: {previous}")
+                    phase['unchanged'] = self.last_unchanged = True
+                    output_path = str(previous)
+                else:
+                    with span('write', logger):
+                        output_path = self._export_to_csv(data, filename)
+                    export_index.put(key, sha256, Path(output_path))
 
-            # 验证导出结果
-            update_progress("正在验证导出数据...", 90)
-            validation_result = self._validate_export(output_path, days)
+                # 验证导出结果
+                update_progress("正在验证导出数据...", 90)
+                with span('validate', logger):
+                    validation_result = self._validate_export(output_path, days)
 
             if validation_result['success']:
-                update_progress(f"✓ 粉丝数据抓取成功！文件保存在: {output_path}", 100)
+                if self.last_unchanged:
+                    update_progress(f"✓ 粉丝数据未变化，沿用上次导出的文件: {output_path}", 100)
+                else:
+                    update_progress(f"✓ 粉丝数据抓取成功！文件保存在: {output_path}", 100)
                 logger.info(f"数据验证通过: {validation_result['message']}")
                 logger.info("SUCCESS")  # 输出SUCCESS标记
                 print("SUCCESS")  # 同时打印到控制台
             else:
                 logger.warning(f"数据验证警告: {validation_result['message']}")
 
+            log_event(
+                logger, '粉丝数据抓取完成',
+                elapsed_ms=(time.perf_counter() - run_start) * 1000,
+                rows=len(data),
+                data_type='followers',
+                valid=validation_result['success'],
+                unchanged=self.last_unchanged
+            )
+
+            # 抓取完成，不再需要检查点
+            if self._checkpoint.tooltip is not None:
+                self._checkpoint.tooltip.clear()
+            self._checkpoint = None
             return output_path
 
         except Exception as e:
             update_progress(f"抓取失败: {str(e)}", 0)
             logger.error(f"抓取粉丝数据失败: {e}", exc_info=True)
+            if self._checkpoint is not None:
+                logger.info(f"已保留抓取进度（{self._checkpoint.describe()}），再次抓取时将从此继续")
             raise
 
-    def _setup_api_interception(self):
-        """设置API拦截器"""
-        async def handle_response(response: Response):
-            """处理API响应"""
+        finally:
+            await self._stop_api_interception()
+            self.api_data = []
+            if owns_page:
+                await self.close()
+            finish_trace(trace_token)
+            end_run(run_token)
+
+    async def _collect_from_page(
+        self,
+        start: date,
+        end: date,
+        preset_days: int,
+        checkpoint: ScrapeCheckpoint,
+        update_progress: Callable[[str, int], None]
+    ) -> List[Dict[str, Any]]:
+        """
+        打开粉丝数据页面，选择日期范围后从捕获的API数据或图表中提取数据
+
+        非预设的日期范围先用页面的自定义日期选择器逐段选择（每段不超过平台单次上限），
+        页面没有自定义选择器或选择后没有数据时改用能覆盖该范围的页面预设
+
+        Returns:
+            按日期范围筛选后的数据
+
+        Raises:
+            Exception: 只能使用页面预设且预设无法覆盖请求的日期范围
+        """
+        # 清空之前的API数据
+        self.api_data = []
+
+        # 设置API拦截（仅在本次抓取期间有效）
+        update_progress("正在设置数据拦截...", 10)
+        self._setup_api_interception()
+
+        # 导航到粉丝数据页面
+        update_progress("正在导航到粉丝数据页面...", 20)
+        logger.info("开始导航到粉丝数据页面")
+        try:
+            with span('navigate', logger, data_type='followers'):
+                await retry_async(self._navigate, _phase_policy('navigate'), '导航到粉丝数据页面')
+        except RetryError as e:
+            logger.error(f"导航失败: {e}")
+            raise Exception(f"导航到粉丝数据页面失败: {e.last_error}")
+
+        # 选择日期范围（失败时继续使用当前日期范围）
+        custom_window = not self._is_preset_window(start, end)
+        with span('select', logger, data_type='followers', days=preset_days) as phase:
+            custom_selected = custom_window and await self._select_custom_window(start, end)
+            phase['custom'] = custom_selected
+
+            if not custom_selected:
+                self._check_preset_coverage(start, end)
+                logger.info(f"正在选择日期范围：近{preset_days}天")
+                try:
+                    await retry_async(
+                        lambda: self._select_date_range(preset_days),
+                        _phase_policy('select'), '选择日期范围'
+                    )
+                    with span('wait_api', logger):
+                        await asyncio.sleep(2)  # 等待数据更新
+                except RetryError as e:
+                    logger.warning(f"{e}，继续使用当前日期范围")
+
+            # 停止拦截，后续的页面操作不再捕获API数据；本次未捕获到时使用检查点中的数据
+            api_data = await self._stop_api_interception()
+            if api_data:
+                checkpoint.api_data = api_data
+            self.api_data = checkpoint.api_data
+            phase['api_responses'] = len(self.api_data)
+            logger.info(f"数据加载等待完成，API数据数量: {len(self.api_data)}")
+
+        # 尝试从API获取数据
+        with span('extract', logger, data_type='followers') as phase:
+            if self.api_data:
+                update_progress("成功从API获取数据", 50)
+                phase['source'] = 'api'
+                with span('parse', logger):
+                    data = self._process_api_data(None if custom_selected else preset_days)
+                if Config.FOLLOWERS_GAP_FILL:
+                    data = await self._fill_api_gaps(data, preset_days)
+            else:
+                update_progress("API未返回数据，尝试从页面提取...", 50)
+                phase['source'] = 'page'
+                data = await self._scrape_from_page(preset_days, update_progress)
+
+            if custom_window:
+                data = self._filter_window(data, start, end)
+            phase['rows'] = len(data)
+
+        return data
+
+    async def _select_custom_window(self, start: date, end: date) -> bool:
+        """
+        用页面的自定义日期选择器逐段选择日期范围，每段的接口响应由API拦截捕获后合并
+
+        Returns:
+            是否成功选择了所有分段并捕获到数据（页面没有自定义选择器时返回 False）
+        """
+        if await self._find_range_inputs() is None:
+            logger.info("页面没有自定义日期选择器，改用页面预设")
+            return False
+
+        chunks = split_window(start, end, Config.FOLLOWERS_MAX_RANGE_DAYS)
+        for chunk_start, chunk_end in chunks:
+            logger.info(f"正在选择自定义日期范围：{chunk_start} ~ {chunk_end}")
             try:
-                # 检查是否是粉丝数据的API
-                url = response.url
-                if any(keyword in url for keyword in ['/fans/trend', '/fans/data', '/api/fans']):
-                    logger.debug(f"拦截到粉丝API: {url}")
+                await retry_async(
+                    lambda s=chunk_start, e=chunk_end: self._fill_range_inputs(s, e),
+                    _phase_policy('select'), f"选择日期范围 {chunk_start} ~ {chunk_end}"
+                )
+            except RetryError as e:
+                logger.warning(f"{e}，改用页面预设")
+                return False
+            with span('wait_api', logger):
+                await asyncio.sleep(2)  # 等待数据更新
 
-                    try:
-                        data = await response.json()
-                        self.api_data.append(data)
-                        logger.info(f"成功获取API数据: {len(data)} 条记录")
-                    except:
-                        logger.warning("API响应不是JSON格式")
+        if not self._api_capture:
+            logger.warning("选择自定义日期范围后没有捕获到粉丝数据，改用页面预设")
+            return False
+
+        logger.info(f"已通过自定义日期选择器选择 {start} ~ {end}（{len(chunks)} 段）")
+        return True
+
+    async def _find_range_inputs(self) -> Optional[Tuple[Any, Any]]:
+        """查找自定义日期范围的开始、结束输入框"""
+        for start_selector, end_selector in CUSTOM_RANGE_SELECTORS:
+            start_input = await self.page.query_selector(start_selector)
+            end_input = await self.page.query_selector(end_selector)
+            if start_input and end_input:
+                return start_input, end_input
+        return None
+
+    async def _fill_range_inputs(self, start: date, end: date):
+        """
+        在自定义日期选择器中填入开始和结束日期，并确认输入框中的值
+
+        Raises:
+            Exception: 未找到输入框或填入后的值不一致（由调用方重试）
+        """
+        inputs = await self._find_range_inputs()
+        if inputs is None:
+            raise Exception("未找到日期范围输入框")
+
+        for date_input, value in zip(inputs, (start.isoformat(), end.isoformat())):
+            await date_input.click()
+            await date_input.fill(value)
+            await date_input.press('Enter')
+            await asyncio.sleep(0.2)
+
+        values = [await date_input.input_value() for date_input in inputs]
+        if values != [start.isoformat(), end.isoformat()]:
+            raise Exception(f"日期范围未生效: {values}")
+
+    @staticmethod
+    def _check_preset_coverage(start: date, end: date):
+        """
+        只能使用页面预设时，检查最大的预设能否覆盖请求的日期范围
+
+        Raises:
+            Exception: 开始日期早于最大预设的范围（否则只能得到比请求短的数据）
+        """
+        earliest = date.today() - timedelta(days=max(DATE_RANGE_PRESETS))
+        if start < earliest:
+            raise Exception(
+                f"无法获取 {start} ~ {end} 的完整粉丝数据：粉丝趋势接口和自定义日期选择器不可用，"
+                f"页面预设最多覆盖近{max(DATE_RANGE_PRESETS)}天（{earliest} 起）"
+            )
+
+    def _get_checkpoint(self, days: int, window: Optional[Tuple[date, date]] = None) -> ScrapeCheckpoint:
+        """获取可继续的检查点（日期范围不同或已过期时重新开始）"""
+        checkpoint = self._checkpoint
+        if (checkpoint is not None and checkpoint.days == days and checkpoint.window == window
+                and not checkpoint.is_expired()):
+            logger.info(f"从上次失败的抓取继续，已完成: {checkpoint.describe()}")
+            return checkpoint
+
+        self._checkpoint = ScrapeCheckpoint(days=days, window=window)
+        return self._checkpoint
+
+    @staticmethod
+    def _preset_for_window(start: date) -> int:
+        """能覆盖日期范围的最小页面预设天数（超出所有预设时使用最大的预设，由 _check_preset_coverage 拒绝）"""
+        span_days = (date.today() - start).days
+        for preset in sorted(DATE_RANGE_PRESETS):
+            if span_days <= preset:
+                return preset
+        return max(DATE_RANGE_PRESETS)
+
+    @staticmethod
+    def _is_preset_window(start: date, end: date) -> bool:
+        """日期范围是否正好是页面预设（截至昨天的近N天）"""
+        return (
+            end == date.today() - timedelta(days=1)
+            and window_days(start, end) in DATE_RANGE_PRESETS
+        )
+
+    @staticmethod
+    def _filter_window(data: List[Dict[str, Any]], start: date, end: date) -> List[Dict[str, Any]]:
+        """只保留日期范围内的数据（无法解析日期的行保留）"""
+        filtered = []
+        for row in data:
+            parsed = parse_date(row.get('日期', ''))
+            if parsed is None or start <= parsed <= end:
+                filtered.append(row)
+
+        if len(filtered) < len(data):
+            logger.info(f"按日期范围 {start} ~ {end} 筛选: {len(data)} -> {len(filtered)} 天")
+        return filtered
+
+    async def _fetch_window(self, start: date, end: date) -> Optional[List[Dict[str, Any]]]:
+        """
+        按日期范围直接请求粉丝趋势接口
+
+        超过平台单次查询上限（Config.FOLLOWERS_MAX_RANGE_DAYS）的范围拆分为多段，
+        并发请求（共用浏览器上下文的登录状态）后按日期合并
 
-            except Exception as e:
-                logger.debug(f"处理API响应时出错: {e}")
+        接口返回4xx、非JSON内容或无法识别的数据时视为不支持按日期范围查询，本次运行内不再请求
 
-        # 注册响应监听器
-        self.page.on('response', lambda response: asyncio.create_task(handle_response(response)))
+        Returns:
+            按日期从新到旧排序的数据，接口不可用或返回无法识别的数据时返回 None
+        """
+        if not FollowersScraper.window_api_supported:
+            logger.debug("粉丝趋势接口不支持按日期范围查询，跳过请求")
+            return None
+
+        chunks = split_window(start, end, Config.FOLLOWERS_MAX_RANGE_DAYS)
+        semaphore = asyncio.Semaphore(max(Config.FOLLOWERS_CHUNK_CONCURRENCY, 1))
+        request = self.page.context.request
+
+        async def fetch_chunk(chunk_start: date, chunk_end: date) -> Any:
+            async with semaphore:
+                response = await request.get(
+                    Config.FOLLOWERS_TREND_API_URL,
+                    params={
+                        'start_date': chunk_start.isoformat(),
+                        'end_date': chunk_end.isoformat(),
+                        'days': window_days(chunk_start, chunk_end),
+                    },
+                    timeout=Config.PAGE_TIMEOUT
+                )
+                if 400 <= response.status < 500 and response.status not in TRANSIENT_HTTP_STATUSES:
+                    raise WindowApiUnsupported(f"HTTP {response.status}")
+                if not response.ok:
+                    raise Exception(f"HTTP {response.status}")
+                try:
+                    return await response.json()
+                except Exception as e:
+                    # 返回 HTML 等非JSON内容说明该地址不是粉丝趋势接口，重试没有意义
+                    raise WindowApiUnsupported(f"响应不是JSON: {e}")
+
+        policy = replace(_phase_policy('fetch'), give_up_on=(WindowApiUnsupported,))
+
+        with span('fetch_window', logger, chunks=len(chunks)) as phase:
+            try:
+                payloads = await asyncio.gather(*(
+                    retry_async(
+                        lambda s=chunk_start, e=chunk_end: fetch_chunk(s, e),
+                        policy, f"请求粉丝数据 {chunk_start} ~ {chunk_end}"
+                    )
+                    for chunk_start, chunk_end in chunks
+                ))
+            except WindowApiUnsupported as e:
+                FollowersScraper.window_api_supported = False
+                logger.warning(f"粉丝趋势接口不支持按日期范围查询（{e}），本次运行内改为使用页面数据")
+                return None
+            except RetryError as e:
+                logger.warning(f"{e}，改为使用页面数据")
+                return None
+
+            rows, stats = self.fans_parser.parse(payloads, None)
+            if stats['unknown']:
+                FollowersScraper.window_api_supported = False
+                logger.warning(
+                    f"粉丝趋势接口有 {stats['unknown']} 段返回的数据无法识别，本次运行内改为使用页面数据"
+                )
+                return None
+
+            data = self._filter_window(rows, start, end)
+            phase['rows'] = len(data)
+
+        logger.info(f"按日期范围获取粉丝数据: {len(chunks)} 段请求，共 {len(data)} 天")
+        return data
+
+    def _on_followers_page(self) -> bool:
+        """页面是否仍在粉丝数据页"""
+        try:
+            return self.page.url.startswith(Config.FOLLOWERS_DATA_URL)
+        except Exception:
+            return False
+
+    async def _navigate(self):
+        """导航到粉丝数据页面并等待数据加载"""
+        await self.page.goto(
+            Config.FOLLOWERS_DATA_URL,
+            wait_until='domcontentloaded',
+            timeout=60000  # 增加到60秒
+        )
+        logger.info("页面导航完成，等待数据加载")
+        with span('wait_api', logger):
+            await asyncio.sleep(3)  # 等待数据加载
+
+    def _setup_api_interception(self):
+        """设置API拦截器（环形缓冲区，捕获时只保留需要的字段）"""
+        if self._api_capture is not None:
+            logger.debug("上一次的API拦截尚未停止，先移除")
+            asyncio.ensure_future(self._api_capture.stop())
+
+        self._api_capture = ApiCapture(
+            self.page,
+            FANS_API_KEYWORDS,
+            projector=self.fans_parser.project
+        )
+        self._api_capture.start()
+
+    async def _stop_api_interception(self) -> List[Dict[str, Any]]:
+        """
+        停止API拦截并移除监听器
+
+        Returns:
+            捕获到的API数据
+        """
+        if self._api_capture is None:
+            return self.api_data
+
+        capture, self._api_capture = self._api_capture, None
+        api_data = await capture.stop()
+        logger.info(
+            f"成功获取API数据: {len(api_data)} 个响应，"
+            f"共 {sum(len(item['list']) for item in api_data)} 条记录"
+        )
+        return api_data
 
     async def _select_date_range(self, days: int):
         """
@@ -158,94 +596,106 @@ class FollowersScraper:
 
         Args:
             days: 天数 (7, 30)
+
+        Raises:
+            Exception: 未找到或无法点击日期选项（由调用方决定是否重试）
         """
-        try:
-            # 映射天数到页面文本
-            day_mapping = {
-                7: "近7天",
-                30: "近30天"
-            }
+        target_text = DATE_RANGE_PRESETS.get(days, DATE_RANGE_PRESETS[max(DATE_RANGE_PRESETS)])
 
-            target_text = day_mapping.get(days, "近30天")
+        # 查找并点击对应的日期选项
+        selector = f'label.select-item-default:has-text("{target_text}")'
 
-            # 查找并点击对应的日期选项
-            selector = f'label.select-item-default:has-text("{target_text}")'
+        logger.info(f"正在查找日期选择器: {selector}")
 
-            logger.info(f"正在查找日期选择器: {selector}")
+        label = await self.page.wait_for_selector(selector, timeout=5000)
+        if not label:
+            raise Exception(f"未找到日期选择器: {selector}")
 
-            try:
-                label = await self.page.wait_for_selector(selector, timeout=5000)
-                if label:
-                    # 检查是否已经是选中状态
-                    class_name = await label.get_attribute('class') or ''
-                    if 'item-active' not in class_name:
-                        logger.info(f"点击日期选项: {target_text}")
-                        await label.click()
-                        logger.info(f"成功选择日期范围: {target_text}")
-                    else:
-                        logger.info(f"日期范围已经是 {target_text}，无需切换")
-                else:
-                    logger.warning(f"未找到日期选择器: {selector}")
-            except Exception as e:
-                logger.warning(f"选择日期范围失败: {e}，继续使用当前日期范围")
+        # 检查是否已经是选中状态
+        class_name = await label.get_attribute('class') or ''
+        if 'item-active' not in class_name:
+            logger.info(f"点击日期选项: {target_text}")
+            await label.click()
+            logger.info(f"成功选择日期范围: {target_text}")
+        else:
+            logger.info(f"日期范围已经是 {target_text}，无需切换")
 
-        except Exception as e:
-            logger.warning(f"选择日期范围时出错: {e}")
+    async def _fill_api_gaps(self, data: List[Dict[str, Any]], days: int) -> List[Dict[str, Any]]:
+        """
+        API数据缺少日期时只按缺失的日期区间请求粉丝趋势接口，与已有数据合并
+
+        Args:
+            data: 已处理的每日数据
+            days: 页面预设天数
+
+        Returns:
+            合并后的每日数据（按日期从新到旧）
+        """
+        start, end = self._gap_window(days)
+        gaps = find_gaps(data, start, end, ['新增粉丝', '掉丝数'])
+        if not gaps:
+            return data
+
+        missing = sorted({day for days_missing in gaps.values() for day in days_missing})
+        ranges = group_dates(missing)
+        logger.info(f"API数据缺少 {len(missing)} 天（{len(ranges)} 个区间），按日期范围重新请求")
+
+        with span('gap_fill', logger, source='api', gaps=len(missing)) as phase:
+            by_date = {row.get('日期'): row for row in data}
+            for range_start, range_end in ranges:
+                rows = await self._fetch_window(range_start, range_end)
+                if rows is None:
+                    logger.warning("粉丝趋势接口不可用，无法补齐缺失的日期")
+                    break
+                # 同一日期以新请求的数据为准
+                by_date.update({row.get('日期'): row for row in rows})
+
+            data = sorted(by_date.values(), key=lambda row: str(row.get('日期', '')), reverse=True)
+
+            remaining = find_gaps(data, start, end, ['新增粉丝', '掉丝数'])
+            still_missing = {day for days_missing in remaining.values() for day in days_missing}
+            phase['filled'] = len(missing) - len(still_missing)
+            if still_missing:
+                logger.warning(f"API数据仍缺少 {len(still_missing)} 天")
+
+        return data
+
+    def _gap_window(self, days: int) -> Tuple[date, date]:
+        """
+        检测缺口的日期范围：请求的日期范围中页面预设（截至昨天的近 days 天）能覆盖的部分
+
+        Args:
+            days: 页面预设天数
+        """
+        checkpoint = self._checkpoint
+        start, end = checkpoint.window if checkpoint and checkpoint.window else resolve_window(days)
+        return max(start, date.today() - timedelta(days=days)), end
 
     def _process_api_data(self, days: int) -> List[Dict[str, Any]]:
         """
         处理从API获取的数据
 
+        多个响应按日期合并去重（同一日期以后到的响应为准），按日期从新到旧排序，
+        无法识别的响应结构会记录到日志
+
         Args:
             days: 天数
 
         Returns:
             处理后的数据列表
         """
-        processed_data = []
-
         try:
-            # 这里需要根据实际API返回的数据结构来解析
-            # 假设API返回的数据格式如下：
-            # {
-            #   "data": {
-            #     "list": [
-            #       {"date": "2025-01-08", "new_count": 10, "lost_count": 2},
-            #       ...
-            #     ]
-            #   }
-            # }
-
-            for api_response in self.api_data:
-                if isinstance(api_response, dict):
-                    # 尝试不同的数据路径
-                    list_data = None
-
-                    # 路径1: data.list
-                    if 'data' in api_response and 'list' in api_response['data']:
-                        list_data = api_response['data']['list']
-                    # 路径2: 直接是list
-                    elif 'list' in api_response:
-                        list_data = api_response['list']
-                    # 路径3: 直接是数组
-                    elif isinstance(api_response, list):
-                        list_data = api_response
-
-                    if list_data and isinstance(list_data, list):
-                        for item in list_data[:days]:
-                            processed_data.append({
-                                '日期': item.get('date', ''),
-                                '新增粉丝': item.get('new_count', 0),
-                                '掉丝数': item.get('lost_count', 0),
-                                '净增长': item.get('new_count', 0) - item.get('lost_count', 0)
-                            })
-
-            logger.info(f"从API处理了 {len(processed_data)} 条记录")
+            data, stats = self.fans_parser.parse(self.api_data, days)
+            logger.info(
+                f"从API处理了 {stats['days']} 天数据"
+                f"（响应 {stats['responses']} 个，记录 {stats['items']} 条，"
+                f"重复 {stats['duplicates']} 条，无法识别 {stats['unknown']} 个）"
+            )
+            return data
 
         except Exception as e:
             logger.error(f"处理API数据失败: {e}", exc_info=True)
-
-        return processed_data[:days] if processed_data else []
+            return []
 
     async def _scrape_from_page(
         self,
@@ -330,9 +780,11 @@ class FollowersScraper:
 
         策略：
         1. 依次切换到"新增粉丝数"、"流失粉丝数"、"总粉丝数"
-        2. 每种数据类型遍历所有采样点
+        2. 每种数据类型遍历所有采样点（失败时按重试策略重新采集该类型）
         3. 按日期合并所有数据
 
+        每采到一个点就写入检查点文件，再次抓取时跳过已完成的数据类型和已采集过的采样位置
+
         Args:
             chart_element: 图表元素
             days: 天数
@@ -341,83 +793,46 @@ class FollowersScraper:
         Returns:
             提取的数据列表
         """
-        import re
-
-        # 使用字典存储数据，以日期为key
-        data_dict = {}
+        checkpoint = self._checkpoint or ScrapeCheckpoint(days=days)
+        if checkpoint.tooltip is None:
+            checkpoint.tooltip = TooltipCheckpoint.load(days)
+        tooltip_checkpoint = checkpoint.tooltip
+        data: List[Dict[str, Any]] = []
 
         try:
             # 获取图表的边界框
             box = await chart_element.bounding_box()
             if not box:
                 return []
+            tooltip_checkpoint.bind_chart(box['width'])
 
-            # 定义三种数据类型
-            chart_types = [
-                {"name": "新增粉丝数", "field": "新增粉丝"},
-                {"name": "流失粉丝数", "field": "掉丝数"},
-                {"name": "总粉丝数", "field": "总粉丝数"}
-            ]
+            for type_idx, chart_type in enumerate(CHART_TYPES):
+                if tooltip_checkpoint.is_complete(chart_type['field']):
+                    logger.info(f"从检查点继续：{chart_type['name']}已采集，跳过")
+                    continue
 
-            for type_idx, chart_type in enumerate(chart_types):
                 logger.info(f"正在提取{chart_type['name']}...")
                 progress_callback(f"正在提取{chart_type['name']}...", 50 + type_idx * 10)
 
-                # 切换到对应的图表选项
-                try:
-                    label_selector = f'label.select-item-default:has-text("{chart_type["name"]}")'
-                    label = await self.page.wait_for_selector(label_selector, timeout=3000)
-
-                    if label:
-                        class_name = await label.get_attribute('class') or ''
-                        if 'item-active' not in class_name:
-                            await label.click()
-                            await asyncio.sleep(1.0)
-                            logger.info(f"已切换到: {chart_type['name']}")
-                except Exception as e:
-                    logger.warning(f"切换图表选项失败 ({chart_type['name']}): {e}")
-                    continue
-
-                # 使用60个采样点
-                sample_points = 60
-
-                for i in range(sample_points):
-                    x = box['x'] + box['width'] - (i * (box['width'] / sample_points))
-                    y = box['y'] + box['height'] / 2
-
-                    await self.page.mouse.move(x, y)
-                    await asyncio.sleep(0.3)
-
+                with span('tooltip', logger, series=chart_type['field']) as harvest:
                     try:
-                        tooltip = await self.page.wait_for_selector('[class*="tooltip"]', timeout=500, state='visible')
-                        if tooltip:
-                            tooltip_text = await tooltip.inner_text()
-
-                            lines = tooltip_text.strip().split('\n')
-                            if len(lines) >= 3:
-                                date_str = lines[0].strip()
-                                value_str = lines[2].strip()
-
-                                numbers = re.findall(r'(\d+)', value_str)
-                                value = int(numbers[0]) if numbers else 0
-
-                                if date_str not in data_dict:
-                                    data_dict[date_str] = {
-                                        '日期': date_str,
-                                        '新增粉丝': 0,
-                                        '掉丝数': 0,
-                                        '总粉丝数': 0
-                                    }
-                                    logger.debug(f"新增日期: {date_str}")
-
-                                data_dict[date_str][chart_type['field']] = value
-                                logger.debug(f"{chart_type['name']} - {date_str}: {value}")
-                    except:
+                        values = await retry_async(
+                            lambda: self._harvest_series(box, chart_type, tooltip_checkpoint),
+                            _phase_policy('harvest'), f"采集{chart_type['name']}"
+                        )
+                    except RetryError as e:
+                        logger.warning(f"{e}，跳过该数据类型")
                         continue
 
-            # 将字典转换为列表，并按日期排序（最新的在前）
-            data = list(data_dict.values())
-            data.sort(key=lambda x: x['日期'], reverse=True)
+                    tooltip_checkpoint.mark_complete(chart_type['field'])
+                    harvest['rows'] = len(values)
+
+            # 写入前只对缺失的日期重新采样
+            if Config.FOLLOWERS_GAP_FILL:
+                await self._fill_tooltip_gaps(box, days, tooltip_checkpoint)
+
+            # 按日期合并各数据类型（包括未完成类型已采集到的点），最新的在前
+            data = self._merge_series(tooltip_checkpoint.series)
 
             # 根据天数参数限制数据量
             if len(data) > days:
@@ -436,6 +851,197 @@ class FollowersScraper:
 
         return data
 
+    @staticmethod
+    def _merge_series(series: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
+        """
+        按日期合并各数据类型
+
+        Args:
+            series: {字段: {日期: 数值}}
+
+        Returns:
+            每日数据（按日期从新到旧排序）
+        """
+        data_dict: Dict[str, Dict[str, Any]] = {}
+        for field_name, values in series.items():
+            for date_str, value in values.items():
+                row = data_dict.setdefault(date_str, {
+                    '日期': date_str,
+                    '新增粉丝': 0,
+                    '掉丝数': 0,
+                    '总粉丝数': 0
+                })
+                row[field_name] = value
+
+        data = list(data_dict.values())
+        data.sort(key=lambda x: x['日期'], reverse=True)
+        return data
+
+    @staticmethod
+    def _series_rows(series: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
+        """按日期合并各数据类型，只包含实际采集到的字段（用于区分缺失和真实的0）"""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for field_name, values in series.items():
+            for date_str, value in values.items():
+                rows.setdefault(date_str, {'日期': date_str})[field_name] = value
+        return list(rows.values())
+
+    async def _harvest_series(
+        self,
+        box: Dict[str, float],
+        chart_type: Dict[str, str],
+        checkpoint: TooltipCheckpoint
+    ) -> Dict[str, int]:
+        """
+        切换到一种数据类型并逐点悬停采集tooltip
+
+        跳过检查点中已采集过的采样位置，每采到一个点立即写入检查点
+
+        Args:
+            box: 图表的边界框
+            chart_type: 数据类型 {"name": 图表选项文本, "field": 字段名}
+            checkpoint: tooltip采集检查点
+
+        Returns:
+            {日期: 数值}
+
+        Raises:
+            Exception: 切换图表选项失败或没有采集到任何数据（由调用方重试）
+        """
+        await self._switch_chart_type(chart_type)
+
+        pending = checkpoint.pending_positions(chart_type['field'], TOOLTIP_SAMPLE_POINTS)
+        if len(pending) < TOOLTIP_SAMPLE_POINTS:
+            logger.info(f"{chart_type['name']}: 跳过已采集的 {TOOLTIP_SAMPLE_POINTS - len(pending)} 个采样点")
+
+        for i in pending:
+            point = await self._read_tooltip_at(box, i)
+            if point:
+                date_str, value = point
+                checkpoint.record(chart_type['field'], i, date_str, value)
+                logger.debug(f"{chart_type['name']} - {date_str}: {value}")
+
+        values = checkpoint.values(chart_type['field'])
+        if not values:
+            raise Exception(f"未采集到{chart_type['name']}的tooltip数据")
+
+        return values
+
+    async def _fill_tooltip_gaps(self, box: Dict[str, float], days: int, checkpoint: TooltipCheckpoint) -> int:
+        """
+        找出请求的日期范围内各数据类型没有采集到的日期，只在这些日期的估算位置重新悬停
+
+        Args:
+            box: 图表的边界框
+            days: 页面预设天数
+            checkpoint: tooltip采集检查点
+
+        Returns:
+            补齐的点数
+        """
+        start, end = self._gap_window(days)
+        fields = [chart_type['field'] for chart_type in CHART_TYPES]
+        gaps = find_gaps(self._series_rows(checkpoint.series), start, end, fields)
+        if not gaps:
+            return 0
+
+        # 各数据类型共用同一横轴，合并所有已知的采样位置用于估算
+        positions = {
+            index: date_str
+            for series_positions in checkpoint.positions.values()
+            for index, date_str in series_positions.items()
+        }
+        filled = 0
+
+        with span('gap_fill', logger, source='tooltip',
+                  gaps=sum(len(missing) for missing in gaps.values())) as phase:
+            for chart_type in CHART_TYPES:
+                missing = gaps.get(chart_type['field'])
+                if not missing:
+                    continue
+
+                estimates = estimate_positions(positions, missing)
+                if not estimates:
+                    logger.warning(f"{chart_type['name']}: 已知采样点不足，无法定位 {len(missing)} 个缺口")
+                    continue
+
+                logger.info(f"{chart_type['name']}: 重新采样 {len(missing)} 个缺失的日期")
+                try:
+                    await self._switch_chart_type(chart_type)
+                except Exception as e:
+                    logger.warning(f"切换图表选项失败 ({chart_type['name']}): {e}")
+                    continue
+
+                for day, index in estimates.items():
+                    for offset in GAP_SAMPLE_OFFSETS:
+                        position = index + offset
+                        if not 0 <= position <= TOOLTIP_SAMPLE_POINTS:
+                            continue
+
+                        point = await self._read_tooltip_at(box, position)
+                        if point and parse_date(point[0]) == day:
+                            date_str, value = point
+                            checkpoint.record(chart_type['field'], round(position), date_str, value)
+                            filled += 1
+                            break
+
+            phase['filled'] = filled
+
+        remaining = find_gaps(self._series_rows(checkpoint.series), start, end, fields)
+        logger.info(
+            f"缺口重新采样完成: 补齐 {filled} 个点，"
+            f"剩余 {sum(len(missing) for missing in remaining.values())} 个缺失"
+        )
+        return filled
+
+    async def _switch_chart_type(self, chart_type: Dict[str, str]):
+        """切换到图表的数据类型选项"""
+        label_selector = f'label.select-item-default:has-text("{chart_type["name"]}")'
+        label = await self.page.wait_for_selector(label_selector, timeout=3000)
+
+        if label:
+            class_name = await label.get_attribute('class') or ''
+            if 'item-active' not in class_name:
+                await label.click()
+                await asyncio.sleep(1.0)
+                logger.info(f"已切换到: {chart_type['name']}")
+
+    async def _read_tooltip_at(self, box: Dict[str, float], position: float) -> Optional[tuple]:
+        """
+        悬停到采样位置并读取tooltip
+
+        Args:
+            box: 图表的边界框
+            position: 采样位置序号（0为最右侧，可为小数）
+
+        Returns:
+            (日期, 数值)，未出现tooltip或格式不正确时返回 None
+        """
+        import re
+
+        x = box['x'] + box['width'] - (position * (box['width'] / TOOLTIP_SAMPLE_POINTS))
+        y = box['y'] + box['height'] / 2
+
+        await self.page.mouse.move(x, y)
+        await asyncio.sleep(0.3)
+
+        try:
+            tooltip = await self.page.wait_for_selector('[class*="tooltip"]', timeout=500, state='visible')
+            if tooltip:
+                tooltip_text = await tooltip.inner_text()
+
+                lines = tooltip_text.strip().split('\n')
+                if len(lines) >= 3:
+                    date_str = lines[0].strip()
+                    value_str = lines[2].strip()
+
+                    numbers = re.findall(r'(\d+)', value_str)
+                    return date_str, int(numbers[0]) if numbers else 0
+        except:
+            pass
+
+        return None
+
     def _parse_tooltip_text(self, text: str, chart_type: str) -> Optional[Dict[str, Any]]:
         """
         解析tooltip文本
@@ -517,10 +1123,9 @@ class FollowersScraper:
             导出文件的完整路径
         """
         import csv
-        from pathlib import Path
 
         # 确保输出目录存在
-        output_dir = Path('data/output')
+        output_dir = Config.OUTPUT_DIR
         output_dir.mkdir(parents=True, exist_ok=True)
 
         output_path = output_dir / filename
@@ -679,7 +1284,7 @@ class FollowersScraper:
             return 0
 
     async def close(self):
-        """关闭页面"""
+        """归还页面到页面池"""
         if self.page:
-            await self.page.close()
+            await browser_manager.release_page(self.page)
             self.page = None
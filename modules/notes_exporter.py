@@ -3,18 +3,43 @@
 从小红书创作者平台导出笔记数据
 """
 import asyncio
+import time
 import pandas as pd
+from datetime import date
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Tuple
 from playwright.async_api import Page, Download
 
 from config import Config
 from core.browser import browser_manager
+from core.downloads import DownloadResult, download_manager
+from core.export_index import export_index, export_key, hash_rows
 from core.exporter import ExcelExporter
-from utils.logger import get_logger
+from modules.notes_store import DEFAULT_WINDOW, NOTE_ID_COLUMNS, notes_store
+from utils.date_window import resolve_window, split_window
+from utils.logger import get_logger, log_event, start_run, end_run
+from utils.retry import RetryPolicy, RetryError, retry_async
+from utils.timing import span, start_trace, finish_trace
 
 logger = get_logger(__name__)
 
+# 导出按钮的候选选择器
+EXPORT_BUTTON_SELECTORS = [
+    'button:has-text("导出")',
+    'button:has-text("下载")',
+    '.export-btn',
+    '.download-btn',
+    '[class*="export"]',
+    '[class*="download"]'
+]
+
+# 日期范围选择器的（开始, 结束）输入框候选选择器
+DATE_INPUT_SELECTORS = [
+    ('input[placeholder*="开始"]', 'input[placeholder*="结束"]'),
+    ('.date-range-picker input >> nth=0', '.date-range-picker input >> nth=1'),
+    ('[class*="range-picker"] input >> nth=0', '[class*="range-picker"] input >> nth=1'),
+]
+
 
 class NotesExporter:
     """笔记数据导出器"""
@@ -22,6 +47,9 @@ class NotesExporter:
     def __init__(self):
         self.page: Optional[Page] = None
         self.exporter = ExcelExporter()
+        self.downloads = download_manager
+        # 最近一次导出的数据是否与上次相同（未生成新文件）
+        self.last_unchanged = False
 
     async def export_notes_data(
         self,
@@ -32,6 +60,12 @@ class NotesExporter:
         """
         导出笔记数据
 
+        指定日期范围时在页面的日期范围选择器中选择日期；超过平台单次导出上限
+        （Config.NOTES_MAX_RANGE_DAYS）的范围拆分为多段，在多个页面中并行下载后按笔记ID合并去重。
+        单段下载的内容与上次导出相同时直接复用上次的文件；启用 Config.NOTES_PASSTHROUGH 时
+        不解析、不重写，下载文件直接保存到输出目录；解析后的数据与上次相同时同样不生成新文件。
+        启用 Config.NOTES_STORE_ENABLED 时笔记数据同时写入笔记数据仓库（见 modules.notes_store）
+
         Args:
             start_date: 开始日期 (格式: YYYY-MM-DD)
             end_date: 结束日期 (格式: YYYY-MM-DD)
@@ -47,156 +81,412 @@ class NotesExporter:
             if progress_callback:
                 progress_callback(msg, progress)
 
+        # 外部传入的页面由调用方管理，否则从页面池租借并在结束时归还
+        owns_page = self.page is None
+        run_token = start_run()
+        trace_token = start_trace('export_notes_data')
+        run_start = time.perf_counter()
+
+        self.last_unchanged = False
+
         try:
             update_progress("开始导出笔记数据...", 0)
 
-            # 获取页面
-            if not self.page:
-                self.page = await browser_manager.new_page()
-
-            # 导航到笔记数据页面
-            update_progress("正在导航到笔记数据页面...", 10)
-            logger.info("开始导航到笔记数据页面")
-            try:
-                await self.page.goto(
-                    Config.NOTES_DATA_URL,
-                    wait_until='domcontentloaded',
-                    timeout=60000  # 增加到60秒
-                )
-                logger.info("页面导航完成，等待动态内容加载")
-                await asyncio.sleep(3)  # 等待页面动态内容加载
-                logger.info("动态内容加载完成")
-            except Exception as e:
-                logger.error(f"导航失败: {e}")
-                raise Exception(f"导航到笔记数据页面失败: {str(e)}")
-
-            # 如果指定了日期范围，选择日期
+            # 指定日期范围时，超过平台单次导出上限的范围拆分为多段
+            chunks: List[Optional[Tuple[date, date]]] = [None]
             if start_date or end_date:
-                update_progress("正在选择日期范围...", 20)
-                await self._select_date_range(start_date, end_date)
-                await asyncio.sleep(1)
+                start, end = resolve_window(Config.NOTES_MAX_RANGE_DAYS, start_date, end_date)
+                chunks = split_window(start, end, Config.NOTES_MAX_RANGE_DAYS)
+                logger.info(f"笔记数据日期范围: {start} ~ {end}，共 {len(chunks)} 段")
+
+            if len(chunks) == 1:
+                # 获取页面
+                if owns_page:
+                    self.page = await browser_manager.acquire_page()
+                output_path, rows = await self._export_single(chunks[0], update_progress)
+            else:
+                with span('extract', logger, data_type='notes', chunks=len(chunks)) as phase:
+                    update_progress(f"正在分 {len(chunks)} 段并行下载...", 20)
+                    data = await self._download_chunks(chunks, lease_pages=owns_page)
+                    phase['rows'] = len(data)
 
-            # 查找并点击导出按钮
-            update_progress("正在查找导出按钮...", 30)
-
-            # 尝试多种可能的导出按钮选择器
-            export_selectors = [
-                'button:has-text("导出")',
-                'button:has-text("下载")',
-                '.export-btn',
-                '.download-btn',
-                '[class*="export"]',
-                '[class*="download"]'
-            ]
-
-            export_btn = None
-            for selector in export_selectors:
-                try:
-                    export_btn = await self.page.wait_for_selector(selector, timeout=2000)
-                    if export_btn:
-                        logger.info(f"找到导出按钮: {selector}")
-                        break
-                except:
-                    continue
+                self._store(data, f"{chunks[0][0]}_{chunks[-1][1]}")
 
-            if not export_btn:
-                raise Exception("未找到导出按钮，请检查页面结构")
+                output_path = self._write_output(data, update_progress, chunks[0][0], chunks[-1][1])
+                rows = len(data)
 
-            # 设置下载处理
-            update_progress("准备下载数据...", 40)
+            if self.last_unchanged:
+                update_progress(f"笔记数据未变化，沿用上次导出的文件: {output_path}", 100)
+            else:
+                update_progress(f"笔记数据导出完成！文件保存在: {output_path}", 100)
 
-            download_path = Config.TEMP_DIR / 'notes_data_temp.xlsx'
+            log_event(
+                logger, '笔记数据导出完成',
+                elapsed_ms=(time.perf_counter() - run_start) * 1000,
+                rows=rows,
+                data_type='notes',
+                unchanged=self.last_unchanged
+            )
 
-            async with self.page.expect_download() as download_info:
-                await export_btn.click()
-                download = await download_info.value
+            return output_path
+
+        except Exception as e:
+            update_progress(f"导出失败: {str(e)}", 0)
+            logger.error(f"导出笔记数据失败: {e}", exc_info=True)
+            raise
+
+        finally:
+            if owns_page:
+                await self.close()
+            finish_trace(trace_token)
+            end_run(run_token)
+
+    async def _export_single(
+        self,
+        date_range: Optional[Tuple[date, date]],
+        update_progress: Callable[[str, int], None]
+    ) -> Tuple[str, Optional[int]]:
+        """
+        下载单个日期范围并生成输出文件
+
+        Returns:
+            (输出文件路径, 记录数)，复用上次文件或直接保存下载文件时记录数为 None
+        """
+        key = export_key('notes_download', self._window_label(date_range))
+        window = self._window_label(date_range) or DEFAULT_WINDOW
+
+        with span('extract', logger, data_type='notes', chunks=1):
+            download = await self._trigger_download(self.page, date_range, update_progress)
+            result = await self.downloads.fetch(download, 'notes')
+
+        try:
+            previous = self.downloads.find_unchanged(key, result)
+            if previous:
+                logger.info(f"下载内容与上次导出相同，复用文件: {previous}")
+                self.last_unchanged = True
+                # 数据未变化也要记录当天的快照（每日增长为0）
+                await self._store_download(result, window, only_if_missing=True)
+                return str(previous), None
+
+            if Config.NOTES_PASSTHROUGH:
+                update_progress("正在保存下载文件...", 80)
+                await self._store_download(result, window)
+                with span('export', logger, data_type='notes', passthrough=True):
+                    filename = Config.get_output_filename('notes_data', result.suffix.lstrip('.'))
+                    output_path = await self.downloads.deliver(result, Config.OUTPUT_DIR / filename)
+                rows = None
+            else:
+                update_progress("正在处理数据...", 70)
+                with span('parse', logger) as phase:
+                    data = await self._process_downloaded_file(result.path, result.suffix)
+                    phase['rows'] = len(data)
+                self._store(data, window)
+                output_path = self._write_output(data, update_progress, *(date_range or (None, None)))
+                rows = len(data)
+
+            self.downloads.remember(key, result, Path(output_path))
+            return str(output_path), rows
+
+        finally:
+            self.downloads.discard(result)
+
+    @staticmethod
+    def _store(data: List[Dict[str, Any]], window: str):
+        """写入笔记数据仓库（失败不影响导出）"""
+        if not Config.NOTES_STORE_ENABLED or not data:
+            return
+
+        try:
+            with span('store', logger, data_type='notes', rows=len(data)):
+                notes_store.upsert(data, window=window)
+        except Exception as e:
+            logger.warning(f"写入笔记数据仓库失败（不影响导出）: {e}")
 
-            update_progress("正在下载文件...", 60)
+    async def _store_download(self, result: DownloadResult, window: str, only_if_missing: bool = False):
+        """
+        解析下载文件并写入笔记数据仓库（用于不经解析生成输出文件的情况）
 
-            # 保存下载的文件
-            await download.save_as(download_path)
-            logger.info(f"文件已下载到: {download_path}")
+        Args:
+            result: 下载结果
+            window: 导出范围
+            only_if_missing: 仅在今天还没有该范围的快照时写入
+        """
+        if not Config.NOTES_STORE_ENABLED:
+            return
 
-            update_progress("正在处理数据...", 70)
+        try:
+            if only_if_missing and notes_store.has_snapshot(window=window):
+                return
+            data = await self._process_downloaded_file(result.path, result.suffix)
+        except Exception as e:
+            logger.warning(f"写入笔记数据仓库失败（不影响导出）: {e}")
+            return
 
-            # 读取并处理数据
-            data = await self._process_downloaded_file(download_path)
+        self._store(data, window)
 
-            # 导出为Excel
-            update_progress("正在生成Excel文件...", 80)
+    def _write_output(
+        self,
+        data: List[Dict[str, Any]],
+        update_progress: Callable[[str, int], None],
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> str:
+        """
+        将笔记数据写入输出目录的Excel文件
 
+        数据与该账号、日期范围上次导出的相同时不写入，返回上次的文件（见 ExportIndex.reuse_unchanged）
+        """
+        update_progress("正在生成Excel文件...", 80)
+
+        with span('export', logger, data_type='notes', rows=len(data)) as phase:
             filename = Config.get_output_filename('notes_data')
-            output_path = self.exporter.export(data, filename, sheet_name='笔记数据')
+            key = export_key('notes', self._window_label((start, end) if start else None))
+            sha256 = hash_rows(data)
 
-            # 清理临时文件
-            if download_path.exists():
-                download_path.unlink()
+            previous = export_index.reuse_unchanged(key, sha256, filename)
+            if previous:
+                logger.info(f"笔记数据与上次导出相同，不生成新文件: {previous}")
+                phase['unchanged'] = True
+                self.last_unchanged = True
+                return str(previous)
 
-            update_progress(f"笔记数据导出完成！文件保存在: {output_path}", 100)
+            with span('write', logger):
+                output_path = self.exporter.export(data, filename, sheet_name='笔记数据')
 
+            export_index.put(key, sha256, Path(output_path))
             return output_path
 
-        except Exception as e:
-            update_progress(f"导出失败: {str(e)}", 0)
-            logger.error(f"导出笔记数据失败: {e}", exc_info=True)
-            raise
+    @staticmethod
+    def _window_label(date_range: Optional[Tuple[date, date]]) -> Optional[str]:
+        """导出索引中的日期范围"""
+        return f"{date_range[0]}_{date_range[1]}" if date_range else None
+
+    async def _download_chunks(self, chunks: List[Tuple[date, date]], lease_pages: bool = True) -> List[Dict[str, Any]]:
+        """
+        并行下载多个日期分段并按笔记ID合并去重
+
+        每个分段都从页面池租借页面（本导出器不占用页面），同时下载的分段数不超过
+        Config.NOTES_CHUNK_CONCURRENCY 和页面池当前的空闲位置数，页面池已满时依次等待，不会互相等待死锁。
+        调用方传入页面时（可能占用了页面池的最后一个位置）在该页面上依次下载
+
+        Args:
+            chunks: [(分段开始, 分段结束), ...]（从早到晚）
+            lease_pages: 是否从页面池租借页面
+
+        Returns:
+            合并后的笔记数据
+        """
+        if not lease_pages:
+            results = []
+            for chunk in chunks:
+                with span('chunk', logger, start_date=str(chunk[0]), end_date=str(chunk[1])):
+                    results.append(await self._download_notes(self.page, chunk))
+            return self._merge_notes(results)
+
+        await browser_manager.ensure_context()
+        concurrency = max(1, min(Config.NOTES_CHUNK_CONCURRENCY, browser_manager.page_pool.available))
+        logger.info(f"同时下载 {concurrency} 段（页面池空闲 {browser_manager.page_pool.available} 个位置）")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def download(chunk: Tuple[date, date]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                with span('chunk', logger, start_date=str(chunk[0]), end_date=str(chunk[1])):
+                    async with browser_manager.lease_page() as page:
+                        return await self._download_notes(page, chunk)
+
+        results = await asyncio.gather(*(download(chunk) for chunk in chunks))
+        return self._merge_notes(results)
+
+    @staticmethod
+    def _merge_notes(chunk_results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        合并多个分段的笔记数据，按笔记ID去重（同一笔记以较晚分段的数据为准）
+
+        没有笔记ID列时按 笔记标题 + 发布时间 去重
+        """
+        merged: Dict[Any, Dict[str, Any]] = {}
+        total = 0
+
+        for rows in chunk_results:
+            for row in rows:
+                total += 1
+                id_column = next((c for c in NOTE_ID_COLUMNS if row.get(c) not in (None, '')), None)
+                key = row[id_column] if id_column else (row.get('笔记标题'), row.get('发布时间'))
+                # 保留首次出现的位置，数据更新为较晚的分段
+                merged[key] = row
+
+        logger.info(f"合并分段数据: {total} 条 -> 去重后 {len(merged)} 条")
+        return list(merged.values())
+
+    async def _download_notes(self, page: Page, date_range: Tuple[date, date]) -> List[Dict[str, Any]]:
+        """
+        下载一个日期分段并直接从浏览器的下载文件读取数据
+
+        Args:
+            page: 使用的页面
+            date_range: (开始, 结束)
+
+        Returns:
+            笔记数据
+        """
+        download = await self._trigger_download(page, date_range)
+        result = await self.downloads.fetch(download, f"notes_{date_range[0]:%Y%m%d}_{date_range[1]:%Y%m%d}")
+        try:
+            with span('parse', logger):
+                return await self._process_downloaded_file(result.path, result.suffix)
+        finally:
+            self.downloads.discard(result)
 
-    async def _select_date_range(self, start_date: Optional[str], end_date: Optional[str]):
+    async def _trigger_download(
+        self,
+        page: Page,
+        date_range: Optional[Tuple[date, date]],
+        update_progress: Optional[Callable[[str, int], None]] = None
+    ) -> Download:
         """
-        选择日期范围
+        在页面上导航、选择日期范围并点击导出
 
         Args:
-            start_date: 开始日期
-            end_date: 结束日期
+            page: 使用的页面
+            date_range: (开始, 结束)，None 表示使用平台默认范围
+            update_progress: 进度回调（并行下载分段时为 None）
+
+        Returns:
+            Playwright下载对象
         """
+        def progress(msg: str, value: int):
+            if update_progress:
+                update_progress(msg, value)
+            else:
+                logger.debug(msg)
+
+        label = f"{date_range[0]} ~ {date_range[1]}" if date_range else '默认范围'
+
+        # 导航到笔记数据页面
+        progress("正在导航到笔记数据页面...", 10)
+        logger.info(f"开始导航到笔记数据页面（{label}）")
         try:
-            # 查找日期选择器
-            date_picker_selectors = [
-                '.date-picker',
-                '.date-range-picker',
-                '[class*="date"]',
-                '[placeholder*="日期"]'
-            ]
-
-            date_picker = None
-            for selector in date_picker_selectors:
+            with span('navigate', logger, data_type='notes'):
+                await retry_async(
+                    lambda: self._navigate(page),
+                    RetryPolicy.from_config(scale=2.0), '导航到笔记数据页面'
+                )
+            logger.info("动态内容加载完成")
+        except RetryError as e:
+            logger.error(f"导航失败: {e}")
+            raise Exception(f"导航到笔记数据页面失败: {e.last_error}")
+
+        # 如果指定了日期范围，选择日期
+        if date_range:
+            progress("正在选择日期范围...", 20)
+            with span('select', logger, data_type='notes',
+                      start_date=str(date_range[0]), end_date=str(date_range[1])):
                 try:
-                    date_picker = self.page.wait_for_selector(selector, timeout=2000)
-                    if date_picker:
-                        break
-                except:
-                    continue
+                    await retry_async(
+                        lambda: self._select_date_range(page, *date_range),
+                        RetryPolicy.from_config(scale=0.5), f"选择日期范围 {label}"
+                    )
+                except RetryError as e:
+                    # 日期未选中时导出的是平台默认范围的数据，不能当作指定范围的结果
+                    raise Exception(f"选择日期范围失败: {e.last_error}")
+                await asyncio.sleep(1)
+
+        # 查找并点击导出按钮
+        progress("正在查找导出按钮...", 30)
 
-            if date_picker:
-                # 点击日期选择器
-                await date_picker.click()
-                await asyncio.sleep(0.5)
+        export_btn = None
+        for selector in EXPORT_BUTTON_SELECTORS:
+            try:
+                export_btn = await page.wait_for_selector(selector, timeout=2000)
+                if export_btn:
+                    logger.info(f"找到导出按钮: {selector}")
+                    break
+            except:
+                continue
 
-                # 这里需要根据实际的日期选择器结构来实现
-                # 暂时跳过具体实现，因为页面结构可能不同
-                logger.warning("日期选择功能尚未完全实现，请手动选择日期")
+        if not export_btn:
+            raise Exception("未找到导出按钮，请检查页面结构")
 
-        except Exception as e:
-            logger.warning(f"选择日期范围失败: {e}")
+        # 设置下载处理
+        progress("准备下载数据...", 40)
 
-    async def _process_downloaded_file(self, file_path: Path) -> List[Dict[str, Any]]:
+        with span('download', logger):
+            async with page.expect_download() as download_info:
+                await export_btn.click()
+            download = await download_info.value
+
+            progress("正在下载文件...", 60)
+            # 等待下载完成（失败时抛出）
+            await download.path()
+
+        return download
+
+    async def _navigate(self, page: Page):
+        """导航到笔记数据页面并等待动态内容加载"""
+        await page.goto(
+            Config.NOTES_DATA_URL,
+            wait_until='domcontentloaded',
+            timeout=60000  # 增加到60秒
+        )
+        logger.info("页面导航完成，等待动态内容加载")
+        with span('wait_render', logger):
+            await asyncio.sleep(3)  # 等待页面动态内容加载
+
+    async def _select_date_range(self, page: Page, start: date, end: date):
+        """
+        在日期范围选择器中填入开始和结束日期，并确认输入框中的值
+
+        Args:
+            page: 使用的页面
+            start: 开始日期
+            end: 结束日期
+
+        Raises:
+            Exception: 未找到日期输入框或填入后的值不一致（由调用方重试）
+        """
+        for start_selector, end_selector in DATE_INPUT_SELECTORS:
+            start_input = await page.query_selector(start_selector)
+            end_input = await page.query_selector(end_selector)
+            if start_input and end_input:
+                break
+        else:
+            raise Exception("未找到日期范围输入框")
+
+        for date_input, value in ((start_input, start.isoformat()), (end_input, end.isoformat())):
+            await date_input.click()
+            await date_input.fill(value)
+            await date_input.press('Enter')
+            await asyncio.sleep(0.2)
+
+        actual = (await start_input.input_value(), await end_input.input_value())
+        if actual != (start.isoformat(), end.isoformat()):
+            raise Exception(f"日期范围未生效: 期望 {start} ~ {end}，实际 {actual[0]} ~ {actual[1]}")
+
+        # 关闭可能仍展开的日期面板
+        await page.keyboard.press('Escape')
+        logger.info(f"已选择日期范围: {start} ~ {end}")
+
+    async def _process_downloaded_file(self, file_path: Path, suffix: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         处理下载的文件
 
         Args:
             file_path: 下载的文件路径
+            suffix: 文件格式（浏览器的下载文件没有扩展名，按建议文件名传入），默认取文件扩展名
 
         Returns:
             处理后的数据列表
         """
+        suffix = (suffix or file_path.suffix).lower()
+
         try:
-            # 根据文件扩展名读取文件
-            if file_path.suffix == '.csv':
+            # 根据文件格式读取文件
+            if suffix == '.csv':
                 df = pd.read_csv(file_path, encoding=Config.CSV_ENCODING)
-            elif file_path.suffix in ['.xlsx', '.xls']:
+            elif suffix in ['.xlsx', '.xls']:
                 df = pd.read_excel(file_path)
             else:
-                raise ValueError(f"不支持的文件格式: {file_path.suffix}")
+                raise ValueError(f"不支持的文件格式: {suffix}")
 
             logger.info(f"读取到 {len(df)} 条记录")
             logger.debug(f"列名: {df.columns.tolist()}")
@@ -220,9 +510,11 @@ class NotesExporter:
         Returns:
             笔记数据概览
         """
+        owns_page = self.page is None
+
         try:
-            if not self.page:
-                self.page = await browser_manager.new_page()
+            if owns_page:
+                self.page = await browser_manager.acquire_page()
 
             await self.page.goto(Config.NOTES_DATA_URL)
             await self.page.wait_for_load_state('networkidle')
@@ -245,8 +537,12 @@ class NotesExporter:
             logger.error(f"获取笔记概览失败: {e}")
             raise
 
+        finally:
+            if owns_page:
+                await self.close()
+
     async def close(self):
-        """关闭页面"""
+        """归还页面到页面池"""
         if self.page:
-            await self.page.close()
+            await browser_manager.release_page(self.page)
             self.page = None
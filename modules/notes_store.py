@@ -0,0 +1,348 @@
+"""
+笔记数据仓库模块
+将每次导出的笔记数据按 (账号, 导出范围, 笔记ID, 快照日期) 写入本地SQLite数据库，
+便于跨天比较笔记表现（观看、点赞等的每日增长），无需逐个打开历史导出文件
+
+导出范围不同（默认范围 / 自定义日期范围）的数据指标含义不同，分别保存、分别比较
+
+用法:
+    from modules.notes_store import notes_store
+    notes_store.daily_growth('views', start_date='2025-01-01')
+"""
+import hashlib
+import json
+import math
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import Config
+from utils.date_window import DateLike, to_date
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 笔记ID列的候选名称
+NOTE_ID_COLUMNS = ['笔记ID', '笔记id', '笔记Id', 'note_id', 'noteId']
+
+# 平台导出列 -> 数据库指标列
+METRIC_COLUMNS = {
+    '曝光量': 'impressions',
+    '观看量': 'views',
+    '点赞数': 'likes',
+    '评论数': 'comments',
+    '收藏数': 'collects',
+    '分享数': 'shares',
+    '涨粉数': 'new_followers',
+}
+METRICS = list(METRIC_COLUMNS.values())
+
+# 平台默认范围（不指定日期）的导出
+DEFAULT_WINDOW = 'all'
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS note_snapshots (
+    account TEXT NOT NULL,
+    export_window TEXT NOT NULL,
+    note_id TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    title TEXT,
+    publish_time TEXT,
+    {', '.join(f'{metric} INTEGER' for metric in METRICS)},
+    data TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (account, export_window, note_id, snapshot_date)
+);
+CREATE INDEX IF NOT EXISTS idx_note_snapshots_date ON note_snapshots (account, export_window, snapshot_date);
+"""
+
+
+def note_id_of(row: Dict[str, Any]) -> str:
+    """笔记ID；导出文件没有笔记ID列时由 笔记标题 + 发布时间 生成"""
+    for column in NOTE_ID_COLUMNS:
+        value = row.get(column)
+        if value not in (None, ''):
+            return str(value)
+
+    key = f"{row.get('笔记标题', '')}|{row.get('发布时间', '')}"
+    return 'title_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def to_number(value: Any) -> Optional[int]:
+    """将导出文件中的数值（如 1,234、1.2万、NaN、空串）转换为整数"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else int(round(value))
+
+    text = str(value).strip().replace(',', '')
+    if not text or text in ('-', '--'):
+        return None
+
+    scale = 1
+    if text.endswith('万'):
+        text, scale = text[:-1], 10000
+    elif text.endswith('亿'):
+        text, scale = text[:-1], 100000000
+
+    try:
+        return int(round(float(text) * scale))
+    except ValueError:
+        return None
+
+
+def _to_text(value: Any) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class NotesStore:
+    """笔记数据仓库（SQLite）"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: 数据库文件路径，默认 Config.NOTES_DB_FILE
+        """
+        self.path = Path(path) if path else Config.NOTES_DB_FILE
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接（首次使用时建表），正常退出时提交"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                self._migrate(conn)
+                conn.executescript(SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """早期版本的表没有导出范围列，无法区分各行数据的范围，改名保留后重新建表"""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(note_snapshots)")]
+        if columns and 'export_window' not in columns:
+            logger.warning("笔记数据仓库为旧版结构（不区分导出范围），旧数据已保留到 note_snapshots_legacy 表")
+            conn.execute("DROP INDEX IF EXISTS idx_note_snapshots_date")
+            conn.execute("ALTER TABLE note_snapshots RENAME TO note_snapshots_legacy")
+
+    def upsert(
+        self,
+        rows: List[Dict[str, Any]],
+        snapshot_date: DateLike = None,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> int:
+        """
+        写入一次导出的笔记数据（同一账号、导出范围、笔记、快照日期已存在时更新为本次数据）
+
+        Args:
+            rows: 笔记数据（平台导出的列名）
+            snapshot_date: 快照日期，默认今天
+            account: 账号，默认 Config.ACCOUNT_NAME
+            window: 导出范围，默认范围为 DEFAULT_WINDOW，自定义日期范围为 "开始_结束"
+
+        Returns:
+            写入的笔记数
+        """
+        snapshot = (to_date(snapshot_date) or date.today()).isoformat()
+        account = account or Config.ACCOUNT_NAME
+        now = datetime.now().isoformat(timespec='seconds')
+
+        records = {}
+        for row in rows:
+            note_id = note_id_of(row)
+            records[note_id] = (
+                account, window, note_id, snapshot,
+                _to_text(row.get('笔记标题')),
+                _to_text(row.get('发布时间')),
+                *(to_number(row.get(column)) for column in METRIC_COLUMNS),
+                json.dumps({k: _to_text(v) for k, v in row.items()}, ensure_ascii=False),
+                now,
+            )
+
+        columns = ['account', 'export_window', 'note_id', 'snapshot_date', 'title', 'publish_time',
+                   *METRICS, 'data', 'updated_at']
+        updates = ', '.join(f"{c} = excluded.{c}" for c in columns[4:])
+        sql = (
+            f"INSERT INTO note_snapshots ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (account, export_window, note_id, snapshot_date) DO UPDATE SET {updates}"
+        )
+
+        with self._connect() as conn:
+            conn.executemany(sql, records.values())
+
+        logger.info(f"笔记数据已写入数据仓库: {len(records)} 条（快照 {snapshot}，账号 {account}，范围 {window}）")
+        return len(records)
+
+    def has_snapshot(
+        self,
+        snapshot_date: DateLike = None,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> bool:
+        """是否已有该日期、该导出范围的快照"""
+        snapshot = (to_date(snapshot_date) or date.today()).isoformat()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM note_snapshots WHERE account = ? AND export_window = ? AND snapshot_date = ? LIMIT 1",
+                (account or Config.ACCOUNT_NAME, window, snapshot)
+            ).fetchone()
+        return row is not None
+
+    def snapshot_dates(self, account: Optional[str] = None, window: str = DEFAULT_WINDOW) -> List[str]:
+        """已有的快照日期（从早到晚）"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT snapshot_date FROM note_snapshots "
+                "WHERE account = ? AND export_window = ? ORDER BY snapshot_date",
+                (account or Config.ACCOUNT_NAME, window)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def snapshot(
+        self,
+        snapshot_date: DateLike = None,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """某一天的全部笔记指标，默认最近一次快照"""
+        account = account or Config.ACCOUNT_NAME
+        with self._connect() as conn:
+            if snapshot_date is None:
+                latest = conn.execute(
+                    "SELECT MAX(snapshot_date) FROM note_snapshots WHERE account = ? AND export_window = ?",
+                    (account, window)
+                ).fetchone()[0]
+            else:
+                latest = to_date(snapshot_date).isoformat()
+
+            rows = conn.execute(
+                f"SELECT note_id, snapshot_date, title, publish_time, {', '.join(METRICS)} FROM note_snapshots "
+                "WHERE account = ? AND export_window = ? AND snapshot_date = ? ORDER BY note_id",
+                (account, window, latest)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def history(
+        self,
+        note_id: str,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """单篇笔记各快照日期的指标（从早到晚）"""
+        sql, params = self._range_filter(
+            f"SELECT note_id, snapshot_date, title, {', '.join(METRICS)} FROM note_snapshots "
+            "WHERE account = ? AND export_window = ? AND note_id = ?",
+            [account or Config.ACCOUNT_NAME, window, note_id], start_date, end_date
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY snapshot_date", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def daily_growth(
+        self,
+        metric: str = 'views',
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        note_id: Optional[str] = None,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """
+        指标在同一导出范围相邻两次快照之间的增长
+
+        范围内第一天与范围之前最近的快照比较；快照间隔多天时 per_day 为平均每日增长
+
+        Args:
+            metric: 指标（impressions / views / likes / comments / collects / shares / new_followers）
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+            note_id: 只查询该笔记
+            account: 账号，默认 Config.ACCOUNT_NAME
+            window: 导出范围，默认为平台默认范围的导出
+
+        Returns:
+            [{note_id, title, snapshot_date, previous_date, value, delta, per_day}, ...]
+        """
+        if metric not in METRICS:
+            raise ValueError(f"不支持的指标: {metric}，可选: {', '.join(METRICS)}")
+
+        inner = (
+            f"SELECT note_id, title, snapshot_date, {metric} AS value, "
+            f"LAG(snapshot_date) OVER w AS previous_date, "
+            f"{metric} - LAG({metric}) OVER w AS delta "
+            "FROM note_snapshots WHERE account = ? AND export_window = ?"
+        )
+        params: List[Any] = [account or Config.ACCOUNT_NAME, window]
+        if note_id:
+            inner += " AND note_id = ?"
+            params.append(note_id)
+        end = to_date(end_date)
+        if end:
+            inner += " AND snapshot_date <= ?"
+            params.append(end.isoformat())
+        inner += " WINDOW w AS (PARTITION BY export_window, note_id ORDER BY snapshot_date)"
+
+        sql = (
+            "SELECT *, delta * 1.0 / (julianday(snapshot_date) - julianday(previous_date)) AS per_day "
+            f"FROM ({inner}) WHERE previous_date IS NOT NULL"
+        )
+        start = to_date(start_date)
+        if start:
+            sql += " AND snapshot_date >= ?"
+            params.append(start.isoformat())
+
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY snapshot_date, note_id", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def top_growth(
+        self,
+        metric: str = 'views',
+        snapshot_date: DateLike = None,
+        limit: int = 10,
+        account: Optional[str] = None,
+        window: str = DEFAULT_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """某一天（默认最近一次快照）增长最多的笔记"""
+        if snapshot_date is None:
+            dates = self.snapshot_dates(account, window)
+            if not dates:
+                return []
+            snapshot_date = dates[-1]
+
+        rows = self.daily_growth(metric, snapshot_date, snapshot_date, account=account, window=window)
+        rows.sort(key=lambda row: row['per_day'] if row['per_day'] is not None else float('-inf'), reverse=True)
+        return rows[:limit]
+
+    @staticmethod
+    def _range_filter(sql: str, params: List[Any], start_date: DateLike, end_date: DateLike):
+        start, end = to_date(start_date), to_date(end_date)
+        if start:
+            sql += " AND snapshot_date >= ?"
+            params.append(start.isoformat())
+        if end:
+            sql += " AND snapshot_date <= ?"
+            params.append(end.isoformat())
+        return sql, params
+
+
+# 全局笔记数据仓库
+notes_store = NotesStore()
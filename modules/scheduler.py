@@ -0,0 +1,498 @@
+"""
+定时导出模块
+进程内的定时任务调度：按cron表达式为每个账号/数据类型生成导出任务，
+在已启动的浏览器上依次执行，随机错开开始时间，数据仍新鲜时跳过（按数据类型记录最近成功的时间），
+调度状态持久化到文件，程序重启后补跑错过的任务
+
+任务配置文件（Config.SCHEDULER_JOBS_FILE，JSON）示例：
+    [
+        {"name": "粉丝日报", "cron": "0 2 * * *", "data_type": "followers", "followers_days": 7},
+        {"name": "笔记周报", "cron": "30 3 * * 1", "data_type": "notes", "fresh_hours": 72}
+    ]
+配置文件不存在时使用 SCHEDULER_CRON 生成一个导出全部数据的任务
+
+命令行运行（无界面常驻，代替外部cron）：
+    python -m modules.scheduler
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import Config
+from utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+DATA_TYPES = ('notes', 'followers', 'all')
+
+# 视为导出成功的结果（见 UnifiedExporter.last_outcomes）
+SUCCESS_OUTCOMES = ('success', 'unchanged')
+
+
+class CronExpression:
+    """
+    cron表达式（分 时 日 月 周）
+
+    支持 *、数字、范围 a-b、列表 a,b、步长 */n 和 a-b/n；周日为 0 或 7
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron表达式需要5个字段: {expression}")
+
+        self.expression = expression
+        parsed = [
+            self._parse_field(text, low, high)
+            for text, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+
+        # 日和周都有限制时按任一满足处理（与标准cron一致：以 * 开头的字段，包括 */n，不算限制）
+        self._days_restricted = not fields[2].startswith('*')
+        self._weekdays_restricted = not fields[4].startswith('*')
+
+    @staticmethod
+    def _parse_field(text: str, low: int, high: int) -> Set[int]:
+        """解析单个字段"""
+        values: Set[int] = set()
+
+        for part in text.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"cron步长必须大于0: {text}")
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(v) for v in part.split('-', 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"cron字段超出范围 {low}-{high}: {text}")
+
+            values.update(range(start, end + 1, step))
+
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, dt: datetime) -> bool:
+        """时间是否匹配"""
+        return (
+            dt.minute in self.minutes
+            and dt.hour in self.hours
+            and dt.month in self.months
+            and self._day_matches(dt)
+        )
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        计算 dt 之后的下一个触发时间
+
+        按月、日、时、分逐级跳过不匹配的时间段
+        """
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            if t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+                continue
+            return t
+
+        raise ValueError(f"cron表达式没有可触发的时间: {self.expression}")
+
+
+@dataclass
+class ScheduledJob:
+    """定时导出任务"""
+    name: str
+    cron: CronExpression
+    data_type: str = 'all'
+    account: str = field(default_factory=lambda: Config.ACCOUNT_NAME)
+    followers_days: int = field(default_factory=lambda: Config.DEFAULT_FOLLOWER_DAYS)
+    jitter_seconds: int = field(default_factory=lambda: Config.SCHEDULER_JITTER_SECONDS)
+    fresh_hours: float = field(default_factory=lambda: Config.SCHEDULER_FRESH_HOURS)
+
+    @property
+    def key(self) -> str:
+        """任务在状态文件中的键"""
+        return f"{self.account}:{self.name}"
+
+    @property
+    def data_types(self) -> List[str]:
+        """任务导出的数据类型"""
+        return ['notes', 'followers'] if self.data_type == 'all' else [self.data_type]
+
+    def to_export_config(self) -> Dict[str, Any]:
+        """转换为 UnifiedExporter.export_all 的导出配置"""
+        return {
+            'export_notes': self.data_type in ('notes', 'all'),
+            'notes_date_range': 'all',
+            'notes_start_date': None,
+            'notes_end_date': None,
+            'export_followers': self.data_type in ('followers', 'all'),
+            'followers_days': self.followers_days,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScheduledJob':
+        data = dict(data)
+        data_type = data.get('data_type', 'all')
+        if data_type not in DATA_TYPES:
+            raise ValueError(f"不支持的数据类型: {data_type}")
+
+        return cls(
+            name=data.get('name') or f"{data_type}@{data['cron']}",
+            cron=CronExpression(data['cron']),
+            data_type=data_type,
+            **{k: data[k] for k in ('account', 'followers_days', 'jitter_seconds', 'fresh_hours') if k in data}
+        )
+
+
+def load_jobs(path: Optional[Path] = None) -> List[ScheduledJob]:
+    """
+    读取定时任务配置
+
+    Args:
+        path: 配置文件路径，默认 Config.SCHEDULER_JOBS_FILE
+
+    Returns:
+        任务列表
+    """
+    path = Path(path) if path else Config.SCHEDULER_JOBS_FILE
+
+    if not path.exists():
+        return [ScheduledJob(name='default', cron=CronExpression(Config.SCHEDULER_CRON))]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    jobs = []
+    for entry in entries:
+        try:
+            jobs.append(ScheduledJob.from_dict(entry))
+        except (KeyError, ValueError) as e:
+            logger.error(f"定时任务配置无效，已忽略 {entry}: {e}")
+
+    return jobs
+
+
+class SchedulerState:
+    """调度状态（每个任务最近处理的触发时间、最近运行结果），原子写入"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Config.SCHEDULER_STATE_FILE
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    def load(self):
+        """读取状态文件"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f).get('jobs', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"调度状态读取失败，将重新开始: {e}")
+            self.jobs = {}
+
+    def save(self):
+        """保存状态文件（先写临时文件再替换）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({'jobs': self.jobs}, ensure_ascii=False, indent=2)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def get(self, job: ScheduledJob) -> Dict[str, Any]:
+        return self.jobs.setdefault(job.key, {})
+
+    def get_time(self, job: ScheduledJob, name: str) -> Optional[datetime]:
+        value = self.get(job).get(name)
+        return datetime.fromisoformat(value) if value else None
+
+    def set_time(self, job: ScheduledJob, name: str, value: datetime):
+        self.get(job)[name] = value.isoformat(timespec='seconds')
+
+    @staticmethod
+    def success_field(data_type: str) -> str:
+        """数据类型最近成功导出时间的字段名"""
+        return f"last_success_{data_type}"
+
+
+class ExportScheduler:
+    """
+    定时导出调度器
+
+    - 每隔 TICK_SECONDS 检查一次各任务是否到期，到期任务加入队列
+    - 队列中的任务在同一个浏览器上依次执行（与手动导出共用 UnifiedExporter 的锁）
+    - 执行前随机等待 0~jitter_seconds 秒，避免多个任务同时开始
+    - 任务的每种数据类型在 fresh_hours 内都已由定时任务成功导出过时跳过本次运行
+    - 启动时补跑错过的触发（多次错过只补跑最近一次，超过 SCHEDULER_CATCHUP_HOURS 的不补跑）
+    """
+
+    TICK_SECONDS = 30
+
+    def __init__(self, exporter=None, jobs: Optional[List[ScheduledJob]] = None,
+                 state_path: Optional[Path] = None):
+        """
+        Args:
+            exporter: UnifiedExporter 实例，默认新建
+            jobs: 任务列表，默认从配置文件读取
+            state_path: 状态文件路径
+        """
+        if exporter is None:
+            from modules.unified_exporter import UnifiedExporter
+            exporter = UnifiedExporter()
+
+        self.exporter = exporter
+        self.jobs = jobs if jobs is not None else load_jobs()
+        self.state = SchedulerState(state_path)
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._stopped = False
+
+    async def run(self):
+        """运行调度器（直到 stop() 被调用）"""
+        self._queue = asyncio.Queue()
+        self._stopped = False
+        self.state.load()
+
+        active_jobs = []
+        for job in self.jobs:
+            if job.account != Config.ACCOUNT_NAME:
+                logger.warning(
+                    f"定时任务 {job.name} 属于账号 {job.account}，当前账号为 {Config.ACCOUNT_NAME}，已跳过"
+                )
+                continue
+            active_jobs.append(job)
+            logger.info(f"定时任务: {job.name} [{job.cron.expression}] 数据: {job.data_type}")
+
+        self._catch_up(active_jobs, datetime.now())
+
+        worker = asyncio.create_task(self._worker())
+        try:
+            while not self._stopped:
+                self._tick(active_jobs, datetime.now())
+                await asyncio.sleep(self.TICK_SECONDS)
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            logger.info("定时任务调度已停止")
+
+    def stop(self):
+        """停止调度（正在执行的导出会继续完成）"""
+        self._stopped = True
+
+    def _catch_up(self, jobs: List[ScheduledJob], now: datetime):
+        """补跑程序未运行期间错过的触发"""
+        for job in jobs:
+            last_due = self.state.get_time(job, 'last_due')
+            if last_due is None:
+                # 新任务从现在开始计算
+                self.state.set_time(job, 'last_due', now)
+                continue
+
+            # 只在补跑期限内查找错过的触发，期限之前的直接跳过
+            window_start = now - timedelta(hours=Config.SCHEDULER_CATCHUP_HOURS)
+            latest_missed = None
+            due = job.cron.next_after(max(last_due, window_start))
+            while due <= now:
+                latest_missed = due
+                due = job.cron.next_after(due)
+
+            if latest_missed is None:
+                if job.cron.next_after(last_due) <= now:
+                    self.state.set_time(job, 'last_due', now)
+                    logger.info(f"定时任务 {job.name} 错过的运行已超过补跑期限，不再补跑")
+                continue
+
+            self.state.set_time(job, 'last_due', latest_missed)
+            logger.info(f"定时任务 {job.name} 错过运行，补跑最近一次（{latest_missed:%Y-%m-%d %H:%M}）")
+            self._enqueue(job, latest_missed)
+
+        self.state.save()
+
+    def _tick(self, jobs: List[ScheduledJob], now: datetime):
+        """将到期的任务加入队列"""
+        changed = False
+
+        for job in jobs:
+            last_due = self.state.get_time(job, 'last_due') or now
+            due = job.cron.next_after(last_due)
+            if due > now:
+                continue
+
+            # 休眠等原因错过多次时只保留最近一次
+            following = job.cron.next_after(due)
+            while following <= now:
+                due, following = following, job.cron.next_after(following)
+
+            self.state.set_time(job, 'last_due', due)
+            changed = True
+            self._enqueue(job, due)
+
+        if changed:
+            self.state.save()
+
+    def _enqueue(self, job: ScheduledJob, due: datetime):
+        """加入执行队列（同一任务排队中时不重复加入）"""
+        if job.key in self._pending:
+            logger.info(f"定时任务 {job.name} 仍在排队，跳过本次触发")
+            return
+
+        delay = random.uniform(0, job.jitter_seconds) if job.jitter_seconds > 0 else 0
+        self._pending.add(job.key)
+        self._queue.put_nowait((job, due, delay))
+        logger.info(f"定时任务 {job.name} 已到期，{delay:.0f} 秒后执行")
+
+    async def _worker(self):
+        """依次执行队列中的任务"""
+        while True:
+            job, due, delay = await self._queue.get()
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+                await self._run_job(job, due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"定时任务 {job.name} 执行出错: {e}", exc_info=True)
+            finally:
+                self._pending.discard(job.key)
+                self._queue.task_done()
+
+    def is_fresh(self, job: ScheduledJob, now: Optional[datetime] = None) -> Tuple[bool, Optional[datetime]]:
+        """
+        数据是否仍然新鲜（每种数据类型都在 fresh_hours 内成功导出过）
+
+        按数据类型取同一账号下所有任务记录的最近成功时间（数据未变化、沿用上次文件也算成功），
+        不依赖输出文件的修改时间
+
+        Returns:
+            (是否新鲜, 各数据类型中最早的最近成功时间)
+        """
+        now = now or datetime.now()
+        oldest: Optional[datetime] = None
+
+        for data_type in job.data_types:
+            latest: Optional[datetime] = None
+            for other in self.jobs:
+                if other.account == job.account and data_type in other.data_types:
+                    success = self.state.get_time(other, SchedulerState.success_field(data_type))
+                    if success and (latest is None or success > latest):
+                        latest = success
+
+            if latest is None:
+                return False, None
+            oldest = latest if oldest is None or latest < oldest else oldest
+
+        return now - oldest < timedelta(hours=job.fresh_hours), oldest
+
+    async def _run_job(self, job: ScheduledJob, due: datetime):
+        """执行一个任务"""
+        now = datetime.now()
+        fresh, last_export = self.is_fresh(job, now)
+
+        if fresh:
+            logger.info(f"定时任务 {job.name} 的数据仍新鲜（{last_export:%Y-%m-%d %H:%M} 已导出），跳过")
+            self.get_state(job).update(last_status='skipped_fresh')
+            self.state.set_time(job, 'last_run', now)
+            self.state.save()
+            log_event(logger, '定时任务跳过', job=job.name, data_type=job.data_type, reason='fresh')
+            return
+
+        logger.info(f"开始执行定时任务 {job.name}（计划时间 {due:%Y-%m-%d %H:%M}）")
+        self.state.set_time(job, 'last_run', now)
+
+        error: Optional[Exception] = None
+        try:
+            await self.exporter.export_all(job.to_export_config())
+        except Exception as e:
+            error = e
+
+        try:
+            # 按数据类型记录成功时间，部分数据类型失败时不影响其他类型的新鲜度判断
+            finished = datetime.now()
+            outcomes = self.exporter.last_outcomes
+            succeeded = [t for t in job.data_types if outcomes.get(t) in SUCCESS_OUTCOMES]
+            failed = [t for t in job.data_types if t not in succeeded]
+            for data_type in succeeded:
+                self.state.set_time(job, SchedulerState.success_field(data_type), finished)
+
+            if not failed:
+                self.state.set_time(job, 'last_success', finished)
+                self.get_state(job).update(last_status='success', last_error=None)
+                log_event(logger, '定时任务完成', job=job.name, data_type=job.data_type,
+                          elapsed_ms=(finished - now).total_seconds() * 1000)
+            else:
+                detail = '、'.join(f"{t}({outcomes.get(t, 'failed')})" for t in failed)
+                message = f"{detail} 未成功" + (f": {error}" if error else '')
+                status = 'partial' if succeeded else 'failed'
+                self.get_state(job).update(last_status=status, last_error=message)
+                logger.error(f"定时任务 {job.name} {'部分' if succeeded else ''}失败: {message}")
+                log_event(logger, '定时任务失败', job=job.name, data_type=job.data_type,
+                          failed=failed, error=message)
+
+        finally:
+            self.state.save()
+
+    def get_state(self, job: ScheduledJob) -> Dict[str, Any]:
+        """任务的调度状态"""
+        return self.state.get(job)
+
+
+async def _main():
+    """无界面常驻运行调度器"""
+    from core.browser import browser_manager
+
+    scheduler = ExportScheduler()
+    try:
+        await scheduler.run()
+    finally:
+        await browser_manager.close_browser()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        logger.info("定时任务调度被用户中断")
@@ -0,0 +1,215 @@
+"""
+tooltip采集检查点模块
+图表tooltip逐点采集时，每采到一个点就追加到检查点日志（JSONL），数据类型采集完成时合并为快照文件；
+再次抓取时跳过已采集完成的数据类型和已采集过的采样位置，只补齐缺失的点
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TooltipCheckpoint:
+    """
+    tooltip采集检查点
+
+    文件内容：
+        {
+            "created_at": 创建时间戳,
+            "day": 创建日期（跨天后图表日期整体后移，检查点失效）,
+            "chart_width": 图表宽度（宽度变化后采样位置与日期的对应关系失效）,
+            "series": {字段: {日期: 数值}},
+            "positions": {字段: {采样位置序号: 日期}},
+            "complete": [已采集完成的字段]
+        }
+
+    快照之后采集的点逐行追加到同名的 .points.jsonl 日志（{"name", "index", "date", "value"}），
+    读取时在快照上重放；save() 写入快照后清空日志
+    """
+
+    def __init__(self, days: int, path: Optional[Path] = None):
+        """
+        Args:
+            days: 抓取天数（不同天数的检查点互不影响）
+            path: 检查点文件路径，默认 TEMP_DIR/checkpoints/followers_<账号>_<天数>d.json
+        """
+        self.days = days
+        self.path = Path(path) if path else (
+            Config.TEMP_DIR / 'checkpoints' / f"followers_{Config.ACCOUNT_NAME}_{days}d.json"
+        )
+        self.journal_path = self.path.with_suffix('.points.jsonl')
+        self._reset()
+
+    def _reset(self):
+        self.created_at = time.time()
+        self.day = date.today().isoformat()
+        self.chart_width: Optional[float] = None
+        self.series: Dict[str, Dict[str, int]] = {}
+        self.positions: Dict[str, Dict[int, str]] = {}
+        self.complete = set()
+        # 快照文件已写入（日志只记录快照之后的点）
+        self._saved = False
+
+    @classmethod
+    def load(cls, days: int, path: Optional[Path] = None) -> 'TooltipCheckpoint':
+        """
+        读取检查点（不存在、已过期、跨天或损坏时返回空检查点）
+        """
+        checkpoint = cls(days, path)
+        if not checkpoint.path.exists():
+            return checkpoint
+
+        try:
+            with open(checkpoint.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"tooltip检查点读取失败，重新采集: {e}")
+            return checkpoint
+
+        expired = time.time() - data.get('created_at', 0) > Config.CHECKPOINT_TTL_MINUTES * 60
+        if expired or data.get('day') != checkpoint.day:
+            logger.info("tooltip检查点已过期，重新采集")
+            checkpoint.clear()
+            return checkpoint
+
+        checkpoint.created_at = data['created_at']
+        checkpoint.chart_width = data.get('chart_width')
+        checkpoint.series = data.get('series', {})
+        checkpoint.positions = {
+            name: {int(index): date_str for index, date_str in positions.items()}
+            for name, positions in data.get('positions', {}).items()
+        }
+        checkpoint.complete = set(data.get('complete', []))
+        checkpoint._saved = True
+        checkpoint._replay_journal()
+
+        if checkpoint:
+            logger.info(f"已读取tooltip检查点: {checkpoint.describe()}")
+        return checkpoint
+
+    def _replay_journal(self):
+        """在快照上重放日志中的点（忽略写入中断的最后一行）"""
+        if not self.journal_path.exists():
+            return
+
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            logger.warning(f"tooltip检查点日志读取失败: {e}")
+            return
+
+        for line in lines:
+            try:
+                point = json.loads(line)
+                name, index = point['name'], int(point['index'])
+                self.values(name)[point['date']] = point['value']
+                self.positions.setdefault(name, {})[index] = point['date']
+            except (ValueError, KeyError, TypeError):
+                logger.debug(f"跳过无法解析的tooltip检查点日志行: {line[:80]!r}")
+
+    def __bool__(self) -> bool:
+        return any(self.series.values())
+
+    def describe(self) -> str:
+        """各数据类型的采集进度"""
+        return '，'.join(
+            f"{name} {len(values)} 点{'（完成）' if name in self.complete else ''}"
+            for name, values in self.series.items()
+        ) or '无'
+
+    def bind_chart(self, width: float):
+        """
+        记录图表宽度，宽度与检查点不一致时丢弃采样位置记录（已采集的数值保留）
+        """
+        if self.chart_width is not None and abs(self.chart_width - width) <= 1:
+            return
+        if self.chart_width is not None:
+            logger.info("图表宽度已变化，重新定位采样点")
+            self.positions = {}
+        self.chart_width = width
+        self.save()
+
+    def is_complete(self, name: str) -> bool:
+        return name in self.complete
+
+    def values(self, name: str) -> Dict[str, int]:
+        """数据类型已采集的 {日期: 数值}"""
+        return self.series.setdefault(name, {})
+
+    def pending_positions(self, name: str, sample_points: int) -> Iterable[int]:
+        """需要悬停的采样位置（跳过对应日期已采集的位置）"""
+        positions = self.positions.get(name, {})
+        values = self.series.get(name, {})
+        return [i for i in range(sample_points) if positions.get(i) not in values]
+
+    def record(self, name: str, index: int, date_str: str, value: int):
+        """记录一个采集到的点并追加到日志"""
+        self.values(name)[date_str] = value
+        self.positions.setdefault(name, {})[index] = date_str
+
+        if not self._saved:
+            # 先写入快照（创建时间、日期、图表宽度），日志才能在其上重放
+            self.save()
+            return
+
+        line = json.dumps(
+            {'name': name, 'index': index, 'date': date_str, 'value': value},
+            ensure_ascii=False, separators=(',', ':')
+        )
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            logger.debug(f"追加tooltip检查点日志失败: {e}")
+
+    def mark_complete(self, name: str):
+        """标记数据类型采集完成（合并日志为快照）"""
+        self.complete.add(name)
+        self.save()
+
+    def save(self):
+        """写入快照（先写临时文件再替换）并清空日志"""
+        data = json.dumps({
+            'created_at': self.created_at,
+            'day': self.day,
+            'chart_width': self.chart_width,
+            'series': self.series,
+            'positions': self.positions,
+            'complete': sorted(self.complete),
+        }, ensure_ascii=False, separators=(',', ':'))
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+            self._saved = True
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+        except Exception as e:
+            logger.debug(f"写入tooltip检查点失败: {e}")
+
+    def clear(self):
+        """删除检查点文件和日志（抓取成功后调用）"""
+        self._reset()
+        try:
+            for path in (self.path, self.journal_path):
+                if path.exists():
+                    path.unlink()
+        except OSError as e:
+            logger.debug(f"删除tooltip检查点失败: {e}")
@@ -3,16 +3,19 @@
 处理多种数据的统一导出流程
 """
 import asyncio
-from typing import List, Dict, Any, Optional, Callable
-from pathlib import Path
+import logging
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime
 
 from config import Config
 from core.browser import browser_manager
+from core.export_reader import export_reader
 from core.exporter import ExcelExporter
 from modules.notes_exporter import NotesExporter
 from modules.followers_scraper import FollowersScraper
-from utils.logger import get_logger
+from utils.logger import get_logger, get_run_id, log_event, start_run, end_run
+from utils.timing import span, start_trace, finish_trace
 
 logger = get_logger(__name__)
 
@@ -24,11 +27,35 @@ class UnifiedExporter:
         self.notes_exporter = NotesExporter()
         self.followers_scraper = FollowersScraper()
         self.excel_exporter = ExcelExporter()
+        # 手动导出与定时任务共用同一个浏览器，同一时间只运行一次导出
+        # （在事件循环中首次导出时创建，Python 3.9 的 asyncio.Lock 绑定创建时的事件循环）
+        self._lock: Optional[asyncio.Lock] = None
+        # 最近一次导出各数据类型的结果 {'notes'/'followers': 'success'/'unchanged'/'empty'/'failed'}
+        self.last_outcomes: Dict[str, str] = {}
 
     async def export_all(
         self,
         export_config: Dict[str, Any],
         progress_callback: Optional[Callable[[str, int], None]] = None
+    ) -> str:
+        """
+        统一导出所有勾选的数据（已有导出在运行时排队等待）
+
+        参数和返回值见 _export_all；返回（或抛出异常）后各数据类型的结果见 last_outcomes
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        if self._lock.locked():
+            logger.info("已有导出任务在运行，等待其完成...")
+
+        async with self._lock:
+            return await self._export_all(export_config, progress_callback)
+
+    async def _export_all(
+        self,
+        export_config: Dict[str, Any],
+        progress_callback: Optional[Callable[[str, int], None]] = None
     ) -> str:
         """
         统一导出所有勾选的数据
@@ -41,7 +68,11 @@ class UnifiedExporter:
                     'notes_start_date': str or None,
                     'notes_end_date': str or None,
                     'export_followers': bool,
-                    'followers_days': int
+                    'followers_days': int,
+                    'followers_start_date': str or None,  # 可选，指定后按日期范围抓取
+                    'followers_end_date': str or None,    # 可选，默认昨天
+                    'capture_trace': bool,  # 可选，默认 Config.CAPTURE_TRACE
+                    'capture_har': bool     # 可选，默认 Config.CAPTURE_HAR
                 }
             progress_callback: 进度回调函数
 
@@ -55,11 +86,22 @@ class UnifiedExporter:
             if progress_callback:
                 progress_callback(msg, progress)
 
+        run_token = start_run()
+        trace_token = start_trace('export_all')
+        run_start = time.perf_counter()
+        self.last_outcomes = {}
+
         try:
             update_progress("开始导出数据...", 0)
+            log_event(
+                logger, '统一导出开始',
+                export_notes=export_config['export_notes'],
+                export_followers=export_config['export_followers']
+            )
 
-            # 收集所有数据
+            # 收集所有数据和各自的输出文件（新生成的或数据未变化时沿用的文件）
             all_data = {}
+            output_files = []
             total_steps = 0
             current_step = 0
 
@@ -69,72 +111,99 @@ class UnifiedExporter:
             if export_config['export_followers']:
                 total_steps += 1
 
-            # 1. 导出笔记数据
-            if export_config['export_notes']:
-                current_step += 1
-                progress = int((current_step - 1) / total_steps * 80) + 10
-                update_progress(f"[{current_step}/{total_steps}] 正在导出笔记数据...", progress)
-
-                try:
-                    notes_data = await self._export_notes(
-                        export_config['notes_date_range'],
-                        export_config['notes_start_date'],
-                        export_config['notes_end_date'],
-                        update_progress
-                    )
-
-                    if notes_data:
-                        all_data['笔记数据'] = notes_data
-                        update_progress(f"✓ 笔记数据导出成功，共 {len(notes_data)} 条记录", progress + 5)
-                    else:
-                        update_progress(f"⚠ 笔记数据为空", progress + 5)
-                except Exception as e:
-                    update_progress(f"⚠ 笔记数据导出失败: {str(e)}", progress + 5)
-                    logger.warning(f"笔记数据导出失败（不影响其他数据）: {e}")
-
-            # 2. 抓取粉丝数据
-            if export_config['export_followers']:
-                current_step += 1
-                progress = int((current_step - 1) / total_steps * 80) + 10
-                update_progress(f"[{current_step}/{total_steps}] 正在抓取粉丝数据...", progress)
-
-                try:
-                    followers_data = await self._export_followers(
-                        export_config['followers_days'],
-                        update_progress
-                    )
-
-                    if followers_data:
-                        all_data['粉丝数据'] = followers_data
-                        update_progress(f"✓ 粉丝数据抓取成功，共 {len(followers_data)} 条记录", progress + 5)
-                    else:
-                        update_progress(f"⚠ 粉丝数据为空", progress + 5)
-                except Exception as e:
-                    update_progress(f"⚠ 粉丝数据抓取失败: {str(e)}", progress + 5)
-                    logger.warning(f"粉丝数据抓取失败（不影响其他数据）: {e}")
+            # 按任务开启trace/HAR录制（用于排查慢导出），录制文件保存在运行目录
+            capture_trace = export_config.get('capture_trace', Config.CAPTURE_TRACE)
+            capture_har = export_config.get('capture_har', Config.CAPTURE_HAR)
+
+            async with browser_manager.capture(
+                Config.get_run_dir(get_run_id()),
+                trace=capture_trace,
+                har=capture_har
+            ):
+                # 1. 导出笔记数据
+                if export_config['export_notes']:
+                    current_step += 1
+                    progress = int((current_step - 1) / total_steps * 80) + 10
+                    update_progress(f"[{current_step}/{total_steps}] 正在导出笔记数据...", progress)
+
+                    try:
+                        with span('notes', logger):
+                            notes_data, notes_path = await self._export_notes(
+                                export_config['notes_date_range'],
+                                export_config['notes_start_date'],
+                                export_config['notes_end_date'],
+                                update_progress
+                            )
+
+                        if notes_data:
+                            all_data['笔记数据'] = notes_data
+                            output_files.append(('笔记数据', notes_path))
+                            self.last_outcomes['notes'] = (
+                                'unchanged' if self.notes_exporter.last_unchanged else 'success'
+                            )
+                            if self.notes_exporter.last_unchanged:
+                                update_progress(f"✓ 笔记数据未变化（共 {len(notes_data)} 条记录），未生成新文件", progress + 5)
+                            else:
+                                update_progress(f"✓ 笔记数据导出成功，共 {len(notes_data)} 条记录", progress + 5)
+                        else:
+                            update_progress(f"⚠ 笔记数据为空", progress + 5)
+                            self.last_outcomes['notes'] = 'empty'
+                    except Exception as e:
+                        self.last_outcomes['notes'] = 'failed'
+                        update_progress(f"⚠ 笔记数据导出失败: {str(e)}", progress + 5)
+                        logger.warning(f"笔记数据导出失败（不影响其他数据）: {e}")
+                        log_event(logger, '笔记数据导出失败', level=logging.WARNING,
+                                  data_type='notes', error=str(e))
+
+                # 2. 抓取粉丝数据
+                if export_config['export_followers']:
+                    current_step += 1
+                    progress = int((current_step - 1) / total_steps * 80) + 10
+                    update_progress(f"[{current_step}/{total_steps}] 正在抓取粉丝数据...", progress)
+
+                    try:
+                        with span('followers', logger):
+                            followers_data, followers_path = await self._export_followers(
+                                export_config['followers_days'],
+                                update_progress,
+                                start_date=export_config.get('followers_start_date'),
+                                end_date=export_config.get('followers_end_date')
+                            )
+
+                        if followers_data:
+                            all_data['粉丝数据'] = followers_data
+                            output_files.append(('粉丝数据', followers_path))
+                            self.last_outcomes['followers'] = (
+                                'unchanged' if self.followers_scraper.last_unchanged else 'success'
+                            )
+                            if self.followers_scraper.last_unchanged:
+                                update_progress(f"✓ 粉丝数据未变化（共 {len(followers_data)} 条记录），未生成新文件", progress + 5)
+                            else:
+                                update_progress(f"✓ 粉丝数据抓取成功，共 {len(followers_data)} 条记录", progress + 5)
+                        else:
+                            update_progress(f"⚠ 粉丝数据为空", progress + 5)
+                            self.last_outcomes['followers'] = 'empty'
+                    except Exception as e:
+                        self.last_outcomes['followers'] = 'failed'
+                        update_progress(f"⚠ 粉丝数据抓取失败: {str(e)}", progress + 5)
+                        logger.warning(f"粉丝数据抓取失败（不影响其他数据）: {e}")
+                        log_event(logger, '粉丝数据抓取失败', level=logging.WARNING,
+                                  data_type='followers', error=str(e))
 
             # 3. 导出完成，不再生成汇总Excel文件
             if not all_data:
                 raise Exception("没有获取到任何数据")
 
-            # 收集已生成的文件路径
-            output_files = []
-            if '笔记数据' in all_data:
-                # 笔记数据已经是单独的Excel文件
-                notes_files = list(Path('data/output').glob('notes_data_*.xlsx'))
-                if notes_files:
-                    latest_notes = max(notes_files, key=lambda p: p.stat().st_mtime)
-                    output_files.append(('笔记数据', str(latest_notes)))
-
-            if '粉丝数据' in all_data:
-                # 粉丝数据已经是单独的CSV文件
-                followers_files = list(Path('data/output').glob('followers_data_*.csv'))
-                if followers_files:
-                    latest_followers = max(followers_files, key=lambda p: p.stat().st_mtime)
-                    output_files.append(('粉丝数据', str(latest_followers)))
-
             update_progress("✓ 所有数据导出完成！", 100)
 
+            log_event(
+                logger, '统一导出完成',
+                elapsed_ms=(time.perf_counter() - run_start) * 1000,
+                rows=sum(len(data) for data in all_data.values()),
+                notes_rows=len(all_data.get('笔记数据', [])),
+                followers_rows=len(all_data.get('粉丝数据', []))
+            )
+
             # 返回文件路径信息
             file_info = "\n".join([f"{name}: {path}" for name, path in output_files])
             logger.info(f"导出文件:\n{file_info}")
@@ -146,14 +215,23 @@ class UnifiedExporter:
             logger.error(f"统一导出失败: {e}", exc_info=True)
             raise
 
+        finally:
+            finish_trace(trace_token)
+            end_run(run_token)
+
     async def _export_notes(
         self,
         date_range: str,
         start_date: Optional[str],
         end_date: Optional[str],
         progress_callback: Callable[[str, int], None]
-    ) -> List[Dict[str, Any]]:
-        """导出笔记数据"""
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        导出笔记数据
+
+        Returns:
+            (笔记数据, 输出文件路径)
+        """
         try:
             # 解析日期参数
             if date_range == 'all':
@@ -167,17 +245,16 @@ class UnifiedExporter:
                 progress_callback=progress_callback
             )
 
-            # 读取导出的数据
-            import pandas as pd
-            df = pd.read_excel(temp_path)
-            data = df.to_dict('records')
+            # 读取导出的数据（解析结果按文件内容缓存，之后查询历史数据时不再重复解析）
+            with span('reload', logger):
+                data = export_reader.load(temp_path).to_dict('records')
 
             # 保留Excel文件，不删除
             # Path(temp_path).unlink()
 
             logger.info(f"笔记数据已导出: {temp_path}")
 
-            return data
+            return data, temp_path
 
         except Exception as e:
             logger.error(f"导出笔记数据失败: {e}")
@@ -186,27 +263,35 @@ class UnifiedExporter:
     async def _export_followers(
         self,
         days: int,
-        progress_callback: Callable[[str, int], None]
-    ) -> List[Dict[str, Any]]:
-        """抓取粉丝数据"""
+        progress_callback: Callable[[str, int], None],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        抓取粉丝数据
+
+        Returns:
+            (粉丝数据, 输出文件路径)
+        """
         try:
             # 抓取粉丝数据
             csv_path = await self.followers_scraper.scrape_followers_data(
                 days=days,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                start_date=start_date,
+                end_date=end_date
             )
 
-            # 读取导出的CSV数据（UTF-8 BOM）
-            import pandas as pd
-            df = pd.read_csv(csv_path, encoding='utf-8-sig')
-            data = df.to_dict('records')
+            # 读取导出的CSV数据（UTF-8 BOM，解析结果按文件内容缓存）
+            with span('reload', logger):
+                data = export_reader.load(csv_path).to_dict('records')
 
             # 保留CSV文件，不删除
             # Path(csv_path).unlink()
 
             logger.info(f"已读取粉丝数据: {len(data)} 条记录")
 
-            return data
+            return data, csv_path
 
         except Exception as e:
             logger.error(f"抓取粉丝数据失败: {e}")
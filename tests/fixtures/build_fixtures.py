@@ -0,0 +1,103 @@
+"""
+生成离线回放用的固定数据（tests/test_replay.py 使用）
+
+页面HTML、接口数据和笔记导出文件都由本地模拟平台（mock_platform）按固定随机种子生成，
+不包含任何真实账号数据或Cookie：
+    - network.har: 粉丝数据页、笔记数据页（地址与真实平台一致）
+    - fans_trend.json / fans_data.json: 粉丝接口响应
+    - notes.xlsx: 笔记导出文件
+    - manifest.json: 接口和下载的固定数据路由
+
+粉丝数据的日期截至生成当天的前一天，需要更新时重新运行:
+    python tests/fixtures/build_fixtures.py
+"""
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mock_platform.server import (
+    HOME_PAGE, NOTES_PAGE, XLSX_CONTENT_TYPE, MockPlatformServer, build_notes_xlsx
+)
+from core.replay import MANIFEST_FILENAME
+
+FIXTURES_DIR = Path(__file__).resolve().parent
+PLATFORM_URL = 'https://creator.xiaohongshu.com'
+
+FANS_DAYS = 30
+NOTES_COUNT = 20
+
+
+def har_entry(url: str, body: str, mime_type: str) -> dict:
+    """单个请求的HAR记录（不含Cookie等敏感请求头）"""
+    return {
+        'startedDateTime': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'time': 0,
+        'request': {
+            'method': 'GET',
+            'url': url,
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [],
+            'headers': [],
+            'queryString': [],
+            'headersSize': -1,
+            'bodySize': 0,
+        },
+        'response': {
+            'status': 200,
+            'statusText': 'OK',
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [],
+            'headers': [{'name': 'Content-Type', 'value': mime_type}],
+            'content': {'size': len(body.encode('utf-8')), 'mimeType': mime_type, 'text': body},
+            'redirectURL': '',
+            'headersSize': -1,
+            'bodySize': -1,
+        },
+        'cache': {},
+        'timings': {'send': 0, 'wait': 0, 'receive': 0},
+    }
+
+
+def main():
+    platform = MockPlatformServer(fans_days=FANS_DAYS, notes_count=NOTES_COUNT)
+    html = 'text/html; charset=utf-8'
+
+    har = {
+        'log': {
+            'version': '1.2',
+            'creator': {'name': 'build_fixtures', 'version': '1.0'},
+            'entries': [
+                har_entry(f"{PLATFORM_URL}/new/home", HOME_PAGE, html),
+                har_entry(f"{PLATFORM_URL}/statistics/fans-data", platform.fans_page(), html),
+                har_entry(f"{PLATFORM_URL}/statistics/data-analysis", NOTES_PAGE, html),
+            ],
+        }
+    }
+
+    files = {
+        'network.har': json.dumps(har, ensure_ascii=False, indent=1),
+        'fans_trend.json': json.dumps(platform.fans_trend(FANS_DAYS), ensure_ascii=False, indent=1),
+        'fans_data.json': json.dumps(platform.fans_data(), ensure_ascii=False, indent=1),
+        MANIFEST_FILENAME: json.dumps({
+            'routes': [
+                {'url': '**/api/fans/trend**', 'file': 'fans_trend.json'},
+                {'url': '**/api/fans/data**', 'file': 'fans_data.json'},
+                {'url': '**/api/notes/export**', 'file': 'notes.xlsx',
+                 'content_type': XLSX_CONTENT_TYPE,
+                 'headers': {'Content-Disposition': 'attachment; filename="notes.xlsx"'}},
+            ]
+        }, ensure_ascii=False, indent=2),
+    }
+
+    for name, text in files.items():
+        (FIXTURES_DIR / name).write_text(text + '\n', encoding='utf-8')
+    (FIXTURES_DIR / 'notes.xlsx').write_bytes(build_notes_xlsx(platform.notes))
+
+    print(f"固定数据已生成: {FIXTURES_DIR}")
+
+
+if __name__ == '__main__':
+    main()
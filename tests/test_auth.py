@@ -0,0 +1,77 @@
+"""
+测试：登录完成判断（假页面，不启动浏览器）
+
+运行: python -m pytest tests/test_auth.py -q
+"""
+import asyncio
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from config import Config
+from core.auth import wait_for_login
+
+COOKIE = Config.LOGIN_COOKIE_NAMES[0]
+
+
+class FakeContext:
+    def __init__(self, cookies):
+        self.values = dict(cookies)
+
+    async def cookies(self, url=None):
+        return [{'name': name, 'value': value} for name, value in self.values.items()]
+
+
+class FakePage:
+    """只实现 wait_for_login 用到的接口"""
+
+    def __init__(self, cookies):
+        self.url = Config.LOGIN_URL
+        self.main_frame = object()
+        self.context = FakeContext(cookies)
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        await asyncio.sleep(3600)
+
+    def set_cookie(self, value):
+        """模拟带 Set-Cookie 的响应"""
+        self.context.values[COOKIE] = value
+        response = type('Response', (), {'headers': {'set-cookie': f"{COOKIE}={value}"}})()
+        for handler in list(self.listeners.get('response', [])):
+            handler(response)
+
+
+async def login_with(baseline, new_value):
+    page = FakePage(baseline)
+
+    async def scenario():
+        await asyncio.sleep(0.05)
+        page.set_cookie(new_value)
+
+    asyncio.ensure_future(scenario())
+    return await wait_for_login(page, timeout=0.3)
+
+
+def test_new_session_cookie_is_login():
+    assert asyncio.run(login_with({}, 'session')) == 'cookie'
+    assert asyncio.run(login_with({COOKIE: ''}, 'session')) == 'cookie'
+
+
+@pytest.mark.parametrize('baseline, new_value', [
+    ({COOKIE: 'expired'}, 'rotated'),   # 已有Cookie被改写（过期会话、匿名Cookie刷新）
+    ({COOKIE: 'expired'}, ''),          # Cookie被清除
+])
+def test_changed_cookie_is_not_login(baseline, new_value):
+    assert asyncio.run(login_with(baseline, new_value)) is None
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
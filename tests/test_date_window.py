@@ -0,0 +1,62 @@
+"""
+测试：日期范围解析与拆分（不联网）
+
+运行: python -m pytest tests/test_date_window.py -q
+"""
+import sys
+from datetime import date, datetime, timedelta
+sys.path.insert(0, '.')
+
+import pytest
+
+from utils.date_window import resolve_window, split_window, to_date, window_days
+
+
+def test_to_date():
+    assert to_date('2025-01-05') == date(2025, 1, 5)
+    assert to_date('2025/01/05 12:00') == date(2025, 1, 5)
+    assert to_date(datetime(2025, 1, 5, 8)) == date(2025, 1, 5)
+    assert to_date('') is None
+    assert to_date(None) is None
+
+
+def test_resolve_window_days_ends_yesterday():
+    yesterday = date.today() - timedelta(days=1)
+    start, end = resolve_window(7)
+    assert end == yesterday
+    assert window_days(start, end) == 7
+
+
+def test_resolve_window_explicit_dates():
+    assert resolve_window(start_date='2025-01-01', end_date='2025-01-31') == (date(2025, 1, 1), date(2025, 1, 31))
+    # 缺少开始日期时按 days 向前推
+    assert resolve_window(10, end_date='2025-01-31') == (date(2025, 1, 22), date(2025, 1, 31))
+
+
+def test_resolve_window_invalid():
+    with pytest.raises(ValueError):
+        resolve_window(start_date='2025-02-01', end_date='2025-01-01')
+    with pytest.raises(ValueError):
+        resolve_window()
+    with pytest.raises(ValueError):
+        resolve_window(0)
+
+
+def test_split_window():
+    chunks = split_window(date(2025, 1, 1), date(2025, 3, 1), 30)
+    assert chunks == [
+        (date(2025, 1, 1), date(2025, 1, 30)),
+        (date(2025, 1, 31), date(2025, 3, 1)),
+    ]
+    assert sum(window_days(s, e) for s, e in chunks) == window_days(date(2025, 1, 1), date(2025, 3, 1))
+
+
+def test_split_window_edge_cases():
+    day = date(2025, 1, 1)
+    assert split_window(day, day, 30) == [(day, day)]
+    assert split_window(day, date(2025, 1, 30), 30) == [(day, date(2025, 1, 30))]
+    assert split_window(day, date(2025, 12, 31), 0) == [(day, date(2025, 12, 31))]
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
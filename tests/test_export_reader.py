@@ -0,0 +1,129 @@
+"""
+测试：历史导出读取（临时目录，不联网）
+
+运行: python -m pytest tests/test_export_reader.py -q
+"""
+import os
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+pytest.importorskip('pandas')
+
+import core.export_reader as export_reader_module
+from config import Config
+from core.export_index import ExportIndex
+from core.export_reader import CATALOG_FILENAME, ExportReader
+
+
+@pytest.fixture
+def reader(tmp_path, monkeypatch):
+    # 账号以 Config.ACCOUNT_NAME 为准，不读取真实的导出索引
+    monkeypatch.setattr(export_reader_module, 'export_index', ExportIndex(tmp_path / 'export_index.json'))
+    monkeypatch.setattr(Config, 'ACCOUNT_NAME', 'acc')
+    (tmp_path / 'output').mkdir()
+    return ExportReader(tmp_path / 'output', tmp_path / 'cache')
+
+
+def write_followers(reader, ts, rows):
+    """写入一个粉丝数据导出文件: rows 为 [(日期, 新增粉丝), ...]"""
+    path = reader.output_dir / f"followers_data_{ts}.csv"
+    lines = ['日期,新增粉丝'] + [f"{day},{count}" for day, count in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8-sig')
+    return path
+
+
+def count_index_calls(reader, monkeypatch):
+    calls = []
+    original = reader._index_file
+
+    def index_file(file_path, match, stat):
+        calls.append(file_path.name)
+        return original(file_path, match, stat)
+
+    monkeypatch.setattr(reader, '_index_file', index_file)
+    return calls
+
+
+def cache_files(reader):
+    return sorted(p.name for p in reader.cache_dir.iterdir() if p.name != CATALOG_FILENAME)
+
+
+def test_refresh_reindexes_only_changed_files(reader, monkeypatch):
+    first = write_followers(reader, '20250101_090000', [('2025-01-01', 1)])
+    write_followers(reader, '20250102_090000', [('2025-01-02', 2)])
+    calls = count_index_calls(reader, monkeypatch)
+
+    entries = reader.refresh()
+    assert [entry.start_date for entry in entries] == ['2025-01-01', '2025-01-02']
+    assert len(calls) == 2
+
+    reader.refresh()
+    assert len(calls) == 2
+
+    # 内容变化（大小不同）的文件重新建立条目
+    write_followers(reader, '20250101_090000', [('2025-01-01', 1), ('2025-01-03', 30)])
+    reader.refresh()
+    assert calls[2:] == [first.name]
+
+    # 只有修改时间变化时也重新建立条目
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reader.refresh()
+    assert calls[3:] == [first.name]
+
+
+def test_catalog_persists_between_readers(reader, monkeypatch):
+    write_followers(reader, '20250101_090000', [('2025-01-01', 1)])
+    reader.refresh()
+
+    fresh = ExportReader(reader.output_dir, reader.cache_dir)
+    calls = count_index_calls(fresh, monkeypatch)
+    entries = fresh.refresh()
+    assert calls == []
+    assert entries[0].end_date == '2025-01-01'
+    assert entries[0].account == 'acc'
+
+
+def test_refresh_prunes_orphaned_cache_files(reader):
+    kept = write_followers(reader, '20250101_090000', [('2025-01-01', 1)])
+    removed = write_followers(reader, '20250102_090000', [('2025-01-02', 2)])
+    entries = {os.path.basename(entry.path): entry for entry in reader.refresh()}
+    assert len(cache_files(reader)) == 2
+
+    removed.unlink()
+    remaining = reader.refresh()
+
+    assert [entry.path for entry in remaining] == [str(kept.resolve())]
+    assert [name.split('.')[0] for name in cache_files(reader)] == [entries[kept.name].sha256]
+
+
+def test_identical_exports_share_one_cache_file(reader):
+    write_followers(reader, '20250101_090000', [('2025-01-01', 1)])
+    write_followers(reader, '20250102_090000', [('2025-01-01', 1)])
+
+    entries = reader.refresh()
+    assert entries[0].sha256 == entries[1].sha256
+    assert len(cache_files(reader)) == 1
+
+
+def test_load_history_keeps_latest_export_and_filters_window(reader):
+    write_followers(reader, '20250105_090000', [('2025-01-01', 1), ('2025-01-02', 2), ('2025-01-03', 3)])
+    write_followers(reader, '20250106_090000', [('2025-01-03', 30), ('2025-01-04', 40), ('2025-01-05', 50)])
+    # 数据日期范围不在窗口内的导出不参与合并
+    write_followers(reader, '20250301_090000', [('2025-02-20', 99)])
+
+    df = reader.load_history('followers', start_date='2025-01-02', end_date='2025-01-04')
+
+    assert df['日期'].tolist() == ['2025-01-02', '2025-01-03', '2025-01-04']
+    assert df['新增粉丝'].tolist() == [2, 30, 40]
+
+
+def test_load_history_other_account_is_empty(reader):
+    write_followers(reader, '20250101_090000', [('2025-01-01', 1)])
+    assert reader.load_history('followers', account='other').empty
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,42 @@
+"""
+测试：粉丝数据缺口检测（不联网）
+
+运行: python -m pytest tests/test_fans_gaps.py -q
+"""
+import sys
+from datetime import date
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.fans_gaps import expected_dates, find_gaps, group_dates
+
+
+def test_expected_dates_uses_requested_window():
+    assert expected_dates(date(2025, 1, 1), date(2025, 1, 3)) == [
+        date(2025, 1, 3), date(2025, 1, 2), date(2025, 1, 1)
+    ]
+
+
+def test_missing_newest_day_is_a_gap():
+    rows = [{'日期': '2025-01-01', '新增粉丝': 3}, {'日期': '2025-01-02', '新增粉丝': 1}]
+    gaps = find_gaps(rows, date(2025, 1, 1), date(2025, 1, 3), ['新增粉丝'])
+    assert gaps == {'新增粉丝': [date(2025, 1, 3)]}
+
+
+def test_zero_is_not_a_gap():
+    rows = [{'日期': '2025-01-01', '新增粉丝': 0, '掉丝数': 0}, {'日期': '2025-01-02', '新增粉丝': 0}]
+    gaps = find_gaps(rows, date(2025, 1, 1), date(2025, 1, 2), ['新增粉丝', '掉丝数'])
+    assert gaps == {'掉丝数': [date(2025, 1, 2)]}
+
+
+def test_group_dates():
+    days = [date(2025, 1, 5), date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 4)]
+    assert group_dates(days) == [
+        (date(2025, 1, 1), date(2025, 1, 2)),
+        (date(2025, 1, 4), date(2025, 1, 5)),
+    ]
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
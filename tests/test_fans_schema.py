@@ -0,0 +1,82 @@
+"""
+测试：粉丝趋势API数据解析（不联网）
+
+运行: python -m pytest tests/test_fans_schema.py -q
+"""
+import sys
+from datetime import datetime
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.fans_schema import FansTrendParser
+
+ITEMS = [
+    {'date': '2025-01-01', 'new_count': 5, 'lost_count': 1},
+    {'date': '2025-01-02', 'new_count': '7', 'lost_count': None},
+]
+
+EXPECTED = [
+    {'日期': '2025-01-02', '新增粉丝': 7, '掉丝数': 0, '净增长': 7},
+    {'日期': '2025-01-01', '新增粉丝': 5, '掉丝数': 1, '净增长': 4},
+]
+
+
+@pytest.fixture
+def parser():
+    return FansTrendParser()
+
+
+@pytest.mark.parametrize('schema, payload', [
+    ('data.list', {'code': 0, 'data': {'list': ITEMS}}),
+    ('list', {'list': ITEMS}),
+    ('array', ITEMS),
+])
+def test_known_schemas(parser, schema, payload):
+    matched, _ = parser.extract(payload)
+    assert matched.name == schema
+
+    rows, stats = parser.parse([payload], None)
+    assert rows == EXPECTED
+    assert stats['unknown'] == 0
+
+
+@pytest.mark.parametrize('payload', [
+    {'code': 0, 'data': {'total': 100}},
+    [1, 2, 3],
+    [['2025-01-01', 5, 1]],
+    {'data': {'list': ['2025-01-01']}},
+    'error',
+])
+def test_unknown_payloads(parser, payload):
+    assert parser.extract(payload) is None
+    assert parser.project(payload) is None
+
+    rows, stats = parser.parse([payload], None)
+    assert rows == []
+    assert stats['unknown'] == 1
+
+
+def test_projection_round_trip(parser):
+    projected = parser.project({'data': {'list': ITEMS}})
+    assert parser.parse([projected], None)[0] == EXPECTED
+
+
+def test_merge_dedupe_and_days(parser):
+    later = {'list': [{'date': '2025-01-02', 'new_count': 9, 'lost_count': 2}]}
+    rows, stats = parser.parse([{'list': ITEMS}, later], 1)
+    assert rows == [{'日期': '2025-01-02', '新增粉丝': 9, '掉丝数': 2, '净增长': 7}]
+    assert stats['duplicates'] == 1
+    assert stats['days'] == 1
+
+
+def test_timestamp_and_missing_dates(parser):
+    millis = int(datetime(2025, 1, 3, 12).timestamp() * 1000)
+    payload = [{'date': millis, 'new_count': 1}, {'new_count': 2}]
+    rows, stats = parser.parse([payload], None)
+    assert [row['日期'] for row in rows] == ['2025-01-03']
+    assert stats['missing_date'] == 1
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
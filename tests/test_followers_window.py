@@ -0,0 +1,92 @@
+"""
+测试：粉丝数据按日期范围获取（假页面，不联网）
+
+运行: python -m pytest tests/test_followers_window.py -q
+"""
+import asyncio
+import sys
+from datetime import date, timedelta
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.followers_scraper import FollowersScraper
+
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None, text=None):
+        self.status = status
+        self.ok = status < 400
+        self.payload = payload
+        self.text = text
+
+    async def json(self):
+        if self.text is not None:
+            raise ValueError(f"Unexpected token < in JSON: {self.text[:20]}")
+        return self.payload
+
+
+class FakePage:
+    """只实现 _fetch_window 用到的 page.context.request.get"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+        self.context = self
+        self.request = self
+
+    async def get(self, url, params=None, **kwargs):
+        self.calls.append(params)
+        return self.response
+
+
+@pytest.fixture
+def scraper():
+    FollowersScraper.window_api_supported = True
+    scraper = FollowersScraper()
+    yield scraper
+    FollowersScraper.window_api_supported = True
+
+
+def fetch(scraper, response, start=date(2025, 1, 1), end=date(2025, 2, 15)):
+    scraper.page = FakePage(response)
+    return asyncio.run(scraper._fetch_window(start, end)), scraper.page.calls
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse(200, text='<!DOCTYPE html><html></html>'),
+    FakeResponse(404),
+    FakeResponse(200, payload={'code': 0, 'data': {'total': 1}}),
+])
+def test_unsupported_api_is_disabled_without_retry(scraper, response):
+    data, calls = fetch(scraper, response)
+    assert data is None
+    # 每段只请求一次，不重试
+    assert len(calls) == 2
+    assert not FollowersScraper.window_api_supported
+
+    data, calls = fetch(scraper, response)
+    assert data is None and calls == []
+
+
+def test_ranged_api_rows_are_filtered(scraper):
+    payload = {'data': {'list': [
+        {'date': '2025-01-03', 'new_count': 3, 'lost_count': 1},
+        {'date': '2025-01-01', 'new_count': 1, 'lost_count': 0},
+        {'date': '2024-12-31', 'new_count': 9, 'lost_count': 9},
+    ]}}
+    data, calls = fetch(scraper, FakeResponse(200, payload=payload), end=date(2025, 1, 5))
+    assert [row['日期'] for row in data] == ['2025-01-03', '2025-01-01']
+    assert calls == [{'start_date': '2025-01-01', 'end_date': '2025-01-05', 'days': 5}]
+    assert FollowersScraper.window_api_supported
+
+
+def test_preset_coverage():
+    yesterday = date.today() - timedelta(days=1)
+    FollowersScraper._check_preset_coverage(yesterday - timedelta(days=29), yesterday)
+    with pytest.raises(Exception, match='页面预设最多覆盖近30天'):
+        FollowersScraper._check_preset_coverage(yesterday - timedelta(days=30), yesterday)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,116 @@
+"""
+测试：笔记数据仓库（临时SQLite数据库，不联网）
+
+运行: python -m pytest tests/test_notes_store.py -q
+"""
+import sqlite3
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.notes_store import DEFAULT_WINDOW, NotesStore, to_number
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NotesStore(tmp_path / 'notes.db')
+
+
+def note(note_id, views, likes=0, title='测试笔记'):
+    return {'笔记ID': note_id, '笔记标题': title, '发布时间': '2025-01-01', '观看量': views, '点赞数': likes}
+
+
+def test_to_number():
+    assert to_number('1,234') == 1234
+    assert to_number('1.2万') == 12000
+    assert to_number(float('nan')) is None
+    assert to_number('') is None
+    assert to_number(3.0) == 3
+
+
+def test_upsert_replaces_same_day(store):
+    assert store.upsert([note('a', 100), note('b', 50)], '2025-01-01', account='acc') == 2
+    store.upsert([note('a', 120)], '2025-01-01', account='acc')
+
+    rows = {row['note_id']: row for row in store.snapshot('2025-01-01', account='acc')}
+    assert rows['a']['views'] == 120
+    assert rows['b']['views'] == 50
+    assert store.snapshot_dates(account='acc') == ['2025-01-01']
+    assert store.has_snapshot('2025-01-01', account='acc')
+    assert not store.has_snapshot('2025-01-02', account='acc')
+
+
+def test_upsert_without_note_id_uses_stable_key(store):
+    row = {'笔记标题': '无ID笔记', '发布时间': '2025-01-01', '观看量': 10}
+    store.upsert([row], '2025-01-01', account='acc')
+    store.upsert([dict(row, 观看量=15)], '2025-01-02', account='acc')
+
+    rows = store.snapshot(account='acc')
+    assert len(rows) == 1
+    assert store.history(rows[0]['note_id'], account='acc')[0]['views'] == 10
+
+
+def test_daily_growth(store):
+    store.upsert([note('a', 100, 10)], '2025-01-01', account='acc')
+    store.upsert([note('a', 150, 12)], '2025-01-02', account='acc')
+    store.upsert([note('a', 250, 20)], '2025-01-04', account='acc')
+
+    growth = store.daily_growth('views', account='acc')
+    assert [(g['snapshot_date'], g['delta'], g['per_day']) for g in growth] == [
+        ('2025-01-02', 50, 50.0),
+        ('2025-01-04', 100, 50.0),
+    ]
+
+    # 范围内第一天与范围之前最近的快照比较
+    growth = store.daily_growth('likes', start_date='2025-01-04', account='acc')
+    assert [(g['previous_date'], g['delta']) for g in growth] == [('2025-01-02', 8)]
+
+    with pytest.raises(ValueError):
+        store.daily_growth('views; DROP TABLE note_snapshots', account='acc')
+
+
+def test_windows_are_compared_separately(store):
+    """自定义日期范围的导出不覆盖、也不参与默认范围导出的比较"""
+    store.upsert([note('a', 1000)], '2025-01-01', account='acc')
+    store.upsert([note('a', 30)], '2025-01-02', account='acc', window='2025-01-01_2025-01-07')
+    store.upsert([note('a', 1100)], '2025-01-02', account='acc')
+    store.upsert([note('a', 40)], '2025-01-03', account='acc', window='2025-01-01_2025-01-07')
+
+    growth = store.daily_growth('views', account='acc')
+    assert [(g['snapshot_date'], g['delta']) for g in growth] == [('2025-01-02', 100)]
+
+    growth = store.daily_growth('views', account='acc', window='2025-01-01_2025-01-07')
+    assert [(g['snapshot_date'], g['delta']) for g in growth] == [('2025-01-03', 10)]
+
+    assert store.snapshot('2025-01-02', account='acc')[0]['views'] == 1100
+
+
+def test_top_growth(store):
+    store.upsert([note('a', 100), note('b', 100), note('c', 100)], '2025-01-01', account='acc')
+    store.upsert([note('a', 110), note('b', 300), note('c', 150)], '2025-01-02', account='acc')
+
+    top = store.top_growth('views', limit=2, account='acc')
+    assert [row['note_id'] for row in top] == ['b', 'c']
+    assert store.top_growth('views', account='other') == []
+
+
+def test_legacy_table_is_kept(tmp_path):
+    path = tmp_path / 'notes.db'
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE note_snapshots (account TEXT, note_id TEXT, snapshot_date TEXT)")
+    conn.commit()
+    conn.close()
+
+    store = NotesStore(path)
+    store.upsert([note('a', 1)], '2025-01-01', account='acc', window=DEFAULT_WINDOW)
+    assert store.snapshot(account='acc')[0]['views'] == 1
+
+    conn = sqlite3.connect(path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    assert 'note_snapshots_legacy' in tables
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,70 @@
+"""
+测试：离线回放（不联网、不需要登录）
+
+默认使用 tests/fixtures 中提交的固定数据（模拟平台生成的页面HAR、粉丝接口响应和笔记导出文件）：
+    python tests/test_replay.py
+
+也可以回放真实录制的HAR（先用 CAPTURE_HAR=true 完整导出一次）：
+    python tests/test_replay.py data/output/runs/<运行ID>/network.har
+
+固定数据的日期截至生成当天，需要更新时运行 python tests/fixtures/build_fixtures.py
+"""
+import asyncio
+import sys
+sys.path.insert(0, '.')
+
+from pathlib import Path
+
+from config import Config
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+
+async def main(har_path: Path):
+    print("=" * 60)
+    print("测试：离线回放粉丝数据和笔记数据导出")
+    print("=" * 60)
+
+    # 必须在创建浏览器上下文之前开启
+    Config.REPLAY_MODE = True
+    Config.REPLAY_HAR = har_path
+    Config.REPLAY_FIXTURES_DIR = FIXTURES_DIR
+    Config.HEADLESS = True
+    Config.SLOW_MO = 0
+    # 固定数据的日期不随运行日期变化，不按当前日期补齐缺口
+    Config.FOLLOWERS_GAP_FILL = False
+
+    from core.browser import browser_manager
+    from modules.followers_scraper import FollowersScraper
+    from modules.notes_exporter import NotesExporter
+
+    results = {}
+
+    try:
+        print("\n回放粉丝数据抓取（7天）...")
+        csv_path = await FollowersScraper().scrape_followers_data(days=7)
+        results['粉丝数据'] = csv_path
+        print(f"✅ 粉丝数据: {csv_path}")
+
+        print("\n回放笔记数据导出...")
+        notes_path = await NotesExporter().export_notes_data()
+        results['笔记数据'] = notes_path
+        print(f"✅ 笔记数据: {notes_path}")
+
+    except Exception as e:
+        print(f"\n❌ 回放失败: {e}")
+        import traceback
+        traceback.print_exc()
+
+    finally:
+        await browser_manager.close_browser()
+
+    if len(results) == 2:
+        print("\nSUCCESS")
+        return True
+    return False
+
+
+if __name__ == '__main__':
+    har = Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURES_DIR / 'network.har'
+    sys.exit(0 if asyncio.run(main(har)) else 1)
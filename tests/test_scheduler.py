@@ -0,0 +1,98 @@
+"""
+测试：定时导出的新鲜度判断与按数据类型记录结果（假导出器，不启动浏览器）
+
+运行: python -m pytest tests/test_scheduler.py -q
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.scheduler import CronExpression, ExportScheduler, ScheduledJob
+
+
+class FakeExporter:
+    """按预设结果模拟 UnifiedExporter.export_all"""
+
+    def __init__(self, outcomes, error=None):
+        self.outcomes = outcomes
+        self.error = error
+        self.last_outcomes = {}
+        self.calls = 0
+
+    async def export_all(self, export_config, progress_callback=None):
+        self.calls += 1
+        self.last_outcomes = dict(self.outcomes)
+        if self.error:
+            raise Exception(self.error)
+        return ''
+
+
+def make_scheduler(tmp_path, exporter, data_type='all'):
+    job = ScheduledJob(name='job', cron=CronExpression('0 2 * * *'), data_type=data_type,
+                       account='acc', jitter_seconds=0, fresh_hours=12)
+    return ExportScheduler(exporter=exporter, jobs=[job], state_path=tmp_path / 'state.json'), job
+
+
+def test_success_marks_all_types_fresh(tmp_path):
+    scheduler, job = make_scheduler(tmp_path, FakeExporter({'notes': 'success', 'followers': 'unchanged'}))
+    asyncio.run(scheduler._run_job(job, datetime.now()))
+
+    assert scheduler.get_state(job)['last_status'] == 'success'
+    assert scheduler.is_fresh(job)[0]
+    assert not scheduler.is_fresh(job, datetime.now() + timedelta(hours=13))[0]
+
+
+def test_partial_failure_is_not_fresh(tmp_path):
+    scheduler, job = make_scheduler(tmp_path, FakeExporter({'notes': 'success', 'followers': 'failed'}))
+    asyncio.run(scheduler._run_job(job, datetime.now()))
+
+    state = scheduler.get_state(job)
+    assert state['last_status'] == 'partial'
+    assert 'last_success' not in state
+    assert 'last_success_notes' in state and 'last_success_followers' not in state
+    assert not scheduler.is_fresh(job)[0]
+
+
+def test_failure_records_error(tmp_path):
+    scheduler, job = make_scheduler(tmp_path, FakeExporter({}, error='没有获取到任何数据'), data_type='notes')
+    asyncio.run(scheduler._run_job(job, datetime.now()))
+
+    state = scheduler.get_state(job)
+    assert state['last_status'] == 'failed'
+    assert '没有获取到任何数据' in state['last_error']
+    assert not scheduler.is_fresh(job)[0]
+
+
+def test_fresh_job_is_skipped(tmp_path):
+    exporter = FakeExporter({'notes': 'success', 'followers': 'success'})
+    scheduler, job = make_scheduler(tmp_path, exporter)
+    asyncio.run(scheduler._run_job(job, datetime.now()))
+    asyncio.run(scheduler._run_job(job, datetime.now()))
+
+    assert exporter.calls == 1
+    assert scheduler.get_state(job)['last_status'] == 'skipped_fresh'
+
+
+def test_cron_step_day_field_is_not_restricted():
+    """日字段为 */2 时与周字段取交集（标准cron只在字段不以 * 开头时按"或"处理）"""
+    cron = CronExpression('0 9 */2 * 1')
+    # 2025-01-06 是周一、6号（偶数日不在 */2 中）
+    assert not cron.matches(datetime(2025, 1, 6, 9, 0))
+    # 2025-01-13 是周一、13号
+    assert cron.matches(datetime(2025, 1, 13, 9, 0))
+    # 2025-01-15 是周三、15号
+    assert not cron.matches(datetime(2025, 1, 15, 9, 0))
+    assert cron.next_after(datetime(2025, 1, 6, 9, 0)) == datetime(2025, 1, 13, 9, 0)
+
+
+def test_cron_day_and_weekday_either_matches():
+    cron = CronExpression('0 9 1 * 1')
+    assert cron.matches(datetime(2025, 1, 1, 9, 0))   # 1号（周三）
+    assert cron.matches(datetime(2025, 1, 6, 9, 0))   # 周一
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
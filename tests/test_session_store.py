@@ -0,0 +1,45 @@
+"""
+测试：会话存储（临时目录，不启动浏览器）
+
+运行: python -m pytest tests/test_session_store.py -q
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from core.session_store import SessionStore
+
+
+def state(value='v1', expires=100.0, token='t1'):
+    return {
+        'cookies': [{'name': 'web_session', 'value': value, 'domain': '.example.com', 'path': '/', 'expires': expires}],
+        'origins': [{'origin': 'https://example.com', 'localStorage': [{'name': 'token', 'value': token}]}],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(tmp_path / 'session.json', keep_origins=[])
+
+
+def test_unchanged_state_is_not_rewritten(store):
+    assert store.save(state())
+    assert not store.save(state())
+    # 重新创建的实例从文件计算摘要
+    assert not SessionStore(store.path, keep_origins=[]).save(state())
+
+
+@pytest.mark.parametrize('changed', [
+    state(value='v2'),
+    state(expires=200.0),
+    state(token='t2'),
+])
+def test_changed_state_is_written(store, changed):
+    store.save(state())
+    assert store.save(changed)
+    assert store.load() == changed
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
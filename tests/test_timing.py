@@ -0,0 +1,63 @@
+"""
+测试：阶段耗时记录的事件字段（不联网）
+
+运行: python -m pytest tests/test_timing.py -q
+"""
+import logging
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from utils.timing import span
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def log():
+    log = logging.getLogger('test_timing')
+    log.setLevel(logging.INFO)
+    handler = ListHandler()
+    log.addHandler(handler)
+    yield log
+    log.removeHandler(handler)
+
+
+def events(log):
+    return [record.event_fields for record in log.handlers[0].records]
+
+
+def test_reserved_fields_are_renamed(log):
+    with span('export', log, phase='custom', elapsed_ms=5, level='high', event='e') as s:
+        s['rows'] = 3
+
+    fields = events(log)[-1]
+    assert fields['phase'] == 'export'
+    assert fields['rows'] == 3
+    assert fields['field_phase'] == 'custom'
+    assert fields['field_elapsed_ms'] == 5
+    assert fields['field_level'] == 'high'
+    assert fields['field_event'] == 'e'
+
+
+def test_failed_span_logs_warning(log):
+    with pytest.raises(ValueError):
+        with span('parse', log, level='x'):
+            raise ValueError('boom')
+
+    record = log.handlers[0].records[-1]
+    assert record.levelno == logging.WARNING
+    assert record.event_fields['error'] == 'boom'
+    assert record.event_fields['field_level'] == 'x'
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,61 @@
+"""
+测试：tooltip采集检查点（临时目录，不启动浏览器）
+
+运行: python -m pytest tests/test_tooltip_checkpoint.py -q
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from modules.tooltip_checkpoint import TooltipCheckpoint
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'followers_7d.json'
+
+
+def test_points_are_appended_and_replayed(path):
+    checkpoint = TooltipCheckpoint(7, path)
+    checkpoint.bind_chart(500)
+    snapshot = path.read_bytes()
+    for i in range(5):
+        checkpoint.record('新增粉丝', i, f'2025-01-0{i + 1}', i)
+
+    # 逐点只追加日志，不重写快照
+    assert path.read_bytes() == snapshot
+    assert len(checkpoint.journal_path.read_text(encoding='utf-8').splitlines()) == 5
+
+    loaded = TooltipCheckpoint.load(7, path)
+    assert loaded.values('新增粉丝') == {f'2025-01-0{i + 1}': i for i in range(5)}
+    assert list(loaded.pending_positions('新增粉丝', 7)) == [5, 6]
+
+
+def test_truncated_journal_line_is_ignored(path):
+    checkpoint = TooltipCheckpoint(7, path)
+    checkpoint.bind_chart(500)
+    checkpoint.record('掉丝数', 0, '2025-01-01', 2)
+    with open(checkpoint.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"name": "掉丝数", "ind')
+
+    assert TooltipCheckpoint.load(7, path).values('掉丝数') == {'2025-01-01': 2}
+
+
+def test_mark_complete_compacts_journal(path):
+    checkpoint = TooltipCheckpoint(7, path)
+    checkpoint.bind_chart(500)
+    checkpoint.record('新增粉丝', 0, '2025-01-01', 1)
+    checkpoint.mark_complete('新增粉丝')
+
+    assert not checkpoint.journal_path.exists()
+    loaded = TooltipCheckpoint.load(7, path)
+    assert loaded.is_complete('新增粉丝')
+    assert loaded.values('新增粉丝') == {'2025-01-01': 1}
+
+    loaded.clear()
+    assert not path.exists()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
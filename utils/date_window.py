@@ -0,0 +1,77 @@
+"""
+日期范围工具
+解析导出的日期范围，并将超出平台单次查询上限的范围拆分为多个分段
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple, Union
+
+DateLike = Union[str, date, None]
+
+
+def to_date(value: DateLike) -> Optional[date]:
+    """将 YYYY-MM-DD 字符串或 date/datetime 转换为 date"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).strip()[:10].replace('/', '-'), '%Y-%m-%d').date()
+
+
+def resolve_window(
+    days: Optional[int] = None,
+    start_date: DateLike = None,
+    end_date: DateLike = None
+) -> Tuple[date, date]:
+    """
+    确定日期范围（包含首尾）
+
+    - 只给 days：截至昨天的最近 days 天（与平台"近N天"一致）
+    - 给出 start_date / end_date：使用指定范围，缺少结束日期时为昨天，缺少开始日期时按 days 向前推
+
+    Raises:
+        ValueError: 开始日期晚于结束日期，或无法确定范围
+    """
+    end = to_date(end_date) or date.today() - timedelta(days=1)
+    start = to_date(start_date)
+
+    if start is None:
+        if not days or days <= 0:
+            raise ValueError("需要指定天数或开始日期")
+        start = end - timedelta(days=days - 1)
+
+    if start > end:
+        raise ValueError(f"开始日期 {start} 晚于结束日期 {end}")
+
+    return start, end
+
+
+def window_days(start: date, end: date) -> int:
+    """日期范围包含的天数"""
+    return (end - start).days + 1
+
+
+def split_window(start: date, end: date, max_days: int) -> List[Tuple[date, date]]:
+    """
+    将日期范围拆分为不超过 max_days 天的分段（从早到晚）
+
+    Args:
+        start: 开始日期
+        end: 结束日期
+        max_days: 单个分段的最大天数
+
+    Returns:
+        [(分段开始, 分段结束), ...]
+    """
+    if max_days <= 0:
+        return [(start, end)]
+
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=max_days - 1), end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+
+    return chunks
@@ -1,15 +1,32 @@
 """
 日志工具模块
 提供统一的日志记录功能，支持文件和控制台输出，以及GUI回调
+
+所有日志记录器共享一个队列，由后台线程统一写入文件、控制台和GUI，
+记录日志的线程（如asyncio事件循环）不会被磁盘写入阻塞
 """
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import os
+import queue
+import re
 import sys
+import uuid
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable
+from typing import Optional, Callable, List, Any
 
 from config import Config
 
+# 当前运行的ID和账号，随asyncio任务自动传递
+_run_id_var: contextvars.ContextVar = contextvars.ContextVar('run_id', default=None)
+_account_var: contextvars.ContextVar = contextvars.ContextVar('account', default=None)
+
 
 class ColorFormatter(logging.Formatter):
     """彩色日志格式化器"""
@@ -25,30 +42,143 @@ class ColorFormatter(logging.Formatter):
     RESET = '\033[0m'
 
     def format(self, record):
-        # 添加颜色
+        # 添加颜色（复制记录，避免影响共享同一记录的其他处理器）
+        record = logging.makeLogRecord(record.__dict__)
         log_color = self.COLORS.get(record.levelname, '')
         record.levelname = f"{log_color}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
+class JSONFormatter(logging.Formatter):
+    """结构化日志格式化器，每条日志输出为一行JSON"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', None),
+            'account': getattr(record, 'account', None),
+            'message': record.getMessage(),
+        }
+        data.update(getattr(record, 'event_fields', {}))
+
+        # 经过队列的记录在入队前已渲染为 exc_text
+        exc = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc:
+            data['exc'] = exc
+
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RunContextFilter(logging.Filter):
+    """在记录日志的线程中为日志附加当前运行ID和账号"""
+
+    def filter(self, record):
+        record.run_id = _run_id_var.get()
+        record.account = _account_var.get()
+        return True
+
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """
+    按天切换、按大小轮转的文件处理器
+
+    日志写入 xhs_YYYYMMDD.log，日期变化时切换到新文件；
+    单个文件超过上限时轮转为 xhs_YYYYMMDD.log.1、.2 ...
+    """
+
+    def __init__(self, log_dir: Path, max_bytes: int, backup_count: int, suffix: str = '.log'):
+        self.log_dir = Path(log_dir)
+        self.suffix = suffix
+        self.current_date = datetime.now().strftime('%Y%m%d')
+        super().__init__(
+            self._get_filename(self.current_date),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8',
+            delay=True
+        )
+
+    def _get_filename(self, date: str) -> str:
+        return str(self.log_dir / f"xhs_{date}{self.suffix}")
+
+    def shouldRollover(self, record) -> bool:
+        if datetime.now().strftime('%Y%m%d') != self.current_date:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        today = datetime.now().strftime('%Y%m%d')
+        if today == self.current_date:
+            super().doRollover()
+            return
+
+        # 日期变化：切换到当天的新文件
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.current_date = today
+        self.baseFilename = os.path.abspath(self._get_filename(today))
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    进程内队列处理器
+
+    与 QueueHandler.prepare 一样在调用线程中合并 msg % args、渲染异常并清除 args 和 exc_info，
+    避免后台线程格式化时参数对象已被修改，或队列中的记录持有异常及其栈帧；
+    与默认实现不同的是不套用格式，时间、级别等仍由各处理器自己的格式化器输出
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self._exc_formatter.formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
 class GUILogger(logging.Handler):
-    """GUI日志处理器，将日志发送到GUI显示"""
+    """
+    GUI日志处理器
+
+    emit 只把日志记录放入队列，不做格式化也不直接调用GUI；
+    由GUI线程定时调用 dispatch 批量取出、格式化并交给回调显示
+    """
+
+    # 匹配ANSI颜色代码
+    ANSI_PATTERN = re.compile(r'\033\[[0-9;]*m')
 
-    def __init__(self):
+    def __init__(self, max_queue: int = 10000):
+        """
+        Args:
+            max_queue: 队列最多缓存的日志条数，超出时丢弃最旧的记录
+        """
         super().__init__()
         self.callbacks = []
+        self.records = deque(maxlen=max_queue)
 
-    def add_callback(self, callback: Callable[[str], None]):
+    def add_callback(self, callback: Callable[[List[str]], None]):
         """
         添加日志回调函数
 
         Args:
-            callback: 接收日志消息的回调函数
+            callback: 接收一批日志消息的回调函数
         """
         if callback not in self.callbacks:
             self.callbacks.append(callback)
 
-    def remove_callback(self, callback: Callable[[str], None]):
+    def remove_callback(self, callback: Callable[[List[str]], None]):
         """
         移除日志回调函数
 
@@ -60,59 +190,112 @@ class GUILogger(logging.Handler):
 
     def emit(self, record):
         """
-        发送日志到所有回调函数
+        将日志记录放入队列（没有回调时直接丢弃）
         """
-        try:
-            msg = self.format(record)
-            # 移除ANSI颜色代码（GUI不需要）
-            msg = msg.replace('\033[36m', '').replace('\033[32m', '') \
-                      .replace('\033[33m', '').replace('\033[31m', '') \
-                      .replace('\033[35m', '').replace('\033[0m', '')
+        if self.callbacks:
+            self.records.append(record)
 
-            # 调用所有回调函数
-            for callback in self.callbacks:
-                try:
-                    callback(msg)
-                except Exception:
-                    pass
-        except Exception:
-            self.handleError(record)
+    def drain(self, max_lines: int) -> List[str]:
+        """
+        从队列中取出最多 max_lines 条日志并格式化
 
+        Args:
+            max_lines: 本次最多取出的条数
 
-class Logger:
-    """日志管理器"""
+        Returns:
+            格式化后的日志消息列表
+        """
+        messages = []
 
-    _loggers = {}
+        while self.records and len(messages) < max_lines:
+            record = self.records.popleft()
+            try:
+                # 移除ANSI颜色代码（GUI不需要）
+                messages.append(self.ANSI_PATTERN.sub('', self.format(record)))
+            except Exception:
+                self.handleError(record)
 
-    @classmethod
-    def get_logger(cls, name: str) -> logging.Logger:
+        return messages
+
+    def dispatch(self, max_lines: int) -> int:
         """
-        获取或创建日志记录器
+        批量取出日志并发送到所有回调函数
 
         Args:
-            name: 日志记录器名称，通常使用 __name__
+            max_lines: 本次最多发送的条数
 
         Returns:
-            logging.Logger实例
+            int: 发送的日志条数
         """
-        if name in cls._loggers:
-            return cls._loggers[name]
+        messages = self.drain(max_lines)
+        if not messages:
+            return 0
 
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, Config.LOG_LEVEL))
-        logger.handlers.clear()  # 清除已有的handlers
+        for callback in self.callbacks:
+            try:
+                callback(messages)
+            except Exception:
+                pass
+
+        return len(messages)
+
+
+class Logger:
+    """日志管理器"""
+
+    _loggers = {}
+    _gui_handler: Optional[GUILogger] = None
+    _queue_handler: Optional[QueueHandler] = None
+    _listener: Optional[QueueListener] = None
+
+    @classmethod
+    def _get_gui_handler(cls) -> GUILogger:
+        """获取所有日志记录器共享的GUI处理器"""
+        if cls._gui_handler is None:
+            cls._gui_handler = GUILogger()
+            cls._gui_handler.setLevel(logging.INFO)
+            cls._gui_handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(levelname)s - %(message)s',
+                datefmt='%H:%M:%S'
+            ))
+        return cls._gui_handler
+
+    @classmethod
+    def _get_queue_handler(cls) -> QueueHandler:
+        """
+        获取共享的队列处理器，首次调用时创建文件/控制台/GUI处理器并启动后台写入线程
+        """
+        if cls._queue_handler is not None:
+            return cls._queue_handler
+
+        handlers = []
 
         # 文件处理器
         if Config.LOG_TO_FILE:
-            log_file = Config.LOG_DIR / f"xhs_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = DailyRotatingFileHandler(
+                Config.LOG_DIR,
+                max_bytes=Config.LOG_MAX_BYTES,
+                backup_count=Config.LOG_BACKUP_COUNT
+            )
             file_handler.setLevel(logging.DEBUG)
             file_formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        # 结构化日志处理器（JSON Lines）
+        if Config.LOG_TO_FILE and Config.LOG_JSON:
+            json_handler = DailyRotatingFileHandler(
+                Config.LOG_DIR,
+                max_bytes=Config.LOG_MAX_BYTES,
+                backup_count=Config.LOG_BACKUP_COUNT,
+                suffix='.jsonl'
+            )
+            json_handler.setLevel(logging.DEBUG)
+            json_handler.setFormatter(JSONFormatter())
+            handlers.append(json_handler)
 
         # 控制台处理器
         console_handler = logging.StreamHandler(sys.stdout)
@@ -122,47 +305,86 @@ class Logger:
             datefmt='%H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
         # GUI处理器
-        gui_handler = GUILogger()
-        gui_handler.setLevel(logging.INFO)
-        gui_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        gui_handler.setFormatter(gui_formatter)
-        logger.addHandler(gui_handler)
+        handlers.append(cls._get_gui_handler())
+
+        # 低于所有处理器级别的日志在入队前直接丢弃
+        log_queue = queue.SimpleQueue()
+        cls._queue_handler = _LocalQueueHandler(log_queue)
+        cls._queue_handler.setLevel(min(handler.level for handler in handlers))
+        cls._queue_handler.addFilter(RunContextFilter())
+
+        cls._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        cls._listener.start()
+        atexit.register(cls.shutdown)
+
+        return cls._queue_handler
+
+    @classmethod
+    def shutdown(cls):
+        """停止后台写入线程，写完队列中剩余的日志"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+
+    @classmethod
+    def get_logger(cls, name: str) -> logging.Logger:
+        """
+        获取或创建日志记录器
+
+        Args:
+            name: 日志记录器名称，通常使用 __name__
+
+        Returns:
+            logging.Logger实例
+        """
+        if name in cls._loggers:
+            return cls._loggers[name]
+
+        logger = logging.getLogger(name)
+        logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+        logger.handlers.clear()  # 清除已有的handlers
+
+        # 所有日志记录器共享同一个队列处理器
+        logger.addHandler(cls._get_queue_handler())
 
         cls._loggers[name] = logger
         return logger
 
     @classmethod
-    def add_gui_callback(cls, callback: Callable[[str], None]):
+    def add_gui_callback(cls, callback: Callable[[List[str]], None]):
+        """
+        添加GUI日志回调，回调在 dispatch_gui_logs 时批量接收日志
+
+        Args:
+            callback: 接收一批日志消息的回调函数
+        """
+        cls._get_gui_handler().add_callback(callback)
+
+    @classmethod
+    def remove_gui_callback(cls, callback: Callable[[List[str]], None]):
         """
-        为所有已存在的日志记录器添加GUI回调
+        移除GUI日志回调
 
         Args:
-            callback: 接收日志消息的回调函数
+            callback: 要移除的回调函数
         """
-        gui_handler = GUILogger()
-        gui_handler.add_callback(callback)
+        cls._get_gui_handler().remove_callback(callback)
 
-        for logger in cls._loggers.values():
-            # 检查是否已经有GUILogger处理器
-            has_gui = False
-            for handler in logger.handlers:
-                if isinstance(handler, GUILogger):
-                    handler.add_callback(callback)
-                    has_gui = True
-                    break
+    @classmethod
+    def dispatch_gui_logs(cls, max_lines: int = Config.LOG_GUI_MAX_LINES_PER_TICK) -> int:
+        """
+        批量取出队列中的日志并发送给GUI回调（需在GUI线程中定时调用）
 
-            if not has_gui:
-                gui_handler_copy = GUILogger()
-                gui_handler_copy.add_callback(callback)
-                gui_handler_copy.setFormatter(gui_formatter)
-                gui_handler_copy.setLevel(logging.INFO)
-                logger.addHandler(gui_handler_copy)
+        Args:
+            max_lines: 本次最多发送的条数
+
+        Returns:
+            int: 发送的日志条数
+        """
+        return cls._get_gui_handler().dispatch(max_lines)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -176,3 +398,85 @@ def get_logger(name: str) -> logging.Logger:
         logging.Logger实例
     """
     return Logger.get_logger(name)
+
+
+def start_run(account: Optional[str] = None) -> Optional[tuple]:
+    """
+    开始一次运行，之后记录的日志都带有该运行的ID
+
+    已处于某次运行中时沿用当前运行ID（如统一导出中调用各导出器）
+
+    Args:
+        account: 账号名称，默认使用 Config.ACCOUNT_NAME
+
+    Returns:
+        用于 end_run 的令牌；沿用已有运行时返回 None
+    """
+    if _run_id_var.get() is not None:
+        return None
+
+    return (
+        _run_id_var.set(uuid.uuid4().hex[:12]),
+        _account_var.set(account or Config.ACCOUNT_NAME),
+    )
+
+
+def end_run(token: Optional[tuple]):
+    """
+    结束由 start_run 开始的运行
+
+    Args:
+        token: start_run 返回的令牌
+    """
+    if token is not None:
+        run_id_token, account_token = token
+        _run_id_var.reset(run_id_token)
+        _account_var.reset(account_token)
+
+
+def get_run_id() -> Optional[str]:
+    """获取当前运行ID"""
+    return _run_id_var.get()
+
+
+def log_event(
+    logger: logging.Logger,
+    event: str,
+    phase: Optional[str] = None,
+    elapsed_ms: Optional[float] = None,
+    rows: Optional[int] = None,
+    level: int = logging.INFO,
+    **fields: Any
+):
+    """
+    记录结构化事件日志
+
+    文本日志中显示为一行摘要，JSON日志中各字段单独输出
+
+    Args:
+        logger: 日志记录器
+        event: 事件名称
+        phase: 阶段（navigate / select / extract / export 等）
+        elapsed_ms: 耗时（毫秒）
+        rows: 数据行数
+        level: 日志级别
+        **fields: 其他字段
+    """
+    event_fields = {'event': event, **fields}
+    details = []
+
+    if phase is not None:
+        event_fields['phase'] = phase
+    if elapsed_ms is not None:
+        event_fields['elapsed_ms'] = round(elapsed_ms, 1)
+        details.append(f"耗时 {elapsed_ms:.0f}ms")
+    if rows is not None:
+        event_fields['rows'] = rows
+        details.append(f"{rows} 行")
+
+    message = f"[{phase}] {event}" if phase else event
+    if details:
+        message += f" ({', '.join(details)})"
+
+    logger.log(level, message, extra={'event_fields': event_fields})
+
@@ -0,0 +1,273 @@
+"""
+内存分析模块
+定期采样Python堆（tracemalloc）、本进程与浏览器进程的RSS、打开的页面数，
+输出与上次采样相比增长最多的分配位置，用于排查长时间运行后的内存增长
+"""
+import asyncio
+import json
+import os
+import signal
+import threading
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from config import Config
+from utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+MEMORY_LOG_FILENAME = 'memory.jsonl'
+
+
+@dataclass
+class MemorySample:
+    """单次内存采样"""
+    time: str
+    python_current_mb: float
+    python_peak_mb: float
+    rss_mb: Optional[float] = None
+    browser_rss_mb: Optional[float] = None
+    browser_processes: int = 0
+    page_count: int = 0
+    top_growth: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _get_process_rss() -> Tuple[Optional[float], Optional[float], int]:
+    """
+    获取本进程和子进程（Playwright驱动和浏览器）的RSS
+
+    需要安装 psutil，未安装时返回 None
+
+    Returns:
+        (本进程RSS MB, 子进程RSS合计 MB, 子进程数量)
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None, None, 0
+
+    try:
+        process = psutil.Process(os.getpid())
+        rss = process.memory_info().rss
+        children_rss = 0
+        children = process.children(recursive=True)
+        for child in children:
+            try:
+                children_rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return rss / 1024 / 1024, children_rss / 1024 / 1024, len(children)
+
+    except Exception as e:
+        logger.debug(f"获取进程内存失败: {e}")
+        return None, None, 0
+
+
+def _get_page_count() -> int:
+    """当前浏览器上下文中打开的页面数"""
+    from core.browser import browser_manager
+
+    context = browser_manager.context
+    if context is None:
+        return 0
+
+    try:
+        return len(context.pages)
+    except Exception:
+        return 0
+
+
+async def _get_page_count_async() -> int:
+    return _get_page_count()
+
+
+def get_page_count_threadsafe(loop: Optional[asyncio.AbstractEventLoop], timeout: float = 5.0) -> int:
+    """
+    在浏览器所在的事件循环线程中读取页面数（供其他线程调用，避免跨线程访问Playwright对象）
+
+    Args:
+        loop: 浏览器所在的事件循环
+        timeout: 等待事件循环响应的秒数（循环忙于导出时放弃，返回0）
+    """
+    if loop is None or not loop.is_running():
+        return 0
+
+    future = asyncio.run_coroutine_threadsafe(_get_page_count_async(), loop)
+    try:
+        return future.result(timeout)
+    except Exception:
+        future.cancel()
+        return 0
+
+
+class MemoryProfiler:
+    """
+    内存分析器
+
+    - sample() 采样一次并记录与上次采样相比增长最多的分配位置
+    - 首次采样时才开启 tracemalloc，未使用时没有额外开销
+    - 采样结果写入 logs/memory.jsonl，便于绘制一天内的内存曲线
+    """
+
+    def __init__(self, top_n: Optional[int] = None, max_samples: int = 288):
+        """
+        Args:
+            top_n: 每次输出的增长位置数量，默认 Config.MEMORY_TOP_N
+            max_samples: 内存中保留的采样数量（默认按5分钟间隔保留一天）
+        """
+        self.top_n = top_n or Config.MEMORY_TOP_N
+        self.samples: Deque[MemorySample] = deque(maxlen=max_samples)
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        self._psutil_warned = False
+
+    @property
+    def is_tracing(self) -> bool:
+        """tracemalloc 是否已开启"""
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        """开启 tracemalloc 并记录基准快照"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(Config.MEMORY_TRACE_FRAMES)
+            logger.info(f"已开启内存追踪（tracemalloc，{Config.MEMORY_TRACE_FRAMES} 层调用栈）")
+        self._snapshot = self._take_snapshot()
+
+    def stop(self):
+        """关闭 tracemalloc"""
+        self._snapshot = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("已关闭内存追踪")
+
+    def sample(self, page_count: Optional[int] = None) -> MemorySample:
+        """
+        采样一次内存使用
+
+        拍摄 tracemalloc 快照耗时较长，GUI中应在后台线程调用
+
+        Args:
+            page_count: 打开的页面数，默认在当前线程读取（浏览器在其他线程的事件循环中时
+                由调用方通过 get_page_count_threadsafe 获取后传入）
+
+        Returns:
+            MemorySample: 采样结果
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                self.start()
+
+            snapshot = self._take_snapshot()
+            top_growth = self._compare(self._snapshot, snapshot) if self._snapshot else []
+            self._snapshot = snapshot
+
+            current, peak = tracemalloc.get_traced_memory()
+            rss_mb, browser_rss_mb, browser_processes = _get_process_rss()
+            if rss_mb is None and not self._psutil_warned:
+                logger.warning("未安装 psutil，无法统计进程RSS: pip install psutil")
+                self._psutil_warned = True
+
+            sample = MemorySample(
+                time=datetime.now().isoformat(timespec='seconds'),
+                python_current_mb=round(current / 1024 / 1024, 2),
+                python_peak_mb=round(peak / 1024 / 1024, 2),
+                rss_mb=round(rss_mb, 1) if rss_mb is not None else None,
+                browser_rss_mb=round(browser_rss_mb, 1) if browser_rss_mb is not None else None,
+                browser_processes=browser_processes,
+                page_count=page_count if page_count is not None else _get_page_count(),
+                top_growth=top_growth,
+            )
+            self.samples.append(sample)
+
+        self._log_sample(sample)
+        self._append_to_file(sample)
+        return sample
+
+    def format_summary(self, sample: MemorySample) -> str:
+        """生成状态栏显示的单行摘要"""
+        parts = [f"Python堆 {sample.python_current_mb:.1f}MB"]
+        if sample.rss_mb is not None:
+            parts.append(f"进程 {sample.rss_mb:.0f}MB")
+        if sample.browser_rss_mb is not None:
+            parts.append(f"浏览器 {sample.browser_rss_mb:.0f}MB")
+        parts.append(f"页面 {sample.page_count}")
+        return '内存: ' + ' / '.join(parts)
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """获取快照（排除 tracemalloc 自身的分配）"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def _compare(self, old: tracemalloc.Snapshot, new: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """与上次快照比较，返回增长最多的分配位置"""
+        stats = new.compare_to(old, 'lineno')
+        growth = [stat for stat in stats if stat.size_diff > 0][:self.top_n]
+
+        return [
+            {
+                'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'size_diff_kb': round(stat.size_diff / 1024, 1),
+                'size_kb': round(stat.size / 1024, 1),
+                'count_diff': stat.count_diff,
+            }
+            for stat in growth
+        ]
+
+    def _log_sample(self, sample: MemorySample):
+        """输出采样日志"""
+        log_event(
+            logger, '内存采样',
+            python_current_mb=sample.python_current_mb,
+            python_peak_mb=sample.python_peak_mb,
+            rss_mb=sample.rss_mb,
+            browser_rss_mb=sample.browser_rss_mb,
+            page_count=sample.page_count
+        )
+
+        if sample.top_growth:
+            lines = [f"内存增长最多的位置（前{len(sample.top_growth)}）:"]
+            for item in sample.top_growth:
+                lines.append(
+                    f"  +{item['size_diff_kb']:>10.1f}KB  {item['count_diff']:>+8} 个对象  {item['location']}"
+                )
+            logger.info('\n'.join(lines))
+
+    def _append_to_file(self, sample: MemorySample):
+        """追加采样结果到 memory.jsonl"""
+        try:
+            Config.LOG_DIR.mkdir(parents=True, exist_ok=True)
+            with open(Config.LOG_DIR / MEMORY_LOG_FILENAME, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(asdict(sample), ensure_ascii=False) + '\n')
+        except Exception as e:
+            logger.debug(f"写入内存采样记录失败: {e}")
+
+
+# 全局内存分析器
+memory_profiler = MemoryProfiler()
+
+
+def install_signal_trigger(callback: Callable[[], None]) -> bool:
+    """
+    注册 SIGUSR1 信号，用于从命令行触发内存采样: kill -USR1 <pid>
+
+    Windows 不支持该信号，返回 False
+
+    Args:
+        callback: 收到信号时调用的函数（在主线程中执行）
+    """
+    if not hasattr(signal, 'SIGUSR1'):
+        return False
+
+    try:
+        signal.signal(signal.SIGUSR1, lambda signum, frame: callback())
+        logger.info(f"可通过 kill -USR1 {os.getpid()} 触发内存采样")
+        return True
+    except ValueError:
+        # 只能在主线程中注册信号处理函数
+        return False
@@ -0,0 +1,109 @@
+"""
+重试模块
+按阶段配置重试次数和指数退避，用于导航、选择日期范围、采集图表等容易因网络波动失败的步骤
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+from config import Config
+from utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    重试策略
+
+    第 n 次重试前等待 base_delay * multiplier ** (n - 1) 秒（不超过 max_delay），
+    并加上最多 jitter 比例的随机抖动；give_up_on 中的异常不重试，直接抛出
+    """
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    give_up_on: Tuple[Type[BaseException], ...] = ()
+
+    def delay(self, retry: int) -> float:
+        """第 retry 次重试前的等待秒数（retry 从1开始）"""
+        delay = min(self.base_delay * self.multiplier ** (retry - 1), self.max_delay)
+        if self.jitter:
+            delay += delay * random.uniform(0, self.jitter)
+        return delay
+
+    @classmethod
+    def from_config(cls, scale: float = 1.0, attempts: Optional[int] = None) -> 'RetryPolicy':
+        """
+        根据配置生成策略
+
+        Args:
+            scale: 退避时间的倍数（耗时长的阶段可使用更长的退避）
+            attempts: 尝试次数，默认 Config.RETRY_ATTEMPTS
+        """
+        return cls(
+            attempts=attempts or Config.RETRY_ATTEMPTS,
+            base_delay=Config.RETRY_BASE_DELAY * scale,
+            max_delay=Config.RETRY_MAX_DELAY,
+        )
+
+
+class RetryError(Exception):
+    """重试次数用尽"""
+
+    def __init__(self, phase: str, attempts: int, last_error: BaseException):
+        super().__init__(f"{phase} 失败（已尝试 {attempts} 次）: {last_error}")
+        self.phase = phase
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+async def retry_async(
+    func: Callable[[], Awaitable[Any]],
+    policy: RetryPolicy,
+    phase: str,
+    on_retry: Optional[Callable[[int, BaseException], Awaitable[None]]] = None
+) -> Any:
+    """
+    按策略重试协程函数
+
+    Args:
+        func: 每次尝试调用的协程函数
+        policy: 重试策略
+        phase: 阶段名称（用于日志）
+        on_retry: 重试前调用的协程函数 on_retry(retry, error)，用于恢复页面状态
+
+    Returns:
+        func 的返回值
+
+    Raises:
+        RetryError: 所有尝试都失败
+        policy.give_up_on 中的异常: 原样抛出
+    """
+    for attempt in range(1, policy.attempts + 1):
+        try:
+            return await func()
+
+        except asyncio.CancelledError:
+            raise
+
+        except policy.give_up_on:
+            raise
+
+        except policy.retry_on as e:
+            if attempt >= policy.attempts:
+                log_event(logger, '阶段失败', phase=phase, level=logging.WARNING,
+                          attempts=attempt, error=str(e))
+                raise RetryError(phase, attempt, e) from e
+
+            delay = policy.delay(attempt)
+            logger.warning(f"{phase} 第 {attempt} 次尝试失败: {e}，{delay:.1f} 秒后重试")
+            await asyncio.sleep(delay)
+
+            if on_retry is not None:
+                await on_retry(attempt, e)
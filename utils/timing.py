@@ -0,0 +1,257 @@
+"""
+耗时统计模块
+以上下文管理器（span）的方式记录导出流程各阶段的耗时，运行结束时输出汇总表并保存到运行目录
+"""
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from utils.logger import get_logger, get_run_id, log_event
+
+logger = get_logger(__name__)
+
+# 当前运行的耗时记录和当前所在的span（用于记录嵌套层级），随asyncio任务自动传递
+_trace_var: contextvars.ContextVar = contextvars.ContextVar('run_trace', default=None)
+_span_var: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+@dataclass
+class SpanRecord:
+    """单个span的耗时记录"""
+    name: str
+    path: str
+    depth: int
+    start_ms: float
+    elapsed_ms: float = 0.0
+    status: str = 'ok'
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class RunTrace:
+    """一次运行的耗时记录"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 运行名称（如 export_all）
+        """
+        self.name = name
+        self.run_id = get_run_id() or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.elapsed_ms = 0.0
+        self.spans: List[SpanRecord] = []
+
+    def now_ms(self) -> float:
+        """距运行开始的毫秒数"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def finish(self):
+        """结束计时"""
+        self.elapsed_ms = self.now_ms()
+
+    def summarize(self) -> List[Dict[str, Any]]:
+        """
+        按span路径汇总耗时
+
+        Returns:
+            汇总行列表（按首次出现顺序）
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+
+        for span in self.spans:
+            row = summary.setdefault(span.path, {
+                'name': span.name,
+                'path': span.path,
+                'depth': span.depth,
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'errors': 0,
+            })
+            row['count'] += 1
+            row['total_ms'] += span.elapsed_ms
+            row['max_ms'] = max(row['max_ms'], span.elapsed_ms)
+            if span.status != 'ok':
+                row['errors'] += 1
+
+        rows = sorted(
+            summary.values(),
+            key=lambda r: min(s.start_ms for s in self.spans if s.path == r['path'])
+        )
+        for row in rows:
+            row['share'] = row['total_ms'] / self.elapsed_ms if self.elapsed_ms else 0.0
+
+        return rows
+
+    def format_table(self) -> str:
+        """生成汇总表文本"""
+        lines = [
+            f"运行耗时汇总: {self.name} (run_id={self.run_id}, 总耗时 {self.elapsed_ms / 1000:.1f}s)",
+            f"{'phase':<30}{'count':>6}{'total(ms)':>12}{'max(ms)':>12}{'share':>8}{'errors':>8}",
+        ]
+
+        for row in self.summarize():
+            name = '  ' * row['depth'] + row['name']
+            lines.append(
+                f"{name:<30}{row['count']:>6}{row['total_ms']:>12.1f}"
+                f"{row['max_ms']:>12.1f}{row['share']:>8.1%}{row['errors']:>8}"
+            )
+
+        return '\n'.join(lines)
+
+    def save(self, output_dir: Path) -> Path:
+        """
+        保存耗时记录（timing.json 和 timing.txt）
+
+        Args:
+            output_dir: 运行输出目录
+
+        Returns:
+            timing.json 的路径
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            'name': self.name,
+            'run_id': self.run_id,
+            'account': Config.ACCOUNT_NAME,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'summary': self.summarize(),
+            'spans': [asdict(span) for span in self.spans],
+        }
+
+        json_path = output_dir / 'timing.json'
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+
+        with open(output_dir / 'timing.txt', 'w', encoding='utf-8') as f:
+            f.write(self.format_table() + '\n')
+
+        return json_path
+
+
+def start_trace(name: str) -> Optional[contextvars.Token]:
+    """
+    开始记录一次运行的耗时
+
+    已有运行在记录时沿用（如统一导出中调用各导出器），返回 None
+
+    Args:
+        name: 运行名称
+
+    Returns:
+        用于 finish_trace 的令牌
+    """
+    if _trace_var.get() is not None:
+        return None
+    return _trace_var.set(RunTrace(name))
+
+
+def finish_trace(token: Optional[contextvars.Token]) -> Optional[RunTrace]:
+    """
+    结束由 start_trace 开始的记录，输出汇总表并保存到运行目录
+
+    Args:
+        token: start_trace 返回的令牌
+
+    Returns:
+        本次运行的耗时记录
+    """
+    if token is None:
+        return None
+
+    trace: RunTrace = _trace_var.get()
+    _trace_var.reset(token)
+    trace.finish()
+
+    logger.info('\n' + trace.format_table())
+
+    try:
+        path = trace.save(Config.get_run_dir(trace.run_id))
+        logger.info(f"耗时记录已保存: {path}")
+    except Exception as e:
+        logger.warning(f"保存耗时记录失败: {e}")
+
+    return trace
+
+
+def get_trace() -> Optional[RunTrace]:
+    """获取当前运行的耗时记录"""
+    return _trace_var.get()
+
+
+# log_event 自身的参数名，阶段字段与之重名时加前缀 field_ 输出
+_RESERVED_EVENT_FIELDS = ('logger', 'event', 'phase', 'elapsed_ms', 'level')
+
+
+def _event_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """阶段字段转换为 log_event 的关键字参数（重命名与保留参数重名的字段）"""
+    return {
+        (f"field_{key}" if key in _RESERVED_EVENT_FIELDS else key): value
+        for key, value in fields.items()
+    }
+
+
+@contextmanager
+def span(name: str, log: Optional[logging.Logger] = None, **fields: Any):
+    """
+    记录一个阶段的耗时
+
+    阶段结束时输出结构化事件日志，并记入当前运行的耗时汇总
+
+    用法:
+        with span('extract', logger, data_type='followers') as s:
+            data = ...
+            s['rows'] = len(data)
+
+    Args:
+        name: 阶段名称（navigate / select / wait_api / tooltip / download / parse / write 等）
+        log: 输出事件日志的记录器，默认使用本模块的记录器
+        **fields: 其他字段（phase、elapsed_ms、level 等与事件日志参数重名的字段输出为 field_<名称>）
+
+    Yields:
+        dict: 可在阶段内补充的字段（如 rows）
+    """
+    log = log or logger
+    trace: Optional[RunTrace] = _trace_var.get()
+    parent: Optional[SpanRecord] = _span_var.get()
+
+    record = SpanRecord(
+        name=name,
+        path=f"{parent.path}/{name}" if parent else name,
+        depth=parent.depth + 1 if parent else 0,
+        start_ms=trace.now_ms() if trace else 0.0,
+        fields=dict(fields),
+    )
+    span_token = _span_var.set(record)
+    start = time.perf_counter()
+
+    try:
+        yield record.fields
+    except Exception as e:
+        record.status = 'error'
+        record.fields['error'] = str(e)
+        raise
+    finally:
+        _span_var.reset(span_token)
+        record.elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if trace is not None:
+            trace.spans.append(record)
+
+        fields = _event_fields(record.fields)
+        if record.status == 'ok':
+            log_event(log, '阶段完成', phase=record.path,
+                      elapsed_ms=record.elapsed_ms, **fields)
+        else:
+            log_event(log, '阶段失败', phase=record.path,
+                      elapsed_ms=record.elapsed_ms, level=logging.WARNING, **fields)